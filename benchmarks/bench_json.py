@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Benchmark of the JSON codec
+
+Fills the cache with a synthetic catalog, then measures on the largest
+cached file (the VOD streams) the decode and encode time with the json
+module and with orjson, and the warm load_iptv() time with each of them.
+
+Usage:
+    python3 benchmarks/bench_json.py --streams 500000
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+from os import path as osp
+from timeit import default_timer as timer
+
+sys.path.insert(0, osp.dirname(osp.dirname(osp.abspath(__file__))))
+
+from fake_provider import FakeProvider, SyntheticCatalog  # noqa: E402
+
+from pyxtream import XTream, jsoncodec  # noqa: E402
+from pyxtream.cache import read_cache_file  # noqa: E402
+
+
+def median_time(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = timer()
+        function()
+        times.append(timer() - start)
+    return statistics.median(times)
+
+
+def load(provider_url: str, cache_path: str) -> float:
+    with contextlib.redirect_stdout(io.StringIO()):
+        xt = XTream("bench", "user", "pass", provider_url, cache_path=cache_path, enable_flask=False)
+        start = timer()
+        xt.load_iptv()
+        return timer() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the JSON backends on a cached catalog")
+    parser.add_argument("--streams", type=int, default=500000, help="Total number of streams")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of measures of each step")
+    args = parser.parse_args()
+
+    if not jsoncodec.USE_ORJSON:
+        print("orjson is not installed, only the json module is measured")
+    backends = (False, True) if jsoncodec.USE_ORJSON else (False,)
+
+    print(f"Generating {args.streams} streams")
+    provider = FakeProvider(SyntheticCatalog(args.streams)).start()
+    cache_path = tempfile.mkdtemp(prefix="pyxtream-bench-")
+
+    # The first load downloads the catalog and fills the cache
+    load(provider.url, cache_path)
+    data = read_cache_file(osp.join(cache_path, "bench-all_stream_VOD.json"))
+    streams = jsoncodec.loads(data)
+    print(f"VOD streams file: {len(data) / 2**20:.1f} MB, {len(streams)} streams")
+
+    for use_orjson in backends:
+        jsoncodec.USE_ORJSON = use_orjson
+        name = "orjson" if use_orjson else "json"
+        decode = median_time(lambda: jsoncodec.loads(data), args.repeat)
+        encode = median_time(lambda: jsoncodec.dumps(streams), args.repeat)
+        warm_load = median_time(lambda: load(provider.url, cache_path), args.repeat)
+        print(
+            f"  {name:6}  decode {decode:.3f}s ({len(data) / 2**20 / decode:.0f} MB/s), "
+            f"encode {encode:.3f}s, warm load_iptv {warm_load:.3f}s"
+        )
+
+    provider.stop()
+
+
+if __name__ == "__main__":
+    main()
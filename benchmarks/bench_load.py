@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+"""
+End-to-end load benchmark
+
+Starts a synthetic local provider for each catalog size and measures, in a
+separate process for each size:
+- cold load: load_iptv with an empty cache
+- warm load: load_iptv from the cache written by the cold load
+- search: search_stream returning a list and JSON
+- series info: get_series_info_by_id
+- download: download_video throughput
+- peak memory of the process
+
+The results are written as JSON so that two runs can be compared.
+
+Usage:
+    python3 benchmarks/bench_load.py --sizes 10000,100000,1000000 --output bench_results.json
+    python3 benchmarks/bench_load.py --sizes 10000 --latency 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from os import path as osp
+from os import remove
+from timeit import default_timer as timer
+
+REPO_PATH = osp.dirname(osp.dirname(osp.abspath(__file__)))
+sys.path.insert(0, REPO_PATH)
+
+from fake_provider import FakeProvider, SyntheticCatalog  # noqa: E402
+
+from pyxtream import XTream, __version__, jsoncodec  # noqa: E402
+
+SEARCH_TERMS = (r"^.*Storm.*$", r"^Night.*$", r"^.*Series 1\d*$", r"^.*\(19[5-6]\d\)$")
+RESULT_MARKER = "BENCH_RESULT "
+
+
+def _new_xtream(provider_url: str, cache_path: str) -> XTream:
+    return XTream("bench", "user", "pass", provider_url, cache_path=cache_path, enable_flask=False)
+
+
+def _median_time(function, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = timer()
+        function()
+        times.append(timer() - start)
+    return statistics.median(times)
+
+
+def _peak_memory_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def run_measures(provider_url: str, repeat: int, series_info_count: int) -> dict:
+    """Measure pyxtream against a running provider, called in a child process"""
+    measures = {}
+    cache_path = tempfile.mkdtemp(prefix="pyxtream-bench-")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = timer()
+        xt = _new_xtream(provider_url, cache_path)
+        measures["construct_sec"] = timer() - start
+
+        start = timer()
+        xt.load_iptv()
+        measures["cold_load_sec"] = timer() - start
+
+        # Same cache path, the catalog now comes from the cache
+        xt = _new_xtream(provider_url, cache_path)
+        start = timer()
+        xt.load_iptv()
+        measures["warm_load_sec"] = timer() - start
+
+        measures["streams"] = {"live": len(xt.channels), "movies": len(xt.movies), "series": len(xt.series)}
+
+        measures["search_list_sec"] = {
+            term: _median_time(lambda term=term: xt.search_stream(term), repeat) for term in SEARCH_TERMS
+        }
+        measures["search_json_sec"] = {
+            term: _median_time(lambda term=term: xt.search_stream(term, return_type="JSON"), repeat)
+            for term in SEARCH_TERMS
+        }
+
+        series_info_times = []
+        for serie in xt.series[:series_info_count]:
+            start = timer()
+            xt.get_series_info_by_id(serie)
+            series_info_times.append(timer() - start)
+        if series_info_times:
+            measures["series_info_sec"] = statistics.median(series_info_times)
+
+        if xt.movies:
+            movie = xt.movies[0]
+            start = timer()
+            filename = xt.download_video(movie.id)
+            dt = timer() - start
+            if osp.isfile(filename):
+                measures["download_mb_per_sec"] = osp.getsize(filename) / (1024 * 1024) / dt
+                remove(filename)
+
+    measures["peak_memory_mb"] = _peak_memory_mb()
+    return measures
+
+
+def run_size(size: int, args) -> dict:
+    """Serve a catalog of the given size and measure it in a child process"""
+    catalog = SyntheticCatalog(size, seed=args.seed)
+    provider = FakeProvider(catalog, latency=args.latency, video_size=args.video_size).start()
+    try:
+        output = subprocess.run(
+            [
+                sys.executable, osp.abspath(__file__),
+                "--provider-url", provider.url,
+                "--repeat", str(args.repeat),
+                "--series-info", str(args.series_info)
+            ],
+            check=True, capture_output=True, text=True
+        ).stdout
+    finally:
+        provider.stop()
+
+    result_line = next(line for line in output.splitlines() if line.startswith(RESULT_MARKER))
+    measures = json.loads(result_line[len(RESULT_MARKER):])
+    measures["size"] = size
+    return measures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pyxtream benchmark against a synthetic provider")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma separated catalog sizes")
+    parser.add_argument("--latency", type=float, default=0, help="Provider latency in seconds")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the catalog generator")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions of the search measures")
+    parser.add_argument("--series-info", type=int, default=5, help="Number of series info to load")
+    parser.add_argument("--video-size", type=int, default=64*1024*1024, help="Size in bytes of the video download")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file where to write the results")
+    parser.add_argument("--provider-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Child process, measure against an already running provider
+    if args.provider_url:
+        measures = run_measures(args.provider_url, args.repeat, args.series_info)
+        print(RESULT_MARKER + json.dumps(measures))
+        return
+
+    results = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "pyxtream_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "json_backend": jsoncodec.BACKEND,
+        "settings": {
+            "latency": args.latency,
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "series_info": args.series_info,
+            "video_size": args.video_size
+        },
+        "runs": []
+    }
+
+    for size in (int(x) for x in args.sizes.split(",")):
+        print(f"Benchmarking {size} streams")
+        measures = run_size(size, args)
+        results["runs"].append(measures)
+        print(
+            f"  cold load {measures['cold_load_sec']:.3f}s, warm load {measures['warm_load_sec']:.3f}s, "
+            f"peak memory {measures['peak_memory_mb']:.0f} MB"
+        )
+
+    with open(args.output, mode="wt", encoding="utf-8") as output_file:
+        json.dump(results, output_file, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
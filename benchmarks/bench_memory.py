@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Benchmark of the catalog memory
+
+Loads a synthetic catalog from a warm cache and measures with tracemalloc
+the memory allocated by load_iptv(), in total and per stream. It also
+counts the distinct string objects used by the most repeated fields, to
+check that they are shared between streams.
+
+Usage:
+    python3 benchmarks/bench_memory.py --streams 200000
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import sys
+import tempfile
+import tracemalloc
+from os import path as osp
+
+sys.path.insert(0, osp.dirname(osp.dirname(osp.abspath(__file__))))
+
+from fake_provider import FakeProvider, SyntheticCatalog  # noqa: E402
+
+from pyxtream import XTream  # noqa: E402
+from pyxtream.pyxtream import INTERNED_FIELDS  # noqa: E402
+
+
+def distinct_objects(streams, field: str) -> tuple:
+    """Number of distinct values and of distinct string objects of a raw field"""
+    values = [stream.raw.get(field) for stream in streams]
+    return len(set(values)), len({id(value) for value in values})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the memory used by a loaded catalog")
+    parser.add_argument("--streams", type=int, default=200000, help="Total number of streams")
+    parser.add_argument("--parallel-build", action="store_true", help="Build the streams in worker processes")
+    args = parser.parse_args()
+
+    print(f"Generating {args.streams} streams")
+    provider = FakeProvider(SyntheticCatalog(args.streams)).start()
+    cache_path = tempfile.mkdtemp(prefix="pyxtream-bench-")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        xt = XTream(
+            "bench", "user", "pass", provider.url,
+            cache_path=cache_path,
+            enable_flask=False,
+            parallel_build=args.parallel_build
+            )
+        # The first load downloads the catalog and fills the cache
+        xt.load_iptv()
+
+        xt = XTream(
+            "bench", "user", "pass", provider.url,
+            cache_path=cache_path,
+            enable_flask=False,
+            parallel_build=args.parallel_build
+            )
+        gc.collect()
+        tracemalloc.start()
+        xt.load_iptv()
+        gc.collect()
+        catalog_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    provider.stop()
+
+    streams = xt.channels + xt.movies + xt.series
+    number_of_streams = len(streams)
+    print(f"Streams: {number_of_streams}")
+    print(f"Catalog: {catalog_bytes / 2**20:.1f} MB, {catalog_bytes / number_of_streams:.0f} bytes per stream")
+    print(f"Peak while loading: {peak_bytes / 2**20:.1f} MB")
+
+    # URLs are built on demand, measure what storing them would cost
+    url_bytes = sum(sys.getsizeof(stream.url) for stream in xt.channels + xt.movies)
+    print(f"URL strings not stored: {url_bytes / 2**20:.1f} MB")
+
+    for field in INTERNED_FIELDS:
+        values, objects = distinct_objects(streams, field)
+        print(f"  {field}: {values} values in {objects} string objects")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Benchmark of the parallel catalog build
+
+Loads the same synthetic catalog from a warm cache, once building the
+streams in the main process and once using the worker processes, and
+prints the speedup. With less than 2 CPUs, or less than
+PARALLEL_BUILD_MIN_STREAMS streams of a type, parallel_build falls back
+to the serial build and both modes take the same time.
+
+Usage:
+    python3 benchmarks/bench_parallel_build.py --streams 500000
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from os import cpu_count
+from os import path as osp
+from timeit import default_timer as timer
+
+sys.path.insert(0, osp.dirname(osp.dirname(osp.abspath(__file__))))
+
+from fake_provider import FakeProvider, SyntheticCatalog  # noqa: E402
+
+from pyxtream import XTream  # noqa: E402
+from pyxtream.pyxtream import PARALLEL_BUILD_MIN_STREAMS  # noqa: E402
+
+
+def load(provider_url: str, cache_path: str, parallel_build: bool) -> tuple:
+    with contextlib.redirect_stdout(io.StringIO()):
+        xt = XTream(
+            "bench", "user", "pass", provider_url,
+            cache_path=cache_path,
+            enable_flask=False,
+            parallel_build=parallel_build
+            )
+        start = timer()
+        xt.load_iptv()
+        dt = timer() - start
+    return dt, len(xt.channels) + len(xt.movies) + len(xt.series)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare serial and parallel catalog build")
+    parser.add_argument("--streams", type=int, default=500000, help="Total number of streams")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of loads for each mode")
+    args = parser.parse_args()
+
+    print(f"Generating {args.streams} streams, {cpu_count()} CPUs")
+    if (cpu_count() or 1) < 2 or args.streams < PARALLEL_BUILD_MIN_STREAMS:
+        print(f"parallel_build needs 2 CPUs and {PARALLEL_BUILD_MIN_STREAMS} streams of a type, it falls back to serial")
+    provider = FakeProvider(SyntheticCatalog(args.streams)).start()
+    cache_path = tempfile.mkdtemp(prefix="pyxtream-bench-")
+
+    # The first load downloads the catalog and fills the cache
+    load(provider.url, cache_path, False)
+
+    results = {}
+    for parallel_build in (False, True):
+        times = []
+        for _ in range(args.repeat):
+            dt, number_of_streams = load(provider.url, cache_path, parallel_build)
+            times.append(dt)
+        results[parallel_build] = min(times)
+        mode = "parallel" if parallel_build else "serial"
+        print(f"{mode:>8}: {number_of_streams} streams loaded in {min(times):.3f} seconds (best of {args.repeat})")
+
+    print(f"Speedup: {results[False] / results[True]:.2f}x")
+    provider.stop()
+
+
+if __name__ == "__main__":
+    main()
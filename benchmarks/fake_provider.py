@@ -0,0 +1,438 @@
+#!/usr/bin/python3
+"""
+Synthetic Xtream provider
+
+Serves a deterministic catalog from `player_api.php` on a local port so that
+pyxtream can be loaded and measured without a real provider. Videos are
+served from the usual `/movie/`, `/series/` and `/live/` paths with
+synthetic content, and live channels also have a sliding HLS playlist at
+`/live/<username>/<password>/<id>.m3u8`.
+
+Usage:
+    python3 benchmarks/fake_provider.py --streams 100000 --port 8080 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+CATEGORIES_PER_TYPE = 50
+REGIONS = ("EU", "AM", "AS", "AF", "AR")
+CONTAINERS = ("mkv", "mp4", "avi")
+WORDS = (
+    "Night", "Return", "Blue", "Storm", "City", "Last", "Red", "Road", "Silent", "King",
+    "River", "Shadow", "Lost", "Empire", "Star", "Winter", "Dark", "Golden", "Secret", "Wild"
+)
+
+
+class SyntheticCatalog:
+    """Deterministic catalog of groups and streams
+
+    The same number of streams and seed always give the same catalog.
+    """
+
+    def __init__(
+        self,
+        number_of_streams: int,
+        seed: int = 0,
+        username: str = "user",
+        password: str = "pass",
+        duplicate_percent: float = 0
+        ):
+        self.number_of_streams = number_of_streams
+        self.username = username
+        self.password = password
+        self.rnd = random.Random(seed)
+
+        # Split the streams among live channels, movies and series
+        number_of_live = number_of_streams // 5
+        number_of_series = number_of_streams // 10
+        number_of_movies = number_of_streams - number_of_live - number_of_series
+
+        self.categories = {
+            "live": self._make_categories("Live", 1),
+            "vod": self._make_categories("Movies", 1001),
+            "series": self._make_categories("Series", 2001),
+        }
+        self.live_streams = [self._make_live(i) for i in range(number_of_live)]
+        self.vod_streams = [self._make_movie(i) for i in range(number_of_movies)]
+        self.series = [self._make_serie(i) for i in range(number_of_series)]
+
+        # Like real providers, list some streams again in another category
+        if duplicate_percent > 0:
+            for streams, stream_type in ((self.live_streams, "live"), (self.vod_streams, "vod")):
+                copies = self.rnd.sample(streams, int(len(streams) * duplicate_percent / 100))
+                for stream in copies:
+                    streams.append(dict(stream, category_id=self._category_id(stream_type)))
+
+    def _title(self) -> str:
+        return " ".join(self.rnd.choice(WORDS) for _ in range(self.rnd.randint(1, 4)))
+
+    def _category_id(self, stream_type: str) -> str:
+        # A few streams have no category to exercise the catch-all group
+        if self.rnd.random() < 0.001:
+            return None
+        return self.rnd.choice(self.categories[stream_type])["category_id"]
+
+    def _make_categories(self, name: str, first_id: int) -> list:
+        return [
+            {
+                "category_id": str(first_id + i),
+                "category_name": f"{REGIONS[i % len(REGIONS)]}| {name} {i}",
+                "parent_id": 0
+            }
+            for i in range(CATEGORIES_PER_TYPE)
+        ]
+
+    def _added(self) -> str:
+        # Added in the past three years
+        return str(1700000000 - self.rnd.randint(0, 3 * 365 * 86400))
+
+    def _make_live(self, i: int) -> dict:
+        return {
+            "num": i + 1,
+            "name": f"{self._title()} TV {i}",
+            "stream_type": "live",
+            "stream_id": 100000 + i,
+            "stream_icon": f"http://logos.example.com/live/{i}.png",
+            "epg_channel_id": f"channel{i}.example",
+            "added": self._added(),
+            "is_adult": "1" if self.rnd.random() < 0.02 else "0",
+            "category_id": self._category_id("live"),
+            "custom_sid": "",
+            "tv_archive": 0,
+            "direct_source": "",
+            "tv_archive_duration": 0
+        }
+
+    def _make_movie(self, i: int) -> dict:
+        return {
+            "num": i + 1,
+            "name": f"{self._title()} ({self.rnd.randint(1950, 2024)})",
+            "stream_type": "movie",
+            "stream_id": 1000000 + i,
+            "stream_icon": f"http://posters.example.com/vod/{i}.jpg",
+            "rating": str(self.rnd.randint(0, 10)),
+            "rating_5based": round(self.rnd.random() * 5, 1),
+            "added": self._added(),
+            "is_adult": "0",
+            "category_id": self._category_id("vod"),
+            "container_extension": self.rnd.choice(CONTAINERS),
+            "custom_sid": "",
+            "direct_source": ""
+        }
+
+    def _make_serie(self, i: int) -> dict:
+        return {
+            "num": i + 1,
+            "name": f"{self._title()} Series {i}",
+            "series_id": 5000000 + i,
+            "cover": f"http://posters.example.com/series/{i}.jpg",
+            "plot": "A synthetic plot.",
+            "cast": "",
+            "director": "",
+            "genre": "Drama",
+            "releaseDate": "2020-01-01",
+            "last_modified": self._added(),
+            "rating": "7",
+            "rating_5based": 3.5,
+            "backdrop_path": [],
+            "youtube_trailer": "",
+            "episode_run_time": "45",
+            "category_id": self._category_id("series")
+        }
+
+    def series_info(self, series_id: int) -> dict:
+        """Seasons and episodes of a series, always the same for the same ID"""
+        rnd = random.Random(series_id)
+        cover = f"http://posters.example.com/series/{series_id}.jpg"
+        seasons = []
+        episodes = {}
+        episode_id = series_id * 1000
+        for season_number in range(1, rnd.randint(1, 5) + 1):
+            seasons.append({
+                "air_date": "2020-01-01",
+                "episode_count": 10,
+                "id": series_id * 10 + season_number,
+                "name": f"Season {season_number}",
+                "overview": "",
+                "season_number": season_number,
+                "cover": cover,
+                "cover_big": cover
+            })
+            episodes[str(season_number)] = []
+            for episode_num in range(1, 11):
+                episode_id += 1
+                episodes[str(season_number)].append({
+                    "id": str(episode_id),
+                    "episode_num": episode_num,
+                    "title": f"S{season_number:02d}E{episode_num:02d}",
+                    "container_extension": "mkv",
+                    "info": {"duration_secs": 2700, "duration": "00:45:00"},
+                    "custom_sid": "",
+                    "added": "1700000000",
+                    "season": season_number,
+                    "direct_source": ""
+                })
+        return {
+            "seasons": seasons,
+            "info": {"name": f"Series {series_id}", "cover": cover, "plot": "A synthetic plot.", "genre": "Drama"},
+            "episodes": episodes
+        }
+
+    def vod_info(self, vod_id: int) -> dict:
+        """Details of a movie, always the same for the same ID"""
+        rnd = random.Random(vod_id)
+        duration_secs = rnd.randint(80, 180) * 60
+        return {
+            "info": {
+                "tmdb_id": str(rnd.randint(1, 900000)),
+                "name": f"Movie {vod_id}",
+                "plot": "A synthetic plot.",
+                "cast": "Actor One, Actor Two",
+                "director": "Director",
+                "genre": "Drama",
+                "releasedate": "2020-01-01",
+                "duration_secs": duration_secs,
+                "duration": time.strftime("%H:%M:%S", time.gmtime(duration_secs)),
+                "rating": str(rnd.randint(0, 10))
+            },
+            "movie_data": {
+                "stream_id": vod_id,
+                "name": f"Movie {vod_id}",
+                "added": "1700000000",
+                "category_id": "1001",
+                "container_extension": "mkv"
+            }
+        }
+
+    def auth_data(self, server_port: int) -> dict:
+        return {
+            "user_info": {
+                "username": self.username,
+                "password": self.password,
+                "auth": 1,
+                "status": "Active",
+                "max_connections": "4",
+                "active_cons": "0"
+            },
+            "server_info": {
+                "url": "127.0.0.1",
+                "port": str(server_port),
+                "server_protocol": "http"
+            }
+        }
+
+
+# /<type>/<username>/<password>/<stream_id>.<extension>
+VIDEO_PATH = re.compile(r"^/(movie|series|live)/[^/]+/[^/]+/\d+\.\w+$")
+HLS_PLAYLIST_PATH = re.compile(r"^/live/[^/]+/[^/]+/(\d+)\.m3u8$")
+HLS_SEGMENT_PATH = re.compile(r"^/hls/(\d+)/(\d+)\.ts$")
+# Number of segments listed in the live playlists
+HLS_WINDOW = 6
+
+
+class ProviderHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body: bytes, content_type: str = "application/json"):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_video(self, size: int):
+        self.send_response(200)
+        self.send_header("Content-Type", "video/x-matroska")
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        block = self.server.provider.video_block
+        while size > 0:
+            self.wfile.write(block[:size])
+            size -= len(block)
+
+    def _send_playlist(self, stream_id: int):
+        provider = self.server.provider
+        last_sequence = provider.get_live_sequence()
+        first_sequence = max(0, last_sequence - HLS_WINDOW + 1)
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{provider.segment_sec:g}",
+            f"#EXT-X-MEDIA-SEQUENCE:{first_sequence}",
+        ]
+        for sequence in range(first_sequence, last_sequence + 1):
+            lines.append(f"#EXTINF:{provider.segment_sec:.3f},")
+            lines.append(f"/hls/{stream_id}/{sequence}.ts")
+        self._send(("\n".join(lines) + "\n").encode("utf-8"), "application/vnd.apple.mpegurl")
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        provider = self.server.provider
+
+        if provider.latency > 0:
+            time.sleep(provider.latency)
+
+        match = HLS_PLAYLIST_PATH.match(url.path)
+        if match:
+            stream_id = int(match.group(1))
+            if stream_id % 100 < provider.dead_percent:
+                self.send_error(404)
+            else:
+                self._send_playlist(stream_id)
+            return
+
+        match = HLS_SEGMENT_PATH.match(url.path)
+        if match:
+            sequence = int(match.group(2))
+            # Segments whose sequence number ends with a number below segment_error_percent fail
+            if sequence > provider.get_live_sequence() or sequence % 100 < provider.segment_error_percent:
+                self.send_error(404)
+            else:
+                self._send(provider.get_segment(int(match.group(1)), sequence), "video/mp2t")
+            return
+
+        if VIDEO_PATH.match(url.path):
+            # Streams whose ID ends with a number below dead_percent do not play
+            stream_id = int(url.path.rsplit("/", 1)[1].split(".")[0])
+            if stream_id % 100 < provider.dead_percent:
+                self.send_error(404)
+            else:
+                self._send_video(provider.video_size)
+            return
+
+        if url.path != "/player_api.php":
+            self.send_error(404)
+            return
+
+        action = query.get("action", [None])[0]
+        if action is None:
+            self._send(json.dumps(provider.catalog.auth_data(self.server.server_address[1])).encode("utf-8"))
+        elif action in provider.payloads:
+            if "category_id" in query:
+                self._send(provider.get_by_category(action, query["category_id"][0]))
+            else:
+                self._send(provider.payloads[action])
+        elif action == "get_series_info":
+            self._send(json.dumps(provider.catalog.series_info(int(query["series_id"][0]))).encode("utf-8"))
+        elif action == "get_vod_info":
+            self._send(json.dumps(provider.catalog.vod_info(int(query["vod_id"][0]))).encode("utf-8"))
+        else:
+            self._send(b"[]")
+
+
+class FakeProvider:
+    """Local Xtream provider serving a SyntheticCatalog"""
+
+    def __init__(
+        self,
+        catalog: SyntheticCatalog,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        video_size: int = 16*1024*1024,
+        dead_percent: int = 0,
+        segment_sec: float = 2,
+        segment_size: int = 188*1000,
+        segment_error_percent: int = 0
+        ):
+        """Prepare the provider, call start() to serve
+
+        Args:
+            catalog (SyntheticCatalog): Catalog to serve
+            host (str, optional): Address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): Port to listen on, 0 for any free port. Defaults to 0.
+            latency (float, optional): Seconds to wait before answering each request. Defaults to 0.
+            video_size (int, optional): Size in bytes of every video. Defaults to 16 MB.
+            dead_percent (int, optional): Percentage of the streams answering 404. Defaults to 0.
+            segment_sec (float, optional): Duration of the segments of the live HLS playlists. Defaults to 2.
+            segment_size (int, optional): Size in bytes of each live segment. Defaults to 1000 TS packets.
+            segment_error_percent (int, optional): Percentage of the live segments answering 404. Defaults to 0.
+        """
+        self.catalog = catalog
+        self.latency = latency
+        self.video_size = video_size
+        self.dead_percent = dead_percent
+        self.segment_sec = segment_sec
+        self.segment_size = segment_size
+        self.segment_error_percent = segment_error_percent
+        self.live_start = time.time()
+        self.video_block = bytes(range(256)) * 4096
+        self.by_category = {}
+
+        # Encode the payloads once, the provider must not be the bottleneck
+        self.lists = {
+            "get_live_categories": catalog.categories["live"],
+            "get_vod_categories": catalog.categories["vod"],
+            "get_series_categories": catalog.categories["series"],
+            "get_live_streams": catalog.live_streams,
+            "get_vod_streams": catalog.vod_streams,
+            "get_series": catalog.series,
+        }
+        self.payloads = {
+            action: json.dumps(data, ensure_ascii=False).encode("utf-8") for action, data in self.lists.items()
+        }
+
+        self.server = ThreadingHTTPServer((host, port), ProviderHandler)
+        self.server.daemon_threads = True
+        self.server.provider = self
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fake provider", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def get_by_category(self, action: str, category_id: str) -> bytes:
+        key = (action, category_id)
+        if key not in self.by_category:
+            streams = [x for x in self.lists[action] if x.get("category_id") == category_id]
+            self.by_category[key] = json.dumps(streams, ensure_ascii=False).encode("utf-8")
+        return self.by_category[key]
+
+    def get_live_sequence(self) -> int:
+        """Sequence number of the newest live segment"""
+        return int((time.time() - self.live_start) / self.segment_sec)
+
+    def get_segment(self, stream_id: int, sequence: int) -> bytes:
+        """Live segment made of TS packets carrying the stream ID and the sequence number"""
+        packet = b"\x47" + stream_id.to_bytes(8, "big") + sequence.to_bytes(8, "big")
+        packet += bytes(188 - len(packet))
+        return packet * (self.segment_size // 188)
+
+    def start(self) -> "FakeProvider":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Xtream catalog")
+    parser.add_argument("--streams", type=int, default=10000, help="Total number of streams")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the catalog generator")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--latency", type=float, default=0, help="Seconds to wait before each answer")
+    parser.add_argument(
+        "--duplicates", type=float, default=0, help="Percentage of live and VOD streams listed in a second category"
+        )
+    args = parser.parse_args()
+
+    provider = FakeProvider(SyntheticCatalog(args.streams, args.seed, duplicate_percent=args.duplicates), port=args.port, latency=args.latency)
+    print(f"Serving {args.streams} streams at {provider.url} (username `user`, password `pass`)")
+    provider.server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 
 from .progress import progress
-from .pyxtream import XTream
-
-try:
-    from .rest_api import FlaskWrap
-    USE_FLASK = True
-except ImportError:
-    USE_FLASK = False
+from .pyxtream import USE_FLASK, XTream
+from .pool import XTreamPool
 from .version import __author__, __author_email__, __version__
+
+
+def __getattr__(name):
+    # Flask is only imported when FlaskWrap is used
+    if name == "FlaskWrap":
+        from .rest_api import FlaskWrap
+        return FlaskWrap
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
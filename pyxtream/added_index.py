@@ -0,0 +1,152 @@
+"""
+pyxtream added index
+
+Streams sorted by the time they were added to the provider, to answer
+"recently added" questions for any time window with a binary search.
+
+    xt.movies_added_index.since(last_sync_time)
+    xt.movies_added_index.between(start_time, end_time)
+    xt.series_added_index.newest(20)
+
+The index is updated as streams are added or removed. Streams added in bulk
+are sorted once, on the next query.
+"""
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import List
+
+
+class AddedIndex:
+
+    def __init__(self):
+        # Sorted by added time, _streams[i] was added at _added[i]
+        self._added: List[int] = []
+        self._streams: List = []
+
+        # Streams not yet in the sorted lists, as (added, stream)
+        self._pending: List[tuple] = []
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._streams) + len(self._pending)
+
+    def add(self, stream, added: int):
+        """Add a stream
+
+        Args:
+            stream (Channel|Serie): The stream
+            added (int): Unix time when the stream was added
+        """
+        with self._lock:
+            self._pending.append((added, stream))
+
+    def remove(self, stream, added: int) -> bool:
+        """Remove a stream
+
+        Args:
+            stream (Channel|Serie): The stream
+            added (int): Unix time when the stream was added, as given to add()
+
+        Returns:
+            bool: True if the stream was found
+        """
+        with self._lock:
+            self._merge_pending()
+            first = bisect_left(self._added, added)
+            last = bisect_right(self._added, added)
+            for position in range(first, last):
+                if self._streams[position] is stream:
+                    del self._added[position]
+                    del self._streams[position]
+                    return True
+        return False
+
+    def clear(self):
+        """Remove all the streams"""
+        with self._lock:
+            self._added = []
+            self._streams = []
+            self._pending = []
+
+    def copy(self) -> "AddedIndex":
+        """Copy of the index, changing one does not change the other"""
+        index = AddedIndex()
+        with self._lock:
+            index._added = list(self._added)
+            index._streams = list(self._streams)
+            index._pending = list(self._pending)
+        return index
+
+    def _merge_pending(self):
+        if not self._pending:
+            return
+
+        if len(self._pending) < len(self._streams) // 100:
+            # A few new streams, insert them in place
+            for added, stream in self._pending:
+                position = bisect_right(self._added, added)
+                self._added.insert(position, added)
+                self._streams.insert(position, stream)
+        else:
+            # Many new streams, sort everything again
+            pairs = list(zip(self._added, self._streams)) + self._pending
+            pairs.sort(key=lambda pair: pair[0])
+            self._added = [pair[0] for pair in pairs]
+            self._streams = [pair[1] for pair in pairs]
+
+        self._pending = []
+
+    def since(self, timestamp: float) -> List:
+        """Streams added at or after a time, oldest first
+
+        Args:
+            timestamp (float): Unix time
+
+        Returns:
+            List: The streams
+        """
+        with self._lock:
+            self._merge_pending()
+            return self._streams[bisect_left(self._added, timestamp):]
+
+    def between(self, start: float, end: float) -> List:
+        """Streams added at or after start and before end, oldest first
+
+        Args:
+            start (float): Unix time of the beginning of the window
+            end (float): Unix time of the end of the window
+
+        Returns:
+            List: The streams
+        """
+        with self._lock:
+            self._merge_pending()
+            return self._streams[bisect_left(self._added, start):bisect_left(self._added, end)]
+
+    def newest(self, number: int) -> List:
+        """The last streams added, newest first
+
+        Args:
+            number (int): Maximum number of streams
+
+        Returns:
+            List: The streams
+        """
+        with self._lock:
+            self._merge_pending()
+            if number <= 0:
+                return []
+            return self._streams[:-number - 1:-1]
+
+    def in_last_days(self, days: float) -> List:
+        """Streams added in the last days, oldest first
+
+        Args:
+            days (float): Number of days
+
+        Returns:
+            List: The streams
+        """
+        return self.since(time.time() - days * 86400)
@@ -0,0 +1,221 @@
+"""
+pyxtream cache
+
+Read and write the cache files.
+
+Files are written to a temporary file in the same folder, then renamed
+over the old one, so a crash never leaves a truncated file behind. Each
+file starts with a one line header giving the codec, the length and the
+CRC32 of what follows:
+
+    PYXC1 <codec> <length> <crc32>\\n<payload>
+
+Files without the header are read as plain data, like the files written
+by older versions.
+"""
+
+import gzip
+import zlib
+from os import chmod, fsync, remove, replace, umask
+from os import path as osp
+from tempfile import mkstemp
+from typing import Callable, Iterator, Tuple
+
+try:
+    import zstandard
+    USE_ZSTD = True
+    DECOMPRESS_ERRORS = (zlib.error, zstandard.ZstdError)
+except ImportError:
+    USE_ZSTD = False
+    DECOMPRESS_ERRORS = (zlib.error,)
+
+MAGIC = b"PYXC1"
+
+# mkstemp() creates the files readable by their owner only, give them the
+# mode open() would, for the other processes reading the cache
+_UMASK = umask(0)
+umask(_UMASK)
+_FILE_MODE = 0o666 & ~_UMASK
+
+CODECS = ("none", "gzip", "zstd")
+
+
+class CacheError(Exception):
+    """The cache file is corrupted"""
+
+
+def codec_available(codec: str) -> bool:
+    """Tell if a codec can be used
+
+    Args:
+        codec (str): "none", "gzip" or "zstd"
+
+    Returns:
+        bool: True if the codec is known and its package installed
+    """
+    if codec == "zstd":
+        return USE_ZSTD
+    return codec in CODECS
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        # Level 1 is much faster and only slightly bigger than the default
+        return gzip.compress(data, compresslevel=1, mtime=0)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(payload)
+    if codec == "zstd":
+        if not USE_ZSTD:
+            raise CacheError("the file is compressed with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if codec == "none":
+        return payload
+    raise CacheError(f"unknown codec `{codec}`")
+
+
+def _stream_decompressor(codec: str) -> Callable:
+    """Get a function decompressing a payload one chunk at a time, called with b"" at the end"""
+    if codec == "gzip":
+        decompressor = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        return lambda chunk: decompressor.decompress(chunk) if chunk else decompressor.flush()
+    if codec == "zstd":
+        if not USE_ZSTD:
+            raise CacheError("the file is compressed with zstd but zstandard is not installed")
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        return lambda chunk: decompressor.decompress(chunk) if chunk else b""
+    if codec == "none":
+        return lambda chunk: chunk
+    raise CacheError(f"unknown codec `{codec}`")
+
+
+def _decompress_chunk(decompress: Callable, chunk: bytes) -> bytes:
+    """Decompress a chunk, the checksum is only known at the end so corrupted data can fail first"""
+    try:
+        return decompress(chunk)
+    except DECOMPRESS_ERRORS as e:
+        raise CacheError(f"corrupted payload: {e}") from e
+
+
+def _parse_header(header: bytes) -> Tuple[str, int, int]:
+    """Get the codec, the payload length and the CRC32 from a header line"""
+    try:
+        _, codec, length, crc = header.split(b" ")
+        return codec.decode("ascii"), int(length), int(crc, 16)
+    except ValueError as e:
+        raise CacheError("invalid header") from e
+
+
+def write_cache_file(filename: str, data: bytes, codec: str = "none"):
+    """Atomically write a cache file
+
+    Args:
+        filename (str): Full path of the file
+        data (bytes): Content to save
+        codec (str, optional): Compression codec. Defaults to "none".
+    """
+    payload = _compress(data, codec)
+    header = b"%s %s %d %08x\n" % (MAGIC, codec.encode("ascii"), len(payload), zlib.crc32(payload))
+
+    file_descriptor, temp_filename = mkstemp(
+        prefix=f".{osp.basename(filename)}.", suffix=".tmp", dir=osp.dirname(filename) or "."
+    )
+    try:
+        with open(file_descriptor, mode="wb") as temp_file:
+            temp_file.write(header)
+            temp_file.write(payload)
+            temp_file.flush()
+            fsync(temp_file.fileno())
+        chmod(temp_filename, _FILE_MODE)
+        replace(temp_filename, filename)
+    except BaseException:
+        if osp.exists(temp_filename):
+            remove(temp_filename)
+        raise
+
+
+def read_cache_file(filename: str) -> bytes:
+    """Read a cache file
+
+    Args:
+        filename (str): Full path of the file
+
+    Raises:
+        CacheError: The file is truncated or its checksum does not match
+
+    Returns:
+        bytes: The content as it was saved
+    """
+    with open(filename, mode="rb") as cache_file:
+        data = cache_file.read()
+
+    # File written by older versions, without header
+    if not data.startswith(MAGIC + b" "):
+        return data
+
+    header_end = data.find(b"\n")
+    if header_end < 0:
+        raise CacheError("truncated header")
+    codec, length, crc = _parse_header(data[:header_end])
+
+    payload = data[header_end + 1:]
+    if len(payload) != length:
+        raise CacheError(f"expected {length} bytes, found {len(payload)}")
+    if zlib.crc32(payload) != crc:
+        raise CacheError("checksum mismatch")
+
+    return _decompress(payload, codec)
+
+
+def iter_cache_file(filename: str, chunk_size: int = 1 << 16) -> Iterator[bytes]:
+    """Read a cache file in chunks, without loading it whole in memory
+
+    The length and the checksum can only be checked at the end of the
+    file, after the chunks before were returned.
+
+    Args:
+        filename (str): Full path of the file
+        chunk_size (int, optional): Number of bytes read at a time. Defaults to 64 KB.
+
+    Raises:
+        CacheError: The file is truncated or its checksum does not match
+
+    Yields:
+        bytes: The content as it was saved, in chunks
+    """
+    with open(filename, mode="rb") as cache_file:
+        start = cache_file.read(len(MAGIC) + 1)
+
+        # File written by older versions, without header
+        if start != MAGIC + b" ":
+            yield start
+            yield from iter(lambda: cache_file.read(chunk_size), b"")
+            return
+
+        header = cache_file.readline()
+        if not header.endswith(b"\n"):
+            raise CacheError("truncated header")
+        codec, length, crc = _parse_header(start + header[:-1])
+
+        decompress = _stream_decompressor(codec)
+        payload_crc = 0
+        payload_length = 0
+        for chunk in iter(lambda: cache_file.read(chunk_size), b""):
+            payload_crc = zlib.crc32(chunk, payload_crc)
+            payload_length += len(chunk)
+            data = _decompress_chunk(decompress, chunk)
+            if data:
+                yield data
+        data = _decompress_chunk(decompress, b"")
+        if data:
+            yield data
+
+    if payload_length != length:
+        raise CacheError(f"expected {length} bytes, found {payload_length}")
+    if payload_crc != crc:
+        raise CacheError("checksum mismatch")
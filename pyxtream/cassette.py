@@ -0,0 +1,217 @@
+"""
+pyxtream cassette
+
+Record the HTTP traffic with the provider and replay it later.
+
+In record mode every response received from the provider is appended to a
+gzip compressed file of JSON lines. The server URL, username and password
+are replaced by placeholders, in the URLs and in the bodies, so a cassette
+can be shared and replayed with any credentials. The bodies of streamed
+responses that are not text, like the video downloads, are not recorded
+and are replayed as a 404 error.
+
+In replay mode the responses are served from the cassette without any
+network access, either at full speed or waiting the time it took to
+receive them when recording.
+"""
+
+import base64
+import gzip
+import json
+import re
+import threading
+import time
+from os import path as osp
+from timeit import default_timer as timer
+from typing import Callable, Dict, List
+
+from pyxtream import jsoncodec
+
+RECORD = "record"
+REPLAY = "replay"
+REPLAY_TIMED = "replay_timed"
+
+# Content types of the streamed responses whose body is recorded
+_TEXT_CONTENT_TYPES = ("text/", "application/json", "application/x-mpegurl", "application/vnd.apple.mpegurl")
+
+
+class CassetteResponse:
+    """Response served from a cassette, compatible with what pyxtream uses of requests.Response"""
+
+    def __init__(self, url: str, status_code: int, reason: str, headers: dict, content: bytes):
+        self.url = url
+        self.status_code = status_code
+        self.reason = reason
+        self.ok = status_code < 400
+        self.headers = {key.lower(): value for key, value in headers.items()}
+        self.content = content
+
+    def json(self):
+        return jsoncodec.loads(self.content)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class Cassette:
+
+    def __init__(self, filename: str, mode: str = REPLAY):
+        """Open a cassette
+
+        Args:
+            filename (str): Cassette file name
+            mode (str, optional): "record", "replay" or "replay_timed". Defaults to "replay".
+        """
+        if mode not in (RECORD, REPLAY, REPLAY_TIMED):
+            raise ValueError(f"Unknown cassette mode `{mode}`")
+
+        self.filename = filename
+        self.mode = mode
+        self.secrets: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        # Scrubbed URL -> recorded entries, replayed in order
+        self._entries: Dict[str, List[dict]] = {}
+        self._replay_position: Dict[str, int] = {}
+        self._file = None
+
+        if mode == RECORD:
+            # Start a new cassette, kept open until close()
+            self._file = gzip.open(self.filename, mode="wt", encoding="utf-8", compresslevel=6)
+        elif osp.isfile(self.filename):
+            with gzip.open(self.filename, mode="rt", encoding="utf-8") as cassette_file:
+                try:
+                    for line in cassette_file:
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry["url"], []).append(entry)
+                except (EOFError, json.JSONDecodeError):
+                    # Recording not closed, keep the entries written until then
+                    pass
+        else:
+            print(f" - Cassette `{self.filename}` not found, nothing will be replayed")
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode in (REPLAY, REPLAY_TIMED)
+
+    def close(self):
+        """Finish writing the cassette when recording"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def set_secrets(self, server: str, username: str, password: str):
+        """Set the values replaced by placeholders in the cassette"""
+        self.secrets = {"server": server, "username": username, "password": password}
+
+    def _scrub(self, text: str) -> str:
+        server = self.secrets.get("server")
+        if server:
+            text = text.replace(server, "{server}")
+        for name in ("username", "password"):
+            value = self.secrets.get(name)
+            if value:
+                # Only whole URL parameters, path segments or JSON strings
+                text = re.sub(rf'(?<=[=/"]){re.escape(value)}(?=[&/"]|$)', f"{{{name}}}", text)
+        return text
+
+    def _unscrub(self, text: str) -> str:
+        for name, value in self.secrets.items():
+            text = text.replace(f"{{{name}}}", value)
+        return text
+
+    def get(self, url: str, send: Callable, stream: bool = False):
+        """Get the response for a URL
+
+        Args:
+            url (str): Requested URL
+            send (Callable): Function doing the actual request when recording
+            stream (bool, optional): The request is streamed, only record a text body. Defaults to False.
+
+        Returns:
+            requests.Response|CassetteResponse: The response
+        """
+        if self.replaying:
+            return self._replay(url)
+
+        start = timer()
+        response = send()
+        content_type = response.headers.get("content-type", "")
+        if stream and not content_type.startswith(_TEXT_CONTENT_TYPES):
+            # Leave the body of the downloads to the caller
+            content = None
+        else:
+            # Read the whole body, the response still works for streamed requests
+            content = response.content
+        elapsed = timer() - start
+        self._record(url, response, content, elapsed)
+        return response
+
+    def _record(self, url: str, response, content: bytes, elapsed: float):
+        if content is None:
+            body = ""
+            encoding = "skipped"
+        else:
+            try:
+                body = self._scrub(content.decode("utf-8"))
+                encoding = "text"
+            except UnicodeDecodeError:
+                body = base64.b64encode(content).decode("ascii")
+                encoding = "base64"
+
+        entry = {
+            "url": self._scrub(url),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                key: response.headers[key] for key in ("content-type", "content-length") if key in response.headers
+            },
+            "elapsed": elapsed,
+            "encoding": encoding,
+            "body": body
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line)
+            # Make the entry readable even if the cassette is never closed
+            self._file.flush()
+
+    def _replay(self, url: str) -> CassetteResponse:
+        key = self._scrub(url)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                return CassetteResponse(url, 404, "Not in cassette", {}, b"")
+            # Replay the recordings in order, then keep serving the last one
+            position = self._replay_position.get(key, 0)
+            self._replay_position[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+
+        if self.mode == REPLAY_TIMED:
+            time.sleep(entry["elapsed"])
+
+        if entry["encoding"] == "skipped":
+            # An empty body would look like a successful download
+            return CassetteResponse(url, 404, "Body not in cassette", {}, b"")
+
+        if entry["encoding"] == "base64":
+            content = base64.b64decode(entry["body"])
+        else:
+            content = self._unscrub(entry["body"]).encode("utf-8")
+
+        headers = dict(entry["headers"])
+        if "content-length" in headers:
+            headers["content-length"] = str(len(content))
+
+        return CassetteResponse(url, entry["status"], entry["reason"], headers, content)
@@ -0,0 +1,174 @@
+"""
+pyxtream catalog
+
+Immutable snapshots of the loaded catalog.
+
+The catalog is built in a CatalogBuilder that only the loading thread
+sees, then frozen into a CatalogSnapshot and published by replacing a
+single reference. A reader takes the snapshot once and keeps a
+consistent view of the catalog for as long as it holds it, without any
+lock, even while the catalog is being reloaded:
+
+    catalog = xt.catalog
+    print(catalog.version, len(catalog.movies))
+    for group in catalog.groups:
+        ...
+
+XTream.groups, XTream.channels, XTream.movies and XTream.series are the
+ones of the current snapshot. Opening a group with lazy_groups builds a
+new snapshot from a copy of the current one, so the groups and lists of
+a published snapshot are never modified.
+"""
+
+import copy
+import time
+from types import MappingProxyType
+from typing import Dict
+
+from pyxtream.added_index import AddedIndex
+
+
+class CatalogSnapshot:
+
+    __slots__ = (
+        "version", "created", "groups", "channels", "movies", "series",
+        "movies_added_index", "series_added_index", "catch_all_groups", "streams_by_id", "_columns",
+        "_facets"
+    )
+
+    def __init__(self, version: int, builder: "CatalogBuilder"):
+        """Freeze a built catalog, use CatalogBuilder.freeze()
+
+        Args:
+            version (int): Version of the catalog, incremented at each publication
+            builder (CatalogBuilder): The catalog, it must not be modified anymore
+        """
+        set_attribute = object.__setattr__
+        set_attribute(self, "version", version)
+        set_attribute(self, "created", time.time())
+        set_attribute(self, "groups", tuple(builder.groups))
+        set_attribute(self, "channels", tuple(builder.channels))
+        set_attribute(self, "movies", tuple(builder.movies))
+        set_attribute(self, "series", tuple(builder.series))
+        # Only read once published, their lock keeps the lazy sorting safe
+        set_attribute(self, "movies_added_index", builder.movies_added_index)
+        set_attribute(self, "series_added_index", builder.series_added_index)
+        set_attribute(self, "catch_all_groups", MappingProxyType(builder.catch_all_groups))
+        set_attribute(self, "streams_by_id", MappingProxyType({
+            stream_type: MappingProxyType(streams) for stream_type, streams in builder.streams_by_id.items()
+        }))
+        set_attribute(self, "_columns", None)
+        set_attribute(self, "_facets", None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is read-only, build a new one with CatalogBuilder")
+
+    def __repr__(self) -> str:
+        return (
+            f"<CatalogSnapshot version={self.version} groups={len(self.groups)} "
+            f"channels={len(self.channels)} movies={len(self.movies)} series={len(self.series)}>"
+        )
+
+    def get_stream(self, stream_type: str, stream_id):
+        """Find a stream by its ID at the provider
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream_id: Stream ID, or series ID for Series, as given by the provider
+
+        Returns:
+            Channel|Serie: The stream, None if it is not in the catalog
+        """
+        return self.streams_by_id[stream_type].get(stream_id)
+
+    @property
+    def columns(self):
+        """Columnar view of this catalog, built on first use. See pyxtream.columnar"""
+        if self._columns is None:
+            # Imported here, NumPy is only needed when the columns are used
+            from pyxtream.columnar import CatalogColumns
+            # Derived from the immutable lists, building it twice gives the same result
+            object.__setattr__(self, "_columns", CatalogColumns(self))
+        return self._columns
+
+    @property
+    def facets(self):
+        """Bitset index of this catalog for faceted filtering, built on first use. See pyxtream.facets"""
+        if self._facets is None:
+            from pyxtream.facets import FacetIndex
+            object.__setattr__(self, "_facets", FacetIndex(self))
+        return self._facets
+
+
+class CatalogBuilder:
+
+    def __init__(self, catch_all_groups: Dict[str, object]):
+        """Start an empty catalog
+
+        Args:
+            catch_all_groups (Dict[str, Group]): Stream type -> group of the streams without a valid group
+        """
+        self.groups = []
+        self.channels = []
+        self.movies = []
+        self.series = []
+        self.movies_added_index = AddedIndex()
+        self.series_added_index = AddedIndex()
+        self.catch_all_groups = dict(catch_all_groups)
+        # Stream type -> stream or series ID -> stream, to build only once
+        # the streams the provider lists in several groups
+        self.streams_by_id = {stream_type: {} for stream_type in catch_all_groups}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot) -> "CatalogBuilder":
+        """Start a catalog from a copy of a published one
+
+        The lists are copied, the groups and streams are shared until
+        replace_group() is called.
+
+        Args:
+            snapshot (CatalogSnapshot): The published catalog
+
+        Returns:
+            CatalogBuilder: The copy
+        """
+        builder = cls(snapshot.catch_all_groups)
+        builder.groups = list(snapshot.groups)
+        builder.channels = list(snapshot.channels)
+        builder.movies = list(snapshot.movies)
+        builder.series = list(snapshot.series)
+        builder.movies_added_index = snapshot.movies_added_index.copy()
+        builder.series_added_index = snapshot.series_added_index.copy()
+        builder.streams_by_id = {
+            stream_type: dict(streams) for stream_type, streams in snapshot.streams_by_id.items()
+        }
+        return builder
+
+    def replace_group(self, group):
+        """Replace a shared group by a copy that can be modified
+
+        Args:
+            group (Group): Group of the catalog
+
+        Returns:
+            Group: The copy, now in the catalog instead of the group
+        """
+        new_group = copy.copy(group)
+        new_group.channels = list(group.channels)
+        new_group.series = list(group.series)
+        for position, catalog_group in enumerate(self.groups):
+            if catalog_group is group:
+                self.groups[position] = new_group
+                break
+        return new_group
+
+    def freeze(self, version: int) -> CatalogSnapshot:
+        """Make the catalog immutable, the builder must not be used anymore
+
+        Args:
+            version (int): Version of the catalog
+
+        Returns:
+            CatalogSnapshot: The catalog
+        """
+        return CatalogSnapshot(version, self)
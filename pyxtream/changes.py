@@ -0,0 +1,223 @@
+"""
+pyxtream changes
+
+Log of the changes of the catalog between two loads.
+
+Each time the catalog is reloaded, the new catalog is compared with the
+previous one and one event is published per stream added, removed,
+renamed or moved to another category. The last events are kept in a
+bounded log, so a consumer can ask for everything after the last event
+it applied instead of reading the whole catalog again.
+
+    def on_change(event):
+        print(event["event"], event["stream_type"], event["id"], event["name"])
+
+    xt.changes.subscribe(on_change)
+    xt.reload_iptv()
+    events = xt.changes.since(last_seq)
+
+Events are dictionaries:
+
+    {"seq": 42, "time": 1700000000.0, "event": "renamed", "stream_type": "VOD",
+     "id": 1234, "name": "New name", "category_id": "12", "old_name": "Old name"}
+
+"moved" events have an `old_category_id` key instead of `old_name`.
+"""
+
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from pyxtream import jsoncodec
+
+ADDED = "added"
+REMOVED = "removed"
+RENAMED = "renamed"
+MOVED = "moved"
+
+
+class HistoryTruncated(Exception):
+    """The requested events are older than the oldest event kept"""
+
+
+def catalog_state(xtream, catalog=None) -> Dict[Tuple[str, object], Tuple[str, str]]:
+    """Describe a loaded catalog for comparison with diff_catalogs()
+
+    Args:
+        xtream (XTream): Loaded XTream instance
+        catalog (CatalogSnapshot, optional): Catalog to describe. Defaults to XTream.catalog.
+
+    Returns:
+        Dict[Tuple[str, object], Tuple[str, str]]: (stream type, ID) -> (name, category ID)
+    """
+    if catalog is None:
+        catalog = xtream.catalog
+    state = {}
+    for stream_type, streams in (
+        (xtream.live_type, catalog.channels),
+        (xtream.vod_type, catalog.movies),
+        (xtream.series_type, catalog.series)
+    ):
+        for stream in streams:
+            stream_id = stream.series_id if stream_type == xtream.series_type else stream.id
+            state[(stream_type, stream_id)] = (stream.name, str(stream.group_id))
+    return state
+
+
+def diff_catalogs(old_state: dict, new_state: dict) -> List[dict]:
+    """Compare two catalogs described by catalog_state()
+
+    Args:
+        old_state (dict): Catalog before the reload
+        new_state (dict): Catalog after the reload
+
+    Returns:
+        List[dict]: Events without `seq` and `time`
+    """
+    events = []
+    for key, (name, category_id) in new_state.items():
+        stream_type, stream_id = key
+        event = {"stream_type": stream_type, "id": stream_id, "name": name, "category_id": category_id}
+        old = old_state.get(key)
+        if old is None:
+            events.append(dict(event, event=ADDED))
+            continue
+        old_name, old_category_id = old
+        if old_name != name:
+            events.append(dict(event, event=RENAMED, old_name=old_name))
+        if old_category_id != category_id:
+            events.append(dict(event, event=MOVED, old_category_id=old_category_id))
+
+    for key, (name, category_id) in old_state.items():
+        if key not in new_state:
+            stream_type, stream_id = key
+            events.append({
+                "event": REMOVED, "stream_type": stream_type, "id": stream_id, "name": name, "category_id": category_id
+            })
+    return events
+
+
+class ChangeFeed:
+
+    def __init__(self, max_events: int = 100000):
+        """Initialize the log of changes
+
+        Args:
+            max_events (int, optional): Number of events kept, the oldest are dropped. Defaults to 100000.
+        """
+        self.events = deque(maxlen=max_events)
+        # Sequence number of the last event published, 0 before the first one
+        self.last_seq = 0
+        self._callbacks: List[Callable] = []
+        self._condition = threading.Condition()
+
+    def subscribe(self, callback: Callable):
+        """Call `callback(event)` for every new event, from the thread reloading the catalog"""
+        with self._condition:
+            if callback not in self._callbacks:
+                self._callbacks.append(callback)
+
+    def unsubscribe(self, callback: Callable):
+        """Stop calling a callback given to subscribe()"""
+        with self._condition:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def publish(self, events: List[dict]) -> int:
+        """Number and add events to the log, then call the subscribers
+
+        Args:
+            events (List[dict]): Events from diff_catalogs()
+
+        Returns:
+            int: Sequence number of the last event
+        """
+        now = time.time()
+        with self._condition:
+            for event in events:
+                self.last_seq += 1
+                event["seq"] = self.last_seq
+                event["time"] = now
+                self.events.append(event)
+            callbacks = list(self._callbacks)
+            self._condition.notify_all()
+
+        for callback in callbacks:
+            for event in events:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f" - Change feed subscriber failed: e=`{e}`")
+        return self.last_seq
+
+    def since(self, seq: int) -> List[dict]:
+        """Events published after a sequence number
+
+        Args:
+            seq (int): Sequence number of the last event already applied, 0 for all events kept
+
+        Raises:
+            HistoryTruncated: Events after seq were dropped from the log, or seq is after the last
+                              event (the sequence restarted with the process), a full resync is needed
+
+        Returns:
+            List[dict]: The events, oldest first
+        """
+        with self._condition:
+            if seq > self.last_seq:
+                raise HistoryTruncated(f"last event is {self.last_seq}, asked for events after {seq}")
+            if not self.events or seq == self.last_seq:
+                return []
+            first_seq = self.events[0]["seq"]
+            if seq < first_seq - 1:
+                raise HistoryTruncated(f"oldest event kept is {first_seq}, asked for events after {seq}")
+            # Sequence numbers are consecutive, find the position directly
+            return list(islice(self.events, seq - first_seq + 1, None))
+
+    def wait(self, seq: int, timeout: float = None) -> List[dict]:
+        """Wait for events published after a sequence number
+
+        Args:
+            seq (int): Sequence number of the last event already applied
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to no limit.
+
+        Raises:
+            HistoryTruncated: See since()
+
+        Returns:
+            List[dict]: The events, empty if none arrived before the timeout
+        """
+        with self._condition:
+            # Returns at once when seq is after the last event, since() then raises
+            self._condition.wait_for(lambda: self.last_seq != seq, timeout=timeout)
+        return self.since(seq)
+
+    def stream_sse(self, seq: int = None, keepalive_sec: float = 15) -> Iterator[str]:
+        """Server-Sent Events stream of the changes
+
+        Args:
+            seq (int, optional): Last event already received, from the `Last-Event-ID` header.
+                                 Defaults to only the new events.
+            keepalive_sec (float, optional): Interval of the comments keeping the connection open. Defaults to 15.
+
+        Yields:
+            str: SSE messages, the event ID is the sequence number
+        """
+        if seq is None:
+            seq = self.last_seq
+        while True:
+            try:
+                events = self.wait(seq, timeout=keepalive_sec)
+            except HistoryTruncated as e:
+                # The client reconnects from the current event after resyncing
+                seq = self.last_seq
+                yield f"id: {seq}\nevent: resync\ndata: {e}\n\n"
+                continue
+            if not events:
+                yield ": keepalive\n\n"
+                continue
+            for event in events:
+                yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {jsoncodec.dumps(event).decode('utf-8')}\n\n"
+            seq = events[-1]["seq"]
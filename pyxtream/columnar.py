@@ -0,0 +1,228 @@
+"""
+pyxtream columnar
+
+Column oriented view of a loaded catalog, backed by NumPy arrays.
+
+Each stream of XTream.channels, XTream.movies and XTream.series is one row.
+Filters are evaluated on whole columns at once and return arrays of row
+indices, which can be turned into the stream objects with `view()`.
+
+    columns = xt.columns
+    new_movies = columns.view(columns.filter(stream_type="movie", added_since=time.time() - 7*86400))
+    per_category = columns.count_by_category(columns.filter(stream_type="live", is_adult=False))
+
+NumPy is optional, install it with `pip3 install pyxtream[COLUMNAR]`.
+"""
+
+import time
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+    USE_NUMPY = True
+except ImportError:
+    USE_NUMPY = False
+
+# Values of the `type` column
+STREAM_TYPES = ("live", "movie", "series")
+
+
+def _to_int(value, default: int = -1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class StreamView:
+    """Lazy sequence of the stream objects at some row indices"""
+
+    def __init__(self, streams: List, indices):
+        self._streams = streams
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return StreamView(self._streams, self.indices[position])
+        return self._streams[self.indices[position]]
+
+    def __iter__(self):
+        for index in self.indices:
+            yield self._streams[index]
+
+
+class CatalogColumns:
+
+    def __init__(self, xtream):
+        """Build the columns of a loaded catalog
+
+        Args:
+            xtream (XTream): Loaded XTream instance
+
+        Raises:
+            ImportError: NumPy is not installed
+        """
+        if not USE_NUMPY:
+            raise ImportError("The columnar catalog requires NumPy, install it with `pip3 install numpy`")
+
+        # Row index -> stream object
+        self.streams = list(xtream.channels) + list(xtream.movies) + list(xtream.series)
+        number_of_streams = len(self.streams)
+
+        stream_id = np.empty(number_of_streams, dtype=np.int64)
+        category_id = np.empty(number_of_streams, dtype=np.int64)
+        added = np.empty(number_of_streams, dtype=np.int64)
+        is_adult = np.zeros(number_of_streams, dtype=np.bool_)
+        stream_type = np.empty(number_of_streams, dtype=np.int8)
+        name_id = np.empty(number_of_streams, dtype=np.int32)
+
+        # Interned names, name_id points in self.names
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+
+        # Rows are grouped by type, type -> (first row, last row + 1)
+        self.type_ranges = {}
+
+        row = 0
+        for type_id, stream_list in enumerate((xtream.channels, xtream.movies, xtream.series)):
+            self.type_ranges[STREAM_TYPES[type_id]] = (row, row + len(stream_list))
+            for stream in stream_list:
+                if type_id == 2:
+                    stream_id[row] = _to_int(stream.series_id)
+                    category_id[row] = _to_int(stream.group_id)
+                    added[row] = stream.last_modified
+                else:
+                    stream_id[row] = _to_int(stream.id)
+                    category_id[row] = _to_int(stream.group_id)
+                    added[row] = stream.added
+                    is_adult[row] = stream.is_adult == 1
+                stream_type[row] = type_id
+                name_id[row] = self._intern(stream.name)
+                row += 1
+
+        self.stream_id = stream_id
+        self.category_id = category_id
+        self.added = added
+        self.is_adult = is_adult
+        self.type = stream_type
+        self.name_id = name_id
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self.names)
+            self._name_ids[name] = name_id
+            self.names.append(name)
+        return name_id
+
+    def __len__(self) -> int:
+        return len(self.streams)
+
+    def mask(
+        self,
+        stream_type: str = None,
+        category_ids: Iterable[int] = None,
+        is_adult: bool = None,
+        added_since: int = None,
+        added_before: int = None,
+        name: str = None
+        ):
+        """Boolean mask of the rows matching all the given conditions
+
+        Args:
+            stream_type (str, optional): "live", "movie" or "series"
+            category_ids (Iterable[int], optional): Keep only these categories
+            is_adult (bool, optional): Keep only adult or only non adult streams
+            added_since (int, optional): Keep streams added at or after this Unix time
+            added_before (int, optional): Keep streams added before this Unix time
+            name (str, optional): Keep streams with exactly this name
+
+        Returns:
+            numpy.ndarray: One boolean per row
+        """
+        first, last, sub_mask = self._sub_mask(stream_type, category_ids, is_adult, added_since, added_before, name)
+        mask = np.zeros(len(self.streams), dtype=np.bool_)
+        mask[first:last] = sub_mask
+        return mask
+
+    def _sub_mask(self, stream_type, category_ids, is_adult, added_since, added_before, name) -> tuple:
+        """Evaluate the conditions only on the rows of the stream type"""
+        if stream_type is not None:
+            first, last = self.type_ranges[stream_type]
+        else:
+            first, last = 0, len(self.streams)
+
+        mask = np.ones(last - first, dtype=np.bool_)
+        if category_ids is not None:
+            mask &= np.isin(self.category_id[first:last], np.fromiter(category_ids, dtype=np.int64))
+        if is_adult is not None:
+            mask &= self.is_adult[first:last] == is_adult
+        if added_since is not None:
+            mask &= self.added[first:last] >= added_since
+        if added_before is not None:
+            mask &= self.added[first:last] < added_before
+        if name is not None:
+            mask &= self.name_id[first:last] == self._name_ids.get(name, -1)
+        return first, last, mask
+
+    def filter(
+        self,
+        stream_type: str = None,
+        category_ids: Iterable[int] = None,
+        is_adult: bool = None,
+        added_since: int = None,
+        added_before: int = None,
+        name: str = None
+        ):
+        """Row indices matching all the given conditions, see mask() for the conditions
+
+        Returns:
+            numpy.ndarray: Row indices
+        """
+        first, _, sub_mask = self._sub_mask(stream_type, category_ids, is_adult, added_since, added_before, name)
+        return np.flatnonzero(sub_mask) + first
+
+    def view(self, indices) -> StreamView:
+        """Stream objects at the given row indices"""
+        return StreamView(self.streams, indices)
+
+    def added_in_last_days(self, days: float, stream_type: str = "movie", now: float = None):
+        """Row indices of the streams added in the last days
+
+        Args:
+            days (float): Number of days
+            stream_type (str, optional): "live", "movie" or "series". Defaults to "movie".
+            now (float, optional): Unix time of the end of the window. Defaults to the current time.
+
+        Returns:
+            numpy.ndarray: Row indices
+        """
+        if now is None:
+            now = time.time()
+        return self.filter(stream_type=stream_type, added_since=int(now - days * 86400))
+
+    def count_by_category(self, indices=None) -> Dict[int, int]:
+        """Number of streams per category ID
+
+        Args:
+            indices (numpy.ndarray, optional): Count only these rows. Defaults to all rows.
+
+        Returns:
+            Dict[int, int]: Category ID -> number of streams
+        """
+        category_id = self.category_id if indices is None else self.category_id[indices]
+        if len(category_id) == 0:
+            return {}
+
+        # Category IDs are usually small numbers, counting is faster than sorting
+        lowest = int(category_id.min())
+        if int(category_id.max()) - lowest < 1000000:
+            counts = np.bincount(category_id - lowest)
+            values = np.flatnonzero(counts)
+            return dict(zip((values + lowest).tolist(), counts[values].tolist()))
+
+        values, counts = np.unique(category_id, return_counts=True)
+        return dict(zip(values.tolist(), counts.tolist()))
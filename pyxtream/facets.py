@@ -0,0 +1,207 @@
+"""
+pyxtream facets
+
+Faceted filtering of a loaded catalog with bitsets.
+
+Every stream is one bit, and for each value of each facet (stream type,
+region, category, adult flag, container) the index keeps a Python int
+with the bits of the streams having that value. A filter is the AND of
+one int per facet, and the number of streams of a value is the bit count
+of its int AND the filter, so filtering and counting do not loop over
+the streams.
+
+The streams are numbered by added time, so the streams added after a
+date are a single range of bits.
+
+    facets = xt.facets
+    result = facets.filter(stream_type="movie", region=("EU", "AM"), is_adult=False, added_since=last_week)
+    print(result.count, result.counts("region", "container"))
+    newest = result.streams(limit=50, newest_first=True)
+
+It is built on first use for each catalog, see XTream.facets.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List
+
+# Facets that can be filtered and counted
+FACETS = ("stream_type", "region", "category", "is_adult", "container")
+
+if hasattr(int, "bit_count"):
+    def _bit_count(mask: int) -> int:
+        return mask.bit_count()
+else:
+    def _bit_count(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+def _to_bitset(rows: Iterable[int], number_of_rows: int) -> int:
+    """Build the int whose bits are the rows"""
+    bits = bytearray((number_of_rows + 7) // 8)
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(bits, "little")
+
+
+class FacetResult:
+    """Streams matching a filter"""
+
+    def __init__(self, index: "FacetIndex", mask: int):
+        self.index = index
+        # Bit i is set when the stream of row i matches
+        self.mask = mask
+        self.count = _bit_count(mask)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def counts(self, *facets: str) -> Dict[str, Dict[object, int]]:
+        """Number of matching streams for each value of some facets
+
+        Args:
+            facets (str): Names of the facets, all of them by default
+
+        Returns:
+            Dict[str, Dict[object, int]]: Facet -> value -> number of streams, without the values at 0
+        """
+        counts = {}
+        for facet in facets or FACETS:
+            facet_counts = {}
+            for value, bitset in self.index.bitsets[facet].items():
+                count = _bit_count(bitset & self.mask)
+                if count:
+                    facet_counts[value] = count
+            counts[facet] = facet_counts
+        return counts
+
+    def rows(self, newest_first: bool = False) -> List[int]:
+        """Row numbers of the matching streams, oldest first"""
+        data = self.mask.to_bytes((self.index.number_of_rows + 7) // 8, "little")
+        rows = []
+        # Skip the empty 64 bit words
+        for word_position in range(0, len(data), 8):
+            word = int.from_bytes(data[word_position:word_position + 8], "little")
+            while word:
+                lowest_bit = word & -word
+                rows.append(word_position * 8 + lowest_bit.bit_length() - 1)
+                word ^= lowest_bit
+        if newest_first:
+            rows.reverse()
+        return rows
+
+    def streams(self, limit: int = None, newest_first: bool = False) -> List:
+        """The matching streams
+
+        Args:
+            limit (int, optional): Maximum number of streams. Defaults to all.
+            newest_first (bool, optional): Sort by added time, newest first. Defaults to oldest first.
+
+        Returns:
+            List: The Channel and Serie objects
+        """
+        rows = self.rows(newest_first)
+        if limit is not None:
+            rows = rows[:limit]
+        return [self.index.streams[row] for row in rows]
+
+
+class FacetIndex:
+
+    def __init__(self, catalog):
+        """Index the streams of a catalog
+
+        Args:
+            catalog (CatalogSnapshot): Loaded catalog, for example XTream.catalog
+        """
+        streams = list(catalog.channels) + list(catalog.movies) + list(catalog.series)
+        number_of_channels = len(catalog.channels) + len(catalog.movies)
+
+        def get_added(position: int) -> int:
+            stream = streams[position]
+            return stream.added if position < number_of_channels else stream.last_modified
+
+        # Row number -> stream, sorted by added time
+        order = sorted(range(len(streams)), key=get_added)
+        self.streams = [streams[position] for position in order]
+        self.added = [get_added(position) for position in order]
+        self.number_of_rows = len(self.streams)
+        self.all_rows = (1 << self.number_of_rows) - 1
+
+        # Facet -> value -> rows
+        rows: Dict[str, Dict[object, list]] = {facet: {} for facet in FACETS}
+        for row, position in enumerate(order):
+            stream = streams[position]
+            if position < number_of_channels:
+                rows["stream_type"].setdefault(stream.stream_type, []).append(row)
+                rows["is_adult"].setdefault(stream.is_adult == 1, []).append(row)
+                rows["container"].setdefault(stream.container_extension, []).append(row)
+            else:
+                rows["stream_type"].setdefault("series", []).append(row)
+                rows["is_adult"].setdefault(False, []).append(row)
+
+        # A stream listed in several groups has all their categories and regions
+        row_of = {streams[position]: row for row, position in enumerate(order)}
+        for group in catalog.groups:
+            for stream in (group.series if group.stream_type == "Series" else group.channels):
+                row = row_of.get(stream)
+                if row is None:
+                    continue
+                rows["category"].setdefault(group.group_id, []).append(row)
+                if group.region_shortname:
+                    rows["region"].setdefault(group.region_shortname, []).append(row)
+
+        # Facet -> value -> bitset of the rows
+        self.bitsets: Dict[str, Dict[object, int]] = {
+            facet: {value: _to_bitset(value_rows, self.number_of_rows) for value, value_rows in values.items()}
+            for facet, values in rows.items()
+        }
+
+    def get_mask(self, facet: str, values) -> int:
+        """Bitset of the streams having one of some values of a facet
+
+        Args:
+            facet (str): Name of the facet
+            values: A value, or a list, tuple or set of values
+
+        Returns:
+            int: The bitset
+        """
+        if facet not in self.bitsets:
+            raise ValueError(f"unknown facet `{facet}`, use one of {FACETS}")
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            values = (values,)
+        mask = 0
+        for value in values:
+            mask |= self.bitsets[facet].get(value, 0)
+        return mask
+
+    def get_added_mask(self, added_since: float = None, added_before: float = None) -> int:
+        """Bitset of the streams added in a time window, a range of bits since the rows are sorted"""
+        first = 0 if added_since is None else bisect_left(self.added, added_since)
+        last = self.number_of_rows if added_before is None else bisect_left(self.added, added_before)
+        if last <= first:
+            return 0
+        return ((1 << last) - 1) ^ ((1 << first) - 1)
+
+    def filter(self, added_since: float = None, added_before: float = None, **facets) -> FacetResult:
+        """Streams matching all the given facets
+
+        Args:
+            added_since (float, optional): Unix time, only the streams added at or after it
+            added_before (float, optional): Unix time, only the streams added before it
+            facets: Facet name -> value or list of values, for example
+                    `stream_type="movie", region=("EU", "AM"), is_adult=False, container="mkv", category=12`
+
+        Returns:
+            FacetResult: The matching streams
+        """
+        mask = self.all_rows
+        if added_since is not None or added_before is not None:
+            mask &= self.get_added_mask(added_since, added_before)
+        for facet, values in facets.items():
+            if values is None:
+                continue
+            mask &= self.get_mask(facet, values)
+            if not mask:
+                break
+        return FacetResult(self, mask)
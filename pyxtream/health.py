@@ -0,0 +1,196 @@
+"""
+pyxtream health
+
+Check which streams actually play.
+
+Each stream URL is opened, the headers and the first kilobytes are read,
+and the result is kept in a map saved in the cache folder:
+
+    health = xt.health
+    health.probe(xt.channels)
+    playing = health.filter(group.channels)
+    results = xt.search_stream("^.*News.*$", hide_dead=True)
+
+The number of probes running at the same time never exceeds the
+`max_connections` of the account, so checking does not get it blocked.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import Dict, Iterable, List
+
+from pyxtream.progress import progress
+
+HEALTH_FILENAME = "health.json"
+
+
+class HealthChecker:
+
+    def __init__(
+        self,
+        xtream,
+        max_workers: int = None,
+        probe_bytes: int = 64*1024,
+        timeout: tuple = (3, 5),
+        max_age_sec: int = 60*60*24
+        ):
+        """Initialize the health checker of a provider
+
+        Args:
+            xtream (XTream): Authenticated XTream instance
+            max_workers (int, optional): Number of probes at the same time, never more than the
+                                         account max_connections. Defaults to max_connections.
+            probe_bytes (int, optional): Number of bytes read from each stream. Defaults to 64 KB.
+            timeout (tuple, optional): Connection and read timeouts in seconds. Defaults to (3, 5).
+            max_age_sec (int, optional): Results older than this are unknown again. Defaults to 1 day.
+        """
+        self.xtream = xtream
+        self.probe_bytes = probe_bytes
+        self.timeout = timeout
+        self.max_age_sec = max_age_sec
+
+        max_connections = self._get_max_connections()
+        if max_workers is None:
+            max_workers = max_connections
+        self.max_workers = max(1, min(max_workers, max_connections))
+
+        # Stream key -> result of the last probe
+        self.results: Dict[str, dict] = xtream._load_from_file(HEALTH_FILENAME, ignore_age=True) or {}
+        self._lock = threading.Lock()
+
+    def _get_max_connections(self) -> int:
+        """Maximum number of simultaneous streams of the account, 1 if unknown"""
+        try:
+            return max(1, int(self.xtream.auth_data["user_info"]["max_connections"]))
+        except (KeyError, TypeError, ValueError):
+            return 1
+
+    @staticmethod
+    def get_key(stream) -> str:
+        """Key of a stream in the results, series have their own keys and are never probed"""
+        series_id = getattr(stream, "series_id", None)
+        if series_id is not None:
+            return f"series:{series_id}"
+        return f"{stream.stream_type}:{stream.id}"
+
+    def probe_stream(self, stream) -> dict:
+        """Open a stream URL and read its first bytes
+
+        Args:
+            stream (Channel): The stream
+
+        Returns:
+            dict: Result with the keys `alive`, `status`, `latency` (seconds until the headers),
+                  `throughput` (bytes per second), `checked` (Unix time) and `error`
+        """
+        import requests
+
+        result = {"alive": False, "status": 0, "latency": None, "throughput": None, "checked": time.time(), "error": ""}
+        start = timer()
+        try:
+            with requests.get(
+                stream.url,
+                timeout=self.timeout,
+                stream=True,
+                allow_redirects=True,
+                headers=self.xtream.connection_headers
+                ) as response:
+                result["status"] = response.status_code
+                result["latency"] = timer() - start
+                if response.status_code == 200:
+                    received = 0
+                    body_start = timer()
+                    for data in response.iter_content(16*1024):
+                        received += len(data)
+                        if received >= self.probe_bytes:
+                            break
+                    elapsed = timer() - body_start
+                    result["throughput"] = received / elapsed if elapsed > 0 else None
+                    result["alive"] = received > 0
+                    if received == 0:
+                        result["error"] = "empty stream"
+                else:
+                    result["error"] = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            result["error"] = type(e).__name__
+
+        self.xtream.metrics.inc("pyxtream_health_probes_total", alive=str(result["alive"]).lower())
+        if result["latency"] is not None:
+            self.xtream.metrics.observe("pyxtream_health_latency_seconds", result["latency"])
+
+        with self._lock:
+            self.results[self.get_key(stream)] = result
+        return result
+
+    def probe(self, streams: Iterable, skip_fresh: bool = True, save: bool = True) -> Dict[str, dict]:
+        """Probe streams concurrently
+
+        Args:
+            streams (Iterable): Channels to check
+            skip_fresh (bool, optional): Do not probe again the streams with a result younger
+                                         than max_age_sec. Defaults to True.
+            save (bool, optional): Save the results in the cache folder. Defaults to True.
+
+        Returns:
+            Dict[str, dict]: Stream key -> result, for the streams probed
+        """
+        streams = [stream for stream in streams if not (skip_fresh and self.get_result(stream) is not None)]
+        number_of_streams = len(streams)
+        probed = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            jobs = {executor.submit(self.probe_stream, stream): stream for stream in streams}
+            for done, job in enumerate(jobs, 1):
+                probed[self.get_key(jobs[job])] = job.result()
+                progress(done, number_of_streams, "Checking streams")
+
+        if save:
+            self.save()
+        return probed
+
+    def save(self) -> bool:
+        """Save the results in the cache folder
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        with self._lock:
+            results = dict(self.results)
+        return self.xtream._save_to_file(results, HEALTH_FILENAME)
+
+    def get_result(self, stream) -> dict:
+        """Last probe result of a stream, None if never probed or too old"""
+        result = self.results.get(self.get_key(stream))
+        if result is None or time.time() - result["checked"] > self.max_age_sec:
+            return None
+        return result
+
+    def is_alive(self, stream) -> bool:
+        """Tell if a stream played at the last probe
+
+        Returns:
+            bool: True or False, None if unknown
+        """
+        result = self.get_result(stream)
+        if result is None:
+            return None
+        return result["alive"]
+
+    def is_dead(self, stream) -> bool:
+        """Tell if a stream did not play at the last probe, False if unknown"""
+        return self.is_alive(stream) is False
+
+    def filter(self, streams: Iterable, keep_unknown: bool = True) -> List:
+        """Remove the dead streams from a list
+
+        Args:
+            streams (Iterable): Streams, for example Group.channels
+            keep_unknown (bool, optional): Keep the streams never probed. Defaults to True.
+
+        Returns:
+            List: The streams that play
+        """
+        if keep_unknown:
+            return [stream for stream in streams if not self.is_dead(stream)]
+        return [stream for stream in streams if self.is_alive(stream)]
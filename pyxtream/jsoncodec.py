@@ -0,0 +1,93 @@
+"""
+pyxtream jsoncodec
+
+JSON encoding and decoding of the provider answers and of the cache files.
+
+orjson is used when it is installed, it is several times faster than the
+json module on large catalogs. Install it with `pip3 install pyxtream[FAST_JSON]`.
+Otherwise the json module is used.
+
+Both work on bytes: loads() accepts the raw body of a response or the
+content of a file, and dumps() returns UTF-8 bytes ready to be written,
+avoiding a copy to and from str.
+"""
+
+import json
+from typing import Any, Iterable, Union
+
+try:
+    import orjson
+    USE_ORJSON = True
+except ImportError:
+    USE_ORJSON = False
+
+# Name of the backend in use, reported by the benchmarks
+BACKEND = "orjson" if USE_ORJSON else "json"
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document
+
+    Args:
+        data (bytes|str): JSON document, bytes are decoded as UTF-8
+
+    Raises:
+        json.JSONDecodeError: The document is not valid JSON
+
+    Returns:
+        Any: The decoded document
+    """
+    if USE_ORJSON:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter, for example with integers larger than 64 bits
+            pass
+    return json.loads(data)
+
+
+def dumps(data: Any) -> bytes:
+    """Encode to a compact JSON document
+
+    Args:
+        data (Any): Object to encode
+
+    Returns:
+        bytes: JSON document in UTF-8, non ASCII characters are not escaped
+    """
+    if USE_ORJSON:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Types orjson does not support, like integers larger than 64 bits
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def join_array(fragments: Iterable[bytes]) -> bytes:
+    """Build a JSON array from already encoded items
+
+    Args:
+        fragments (Iterable[bytes]): Encoded items
+
+    Returns:
+        bytes: JSON array
+    """
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def add_key(fragment: bytes, key: str, value: Any) -> bytes:
+    """Add a key to an already encoded JSON object
+
+    Args:
+        fragment (bytes): Encoded JSON object, which does not have the key yet
+        key (str): Key to add
+        value (Any): Value of the key
+
+    Returns:
+        bytes: The encoded JSON object with the key
+    """
+    member = dumps({key: value})[1:-1]
+    if fragment == b"{}":
+        return b"{" + member + b"}"
+    return fragment[:-1] + b"," + member + b"}"
@@ -0,0 +1,120 @@
+"""
+pyxtream jsonstream
+
+Incremental parser for large JSON arrays.
+
+The items of the array are decoded and returned one at a time while the
+data is read in chunks, from a cache file or an HTTP response, so the
+whole document is never held in memory.
+
+    for stream_info in iter_json_array(response.iter_content(65536)):
+        ...
+"""
+
+import codecs
+import json
+from typing import Iterable, Iterator
+
+# Characters that can appear between JSON values
+_WHITESPACE = " \t\n\r"
+
+# Drop the decoded part of the buffer once it is larger than this
+_COMPACT_SIZE = 1 << 16
+
+
+class JSONStreamError(ValueError):
+    """The data is not a valid JSON array"""
+
+
+class _Buffer:
+    """Text decoded from the chunks, with the position of the parser"""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.position = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """Append the next chunk to the buffer
+
+        Returns:
+            bool: False when there is no more data
+        """
+        if self.eof:
+            return False
+
+        # Forget what was already parsed
+        if self.position > _COMPACT_SIZE:
+            self.text = self.text[self.position:]
+            self.position = 0
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.text += text
+                return True
+
+        self.text += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def next_char(self) -> str:
+        """Skip the white spaces and return the next character, empty at the end of the data"""
+        while True:
+            while self.position < len(self.text) and self.text[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                return ""
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """Decode the items of a JSON array one at a time
+
+    Args:
+        chunks (Iterable[bytes]): The JSON document in UTF-8, in chunks of any size
+
+    Raises:
+        JSONStreamError: The data is not a JSON array
+
+    Yields:
+        The items of the array, decoded with json
+    """
+    decoder = json.JSONDecoder()
+    buffer = _Buffer(chunks)
+
+    # Skip a UTF-8 byte order mark
+    if buffer.next_char() == "\ufeff":
+        buffer.position += 1
+
+    if buffer.next_char() != "[":
+        raise JSONStreamError("expected a JSON array")
+    buffer.position += 1
+
+    if buffer.next_char() == "]":
+        return
+
+    while True:
+        buffer.next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer.text, buffer.position)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer.text) or buffer.eof:
+                    break
+            except json.JSONDecodeError as e:
+                if buffer.eof:
+                    raise JSONStreamError(f"invalid JSON: {e}") from e
+            buffer.read_more()
+        buffer.position = end
+        yield item
+
+        separator = buffer.next_char()
+        buffer.position += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise JSONStreamError(f"expected `,` or `]` after item, found `{separator}`")
@@ -0,0 +1,174 @@
+"""
+pyxtream metrics
+
+Collects counters and timings while pyxtream talks to the provider and
+builds the catalog.
+
+Every measure is
+- logged to the `pyxtream.metrics` logger at DEBUG level,
+- passed to the registered callbacks as `callback(name, value, labels)`,
+- aggregated so it can be read with `snapshot()` or exported in the
+  Prometheus text format with `to_prometheus()`.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from timeit import default_timer as timer
+from typing import Callable, Dict, List
+
+logger = logging.getLogger("pyxtream.metrics")
+
+# Metric name -> (type, help)
+METRICS = {
+    "pyxtream_http_request_seconds": ("summary", "Time spent waiting for the provider, by action"),
+    "pyxtream_http_bytes_total": ("counter", "Bytes received from the provider, by action"),
+    "pyxtream_http_errors_total": ("counter", "Failed requests to the provider, by action and error"),
+    "pyxtream_json_decode_seconds": ("summary", "Time spent decoding JSON, by source and action"),
+    "pyxtream_authenticate_seconds": ("summary", "Time spent authenticating, including retries"),
+    "pyxtream_authenticate_attempts_total": ("counter", "Connection attempts to authenticate"),
+    "pyxtream_load_seconds": ("summary", "Time spent getting groups and streams, by stream type and phase"),
+    "pyxtream_build_seconds": ("summary", "Time spent building the stream objects, by stream type"),
+    "pyxtream_streams_total": ("counter", "Streams added to the catalog, by stream type"),
+    "pyxtream_streams_duplicate_total": ("counter", "Streams listed again in another group, by stream type"),
+    "pyxtream_streams_skipped_total": ("counter", "Streams skipped during load, by stream type and reason"),
+    "pyxtream_streams_catch_all_total": ("counter", "Streams added to the catch-all group, by stream type"),
+    "pyxtream_health_probes_total": ("counter", "Streams checked by the health checker, by result"),
+    "pyxtream_health_latency_seconds": ("summary", "Time until the headers of a checked stream"),
+    "pyxtream_download_seconds": ("summary", "Time spent downloading videos"),
+    "pyxtream_download_bytes_total": ("counter", "Bytes of video downloaded"),
+    "pyxtream_download_errors_total": ("counter", "Failed video downloads"),
+    "pyxtream_record_bytes_total": ("counter", "Bytes of live video recorded"),
+    "pyxtream_record_gaps_total": ("counter", "Live segments missing from the recordings"),
+}
+
+
+class Metrics:
+    """Metrics of one XTream instance"""
+
+    def __init__(self, provider_name: str = ""):
+        self.provider_name = provider_name
+        self.callbacks: List[Callable] = []
+
+        # (name, labels) -> value for counters, [count, sum, max] for summaries
+        self._counters: Dict[tuple, float] = {}
+        self._summaries: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def add_callback(self, callback: Callable):
+        """Register a function called for every measure
+
+        Args:
+            callback (Callable): Called as `callback(name, value, labels)`
+        """
+        self.callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable):
+        """Unregister a function added with add_callback"""
+        if callback in self.callbacks:
+            self.callbacks.remove(callback)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Increase a counter
+
+        Args:
+            name (str): Metric name
+            value (float, optional): Amount to add. Defaults to 1.
+            labels: Metric labels
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._emit(name, value, labels)
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one measure of a summary, typically a duration in seconds
+
+        Args:
+            name (str): Metric name
+            value (float): Measured value
+            labels: Metric labels
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            summary = self._summaries.setdefault(key, [0, 0.0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+            summary[2] = max(summary[2], value)
+        self._emit(name, value, labels)
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the time spent in a `with` block"""
+        start = timer()
+        try:
+            yield
+        finally:
+            self.observe(name, timer() - start, **labels)
+
+    def _emit(self, name: str, value: float, labels: dict):
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s %s %s", self.provider_name, name, labels, value)
+
+        for callback in self.callbacks:
+            try:
+                callback(name, value, labels)
+            except Exception:
+                logger.exception("Metrics callback %s failed", callback)
+
+    def snapshot(self) -> dict:
+        """Get the current value of all metrics
+
+        Returns:
+            dict: name -> list of {"labels", "value"} for counters,
+                  or {"labels", "count", "sum", "max"} for summaries
+        """
+        result = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            for (name, labels), (count, total, maximum) in self._summaries.items():
+                result.setdefault(name, []).append(
+                    {"labels": dict(labels), "count": count, "sum": total, "max": maximum}
+                )
+        return result
+
+    def _format_labels(self, labels: tuple) -> str:
+        all_labels = (("provider", self.provider_name),) + labels
+        return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in all_labels) + "}"
+
+    def to_prometheus(self) -> str:
+        """Export all metrics in the Prometheus text exposition format
+
+        The largest value of each summary is exported as a separate
+        gauge named `<summary>_max`.
+
+        Returns:
+            str: The metrics, one sample per line
+        """
+        samples = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                samples.setdefault(name, []).append(f"{name}{self._format_labels(labels)} {value}")
+            for (name, labels), (count, total, maximum) in self._summaries.items():
+                lines = samples.setdefault(name, [])
+                lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+                samples.setdefault(f"{name}_max", []).append(f"{name}_max{self._format_labels(labels)} {maximum}")
+
+        output = []
+        for name in sorted(samples):
+            if name in METRICS:
+                metric_type, metric_help = METRICS[name]
+            else:
+                metric_type, metric_help = "gauge", f"Largest value of {name[:-len('_max')]}"
+            output.append(f"# HELP {name} {metric_help}")
+            output.append(f"# TYPE {name} {metric_type}")
+            output.extend(samples[name])
+
+        return "\n".join(output) + "\n"
+
+
+def _escape(value) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
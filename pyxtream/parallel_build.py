@@ -0,0 +1,147 @@
+"""
+pyxtream parallel build
+
+Functions used to build the catalog in worker processes.
+
+Workers receive chunks of streams as sent by the provider, and return for
+each stream only the attributes computed while building it (logo path,
+numbers, ...) as a tuple. The attributes that are the very strings of the
+provider dictionary, like the name, are not sent back: the main process
+takes them from the dictionary it already holds, so they are not stored
+twice, and rebuilds the objects without paying again for the logo path
+and validation.
+"""
+
+import sys
+from typing import List, Tuple
+
+from pyxtream.pyxtream import Channel, Serie, XTream
+
+# Attributes computed while building a stream, in the order they are sent back
+CHANNEL_FIELDS = (
+    "stream_type", "id", "name", "logo", "logo_path", "title", "group_id",
+    "epg_channel_id", "is_adult", "added", "container_extension"
+)
+# Low cardinality attributes, interned again after being sent back
+INTERNED_CHANNEL_FIELDS = ("stream_type", "container_extension")
+SERIE_FIELDS = (
+    "name", "logo", "logo_path", "series_id", "plot", "youtube_trailer", "genre", "last_modified",
+    "group_id"
+)
+# Key of the provider dictionary each field is copied from, None for the computed ones
+CHANNEL_RAW_KEYS = (
+    None, "stream_id", "name", "stream_icon", None, "name", None,
+    "epg_channel_id", None, None, "container_extension"
+)
+SERIE_RAW_KEYS = ("name", "cover", None, "series_id", "plot", "youtube_trailer", "genre", None, None)
+
+# Sent instead of a value to take from the provider dictionary
+_FROM_RAW = ...
+
+
+class BuildContext:
+    """Picklable stand-in for XTream holding what is needed to build streams"""
+
+    live_type = XTream.live_type
+    vod_type = XTream.vod_type
+    series_type = XTream.series_type
+
+    # Reuse XTream helpers as they only depend on the attributes below
+    _slugify = XTream._slugify
+    _validate_url = XTream._validate_url
+    _get_logo_local_path = XTream._get_logo_local_path
+    _get_skip_reason = XTream._get_skip_reason
+
+    def __init__(self, xtream: XTream):
+        self.name = xtream.name
+        self.server = xtream.server
+        self.cache_path = xtream.cache_path
+        self.authorization = dict(xtream.authorization)
+        self.url_template = xtream.url_template
+        self.hide_adult_content = xtream.hide_adult_content
+
+
+def normalize_streams(
+    context: BuildContext,
+    stream_type: str,
+    streams: List[dict],
+    first_index: int
+    ) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+    """Build a chunk of streams and reduce them to tuples
+
+    Args:
+        context (BuildContext): Provider information
+        stream_type (str): Stream type can be Live, VOD, Series
+        streams (List[dict]): Streams as received from the provider
+        first_index (int): Position of the first stream in the whole list
+
+    Returns:
+        Tuple[List[tuple], List[Tuple[int, str]]]: For each stream kept its position, group ID and
+            attributes, and for each stream skipped its position and the reason
+    """
+    records = []
+    skipped = []
+
+    if stream_type == context.series_type:
+        fields = tuple(zip(SERIE_FIELDS, SERIE_RAW_KEYS))
+    else:
+        fields = tuple(zip(CHANNEL_FIELDS, CHANNEL_RAW_KEYS))
+
+    for index, stream_channel in enumerate(streams, first_index):
+        skip_reason = context._get_skip_reason(stream_type, stream_channel)
+        if skip_reason is not None:
+            skipped.append((index, skip_reason))
+            continue
+
+        # Some channels have no group, they go to the catch all group
+        if stream_channel["category_id"] is None:
+            stream_channel["category_id"] = "9999"
+
+        if stream_type == context.series_type:
+            new_stream = Serie(context, stream_channel)
+        else:
+            new_stream = Channel(context, "", stream_channel)
+
+        values = []
+        for field, raw_key in fields:
+            value = getattr(new_stream, field)
+            if raw_key is not None and value is stream_channel.get(raw_key):
+                value = _FROM_RAW
+            values.append(value)
+        records.append((index, int(stream_channel["category_id"]), tuple(values)))
+
+    return records, skipped
+
+
+def restore_stream(xtream: XTream, stream_type: str, values: tuple, stream_info: dict):
+    """Rebuild a stream from the tuple returned by normalize_streams
+
+    Args:
+        xtream (XTream): Provider owning the stream
+        stream_type (str): Stream type can be Live, VOD, Series
+        values (tuple): Attributes of the stream
+        stream_info (dict): Stream as received from the provider
+
+    Returns:
+        Channel|Serie: The stream
+    """
+    raw_keys = SERIE_RAW_KEYS if stream_type == xtream.series_type else CHANNEL_RAW_KEYS
+    values = [
+        stream_info.get(raw_key) if value is _FROM_RAW else value for value, raw_key in zip(values, raw_keys)
+    ]
+
+    if stream_type == xtream.series_type:
+        new_stream = Serie.__new__(Serie)
+        new_stream.__dict__.update(zip(SERIE_FIELDS, values))
+        new_stream.xtream = xtream
+        new_stream.seasons = {}
+        new_stream.episodes = {}
+    else:
+        new_stream = Channel.__new__(Channel)
+        new_stream.__dict__.update(zip(CHANNEL_FIELDS, values))
+        for field in INTERNED_CHANNEL_FIELDS:
+            setattr(new_stream, field, sys.intern(getattr(new_stream, field)))
+        new_stream._url_template = xtream.url_template
+
+    new_stream.raw = stream_info
+    return new_stream
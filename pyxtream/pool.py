@@ -0,0 +1,250 @@
+"""
+pyxtream pool
+
+Manage several XTream providers from a single process.
+
+Every provider gets its own XTream instance, they are authenticated and
+loaded in parallel, and the pool offers a merged view of all the catalogs
+where the same stream offered by more than one provider is only listed once.
+"""
+
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from pyxtream import jsoncodec
+from pyxtream.pyxtream import XTream
+
+
+# Language or quality prefix of the names, like "EN| ", "ENG| " or "FR: ", starting with a letter so
+# that "2001: A Space Odyssey" keeps its name, and of 2 letters before ":" for "CSI: Miami"
+_NAME_PREFIX = re.compile(r"^\s*(?:([A-Z][A-Z0-9]{1,3})\s*\||([A-Z][A-Z0-9])\s*:)\s*")
+_NAME_YEAR = re.compile(r"[(\[]((?:19|20)\d\d)[)\]]")
+_NAME_BRACKETS = re.compile(r"\(.*?\)|\[.*?\]")
+_NAME_QUALITY = re.compile(r"\b(?:sd|hd|fhd|uhd|4k|hevc|multi|vostfr)\b")
+_NAME_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def stream_fingerprint(stream) -> tuple:
+    """Key recognizing the same stream at different providers
+
+    Providers give different IDs to the same title, and decorate the names
+    differently. The fingerprint uses the language prefix, the name without
+    accents, case, punctuation and quality tags, the year and the container
+    extension. The versions of a title in different languages stay apart.
+
+    Args:
+        stream (Channel|Serie): The stream
+
+    Returns:
+        tuple: (stream type, language, normalized name, year, container extension)
+    """
+    fingerprint = getattr(stream, "_fingerprint", None)
+    if fingerprint is not None:
+        return fingerprint
+
+    name = stream.name
+    language = ""
+    match = _NAME_PREFIX.match(name)
+    if match is not None:
+        name = name[match.end():]
+        prefix = match.group(1) or match.group(2)
+        # "HD| " is a quality, "EN| " a language
+        if _NAME_QUALITY.fullmatch(prefix.casefold()) is None:
+            language = prefix.upper()
+
+    # The year from the provider, or from the name, or from the release date
+    raw = stream.raw
+    if not isinstance(raw, dict):
+        raw = {}
+    year = str(raw.get("year") or "")
+    if not year:
+        match = _NAME_YEAR.search(name)
+        if match is not None:
+            year = match.group(1)
+    if not year:
+        release_date = str(raw.get("releaseDate") or raw.get("release_date") or "")
+        if release_date[:4].isdigit():
+            year = release_date[:4]
+
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c)).casefold()
+    name = _NAME_BRACKETS.sub(" ", name)
+    name = _NAME_QUALITY.sub(" ", name)
+    name = " ".join(_NAME_SEPARATORS.sub(" ", name).split())
+
+    fingerprint = (
+        getattr(stream, "stream_type", "series"),
+        language,
+        name,
+        year,
+        getattr(stream, "container_extension", "")
+    )
+    stream._fingerprint = fingerprint
+    return fingerprint
+
+
+class XTreamPool:
+
+    def __init__(self, providers: List[dict], max_workers: int = None, **xtream_kwargs):
+        """Initialize the XTream Pool
+
+        Args:
+            providers    (List[dict]):    One dictionary per provider with the keys `provider_name`,
+                                          `provider_username`, `provider_password` and `provider_url`.
+                                          Any other key is passed to that provider XTream constructor.
+            max_workers  (int, optional): Number of providers handled at the same time.
+                                          Defaults to the number of providers.
+            xtream_kwargs:                Arguments passed to every XTream constructor
+
+        - Note: The REST API is turned OFF for the providers unless `enable_flask` is given,
+                since all instances would try to serve on the same port. With `lazy_init`, the
+                providers are still authenticated by authenticate() or load_iptv().
+        """
+        self.provider_settings = providers
+        self.max_workers = max_workers if max_workers is not None else max(len(providers), 1)
+        self.xtream_kwargs = xtream_kwargs
+        self.xtream_kwargs.setdefault("enable_flask", False)
+
+        self.providers: List[XTream] = []
+
+    def _create_provider(self, settings: dict) -> XTream:
+        kwargs = dict(self.xtream_kwargs)
+        kwargs.update(settings)
+        xt = XTream(**kwargs)
+        # With lazy_init the constructor did not authenticate
+        xt._lazy_start()
+        return xt
+
+    def authenticate(self) -> List[XTream]:
+        """Create and authenticate all the providers in parallel
+
+        Returns:
+            List[XTream]: The XTream instances that could authenticate
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyxtream-pool") as executor:
+            all_providers = list(executor.map(self._create_provider, self.provider_settings))
+
+        self.providers = [xt for xt in all_providers if xt.state["authenticated"]]
+        for xt in all_providers:
+            if not xt.state["authenticated"]:
+                print(f"Pool: provider `{xt.name}` could not authenticate and will be ignored")
+
+        return self.providers
+
+    def load_iptv(self) -> bool:
+        """Authenticate (if needed) and load all the providers in parallel
+
+        Returns:
+            bool: True if all the providers loaded successfully
+        """
+        if len(self.providers) == 0:
+            self.authenticate()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyxtream-pool") as executor:
+            results = list(executor.map(lambda xt: xt.load_iptv(), self.providers))
+
+        return len(results) > 0 and all(result is not False for result in results)
+
+    def get_provider(self, name: str) -> XTream:
+        """Get a provider by name
+
+        Args:
+            name (str): Provider name as given in the settings
+
+        Returns:
+            XTream: The XTream instance or None if not found
+        """
+        return next((xt for xt in self.providers if xt.name == name), None)
+
+    def _merge(self, attribute: str) -> list:
+        merged = []
+        # Fingerprints of the previous providers, each provider already lists a stream once
+        seen = set()
+        for xt in self.providers:
+            provider_keys = set()
+            for stream in getattr(xt, attribute):
+                key = stream_fingerprint(stream)
+                if key not in seen:
+                    provider_keys.add(key)
+                    merged.append(stream)
+            seen |= provider_keys
+        return merged
+
+    @property
+    def channels(self) -> list:
+        """Live channels of all providers, one entry per channel, see stream_fingerprint()"""
+        return self._merge("channels")
+
+    @property
+    def movies(self) -> list:
+        """Movies of all providers, one entry per movie, see stream_fingerprint()"""
+        return self._merge("movies")
+
+    @property
+    def series(self) -> list:
+        """Series of all providers, one entry per series, see stream_fingerprint()"""
+        return self._merge("series")
+
+    @property
+    def groups(self) -> Dict[tuple, list]:
+        """Groups of all providers, grouped by group type and name
+
+        Returns:
+            Dict[tuple, list]: (group_type, name) -> list of Group, one per provider
+        """
+        merged = {}
+        for xt in self.providers:
+            for group in xt.groups:
+                merged.setdefault((group.group_type, group.name), []).append(group)
+        return merged
+
+    def search_stream(self, keyword: str, ignore_case: bool = True, return_type: str = "LIST") -> List:
+        """Search for streams across all the providers
+
+        Results found at more than one provider are returned only once,
+        taken from the first provider in the pool that has it.
+
+        Args:
+            keyword (str): Keyword to search for. Supports REGEX
+            ignore_case (bool, optional): True to ignore case during search. Defaults to "True".
+            return_type (str, optional): Output format, 'LIST', 'JSON' or 'JSON_BYTES'. Defaults to "LIST".
+
+        Returns:
+            List: List with all the results, it could be empty.
+        """
+        if ignore_case:
+            regex = re.compile(keyword, re.IGNORECASE)
+        else:
+            regex = re.compile(keyword)
+
+        search_result = []
+        # Fingerprints of the previous providers, see _merge()
+        seen = set()
+        for xt in self.providers:
+            provider_keys = set()
+            for stream_list in (xt.movies, xt.channels, xt.series):
+                for stream in stream_list:
+                    if re.match(regex, stream.name) is not None:
+                        key = stream_fingerprint(stream)
+                        if key not in seen:
+                            provider_keys.add(key)
+                            search_result.append((xt.name, stream))
+            seen |= provider_keys
+
+        if return_type in ("JSON", "JSON_BYTES"):
+            json_data = jsoncodec.join_array(
+                jsoncodec.add_key(stream.export_json_bytes(), "provider", provider_name)
+                for provider_name, stream in search_result
+            )
+            if return_type == "JSON_BYTES":
+                return json_data
+            return json_data.decode("utf-8")
+
+        results = []
+        for provider_name, stream in search_result:
+            result = stream.export_json()
+            result["provider"] = provider_name
+            results.append(result)
+        return results
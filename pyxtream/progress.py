@@ -21,6 +21,10 @@ import sys
 
 
 def progress(count, total, status=''):
+    # Only draw on a terminal, the carriage return would garble logs
+    if not sys.stdout.isatty():
+        return
+
     bar_len = 60
     filled_len = int(round(bar_len * count / float(total)))
 
@@ -15,28 +15,100 @@ Part of this content comes from
 > _Note_: It does not support M3U
 """
 
-import json
 # used for URL validation
 import re
+from collections import OrderedDict
+import sys
+import threading
 import time
-from os import makedirs
+from importlib.util import find_spec
+from os import cpu_count, makedirs
 from os import path as osp
-from os import remove
+from os import remove, utime
 # Timing xtream json downloads
 from timeit import default_timer as timer
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple
 from datetime import datetime
-import requests
+from urllib.parse import parse_qs, urlparse
+
+from pyxtream import jsoncodec
+from pyxtream.schemaValidator import SchemaType, is_sampled, schemaValidator, validate_many
+
+# requests, jsonschema and Flask are imported when first used to keep
+# `import pyxtream` fast. Only check here that Flask is installed.
+USE_FLASK = find_spec("flask") is not None
+
+from pyxtream.added_index import AddedIndex
+from pyxtream.cache import CacheError, codec_available, iter_cache_file, read_cache_file, write_cache_file
+from pyxtream.cassette import REPLAY, Cassette
+from pyxtream.catalog import CatalogBuilder, CatalogSnapshot
+from pyxtream.changes import ChangeFeed, catalog_state, diff_catalogs
+from pyxtream.jsonstream import iter_json_array
+from pyxtream.metrics import Metrics
+from pyxtream.progress import progress
+from pyxtream.raw_store import RawStore, write_stream_lines
 
-from pyxtream.schemaValidator import SchemaType, schemaValidator
 
-try:
-    from pyxtream.rest_api import FlaskWrap
-    USE_FLASK = True
-except ImportError:
-    USE_FLASK = False
+# Provider fields with few different values. They are interned while loading
+# so that all the streams share the same string objects.
+INTERNED_FIELDS = ("stream_type", "container_extension", "category_id", "is_adult", "rating")
 
-from pyxtream.progress import progress
+
+# Below this number of streams of a type, starting the worker processes of
+# parallel_build costs more than it saves
+PARALLEL_BUILD_MIN_STREAMS = 50000
+
+# Values of the `action` label of the request metrics, the other URLs are counted as "other"
+METRIC_ACTIONS = frozenset((
+    "get_live_categories", "get_live_streams", "get_vod_categories", "get_vod_streams",
+    "get_series_categories", "get_series", "get_series_info", "get_vod_info", "get_short_epg",
+    "get_simple_data_table", "player_api", "xmltv"
+))
+
+
+def intern_fields(stream_info: dict) -> dict:
+    """Intern the low cardinality string values of a stream dictionary
+
+    Args:
+        stream_info (dict): Stream as received from the provider, modified in place
+
+    Returns:
+        dict: The same dictionary
+    """
+    for field in INTERNED_FIELDS:
+        value = stream_info.get(field)
+        if type(value) is str:
+            stream_info[field] = sys.intern(value)
+    return stream_info
+
+
+class StreamUrlTemplate:
+    """Builds the stream URLs of one provider
+
+    Streams only keep their type, ID and extension, the rest of the URL
+    (server, username and password) is stored once here.
+    """
+
+    def __init__(self, server: str, username: str, password: str):
+        self.prefix = f"{server}/"
+        self.credentials = f"/{username}/{password}/"
+        self.valid = True
+
+    def build(self, stream_type: str, stream_id, extension: str) -> str:
+        return f"{self.prefix}{stream_type}{self.credentials}{stream_id}.{extension}"
+
+    def is_valid(self, stream_id, extension: str) -> bool:
+        """Tell if the URL of a stream is valid, knowing that the template itself was validated
+
+        Args:
+            stream_id: Stream ID
+            extension (str): Container extension
+
+        Returns:
+            bool: True if the URL is valid
+        """
+        # A valid URL only needs a path without white spaces
+        return self.valid and not any(c.isspace() for c in f"{stream_id}.{extension}")
 
 
 class Channel:
@@ -48,7 +120,6 @@ class Channel:
     logo_path = ""
     group_title = ""
     title = ""
-    url = ""
 
     # XTream
     stream_type: str = ""
@@ -56,15 +127,22 @@ class Channel:
     is_adult: int = 0
     added: int = 0
     epg_channel_id: str = ""
-    age_days_from_added: int = 0
-    date_now: datetime
+    container_extension: str = ""
 
-    # This contains the raw JSON data
-    raw = ""
+    # Builds the URL, shared by all the streams of the provider
+    _url_template: StreamUrlTemplate = None
 
-    def __init__(self, xtream: object, group_title, stream_info):
-        self.date_now = datetime.now()
+    # Cache of export_json_bytes()
+    _json_fragment: bytes = None
+
+    # Details of the movies, see XTream.vod_info
+    _vod_info_source = None
+
+    # This contains the raw JSON data, or with XTream.raw_on_demand
+    # (RawStore, offset) to read it from the cache file
+    _raw = ""
 
+    def __init__(self, xtream: object, group_title, stream_info):
         stream_type = stream_info["stream_type"]
         # Adjust the odd "created_live" type
         if stream_type in ("created_live", "radio_streams"):
@@ -75,6 +153,7 @@ class Channel:
         else:
             # Raw JSON Channel
             self.raw = stream_info
+            self.stream_type = stream_type
 
             stream_name = stream_info["name"]
 
@@ -91,14 +170,14 @@ class Channel:
                 self.group_id = int(stream_info["category_id"])
 
             if stream_type == "live":
-                stream_extension = "ts"
+                self.container_extension = "ts"
 
                 # Check if epg_channel_id key is available
                 if "epg_channel_id" in stream_info.keys():
                     self.epg_channel_id = stream_info["epg_channel_id"]
 
             elif stream_type == "movie":
-                stream_extension = stream_info["container_extension"]
+                self.container_extension = stream_info["container_extension"]
 
             # Default to 0
             self.is_adult = 0
@@ -107,16 +186,67 @@ class Channel:
                 self.is_adult = int(stream_info["is_adult"])
 
             self.added = int(stream_info["added"])
-            self.age_days_from_added = abs(datetime.utcfromtimestamp(self.added) - self.date_now).days
 
-            # Required by Hypnotix
-            self.url = f"{xtream.server}/{stream_type}/{xtream.authorization['username']}/" \
-                       f"{xtream.authorization['password']}/{stream_info['stream_id']}.{stream_extension}"
+            # The URL is built when needed
+            self._url_template = xtream.url_template
 
             # Check that the constructed URL is valid
-            if not xtream._validate_url(self.url):
+            if not self._url_template.is_valid(self.id, self.container_extension):
                 print(f"{self.name} - Bad URL? `{self.url}`")
 
+    @property
+    def raw(self) -> dict:
+        """Stream as received from the provider, read from the cache file with XTream.raw_on_demand"""
+        raw = self._raw
+        if type(raw) is tuple:
+            raw_store, offset = raw
+            return raw_store.get(offset)
+        return raw
+
+    @raw.setter
+    def raw(self, value: dict):
+        self._raw = value
+
+    def set_raw_source(self, raw_store, offset: int):
+        """Forget the raw JSON data, it is read from a RawStore when needed
+
+        Args:
+            raw_store (RawStore): Cache file of the streams
+            offset (int): Offset of this stream in the file
+        """
+        # Replaces the value of the same attribute, the instances keep sharing the keys of their __dict__
+        self._raw = (raw_store, offset)
+
+    @property
+    def url(self) -> str:
+        """Stream URL, required by Hypnotix"""
+        if self._url_template is None:
+            return ""
+        return self._url_template.build(self.stream_type, self.id, self.container_extension)
+
+    @property
+    def date_now(self) -> datetime:
+        return datetime.now()
+
+    @property
+    def age_days_from_added(self) -> int:
+        """Number of days since the stream was added, always against the current time"""
+        return abs(datetime.utcfromtimestamp(self.added) - datetime.now()).days
+
+    @property
+    def vod_info(self) -> dict:
+        """Details of a movie (plot, cast, tmdb_id, duration...) fetched with XTream.vod_info
+
+        Returns:
+            dict: The `info` part of the get_vod_info answer, None if not fetched
+        """
+        if self._vod_info_source is None:
+            return None
+        data = self._vod_info_source.get(self.id)
+        if data is None:
+            return None
+        return data.get("info")
+
     def export_json(self):
         jsondata = {}
 
@@ -126,6 +256,16 @@ class Channel:
 
         return jsondata
 
+    def export_json_bytes(self) -> bytes:
+        """export_json() encoded in JSON, built on first use and kept until invalidate_json()"""
+        if self._json_fragment is None:
+            self._json_fragment = jsoncodec.dumps(self.export_json())
+        return self._json_fragment
+
+    def invalidate_json(self):
+        """Forget the encoded JSON, to be called when the stream changes"""
+        self._json_fragment = None
+
 
 class Group:
     # Required by Hypnotix
@@ -134,6 +274,7 @@ class Group:
 
     # XTream
     group_id = ""
+    stream_type = ""
 
     # This contains the raw JSON data
     raw = ""
@@ -159,6 +300,7 @@ class Group:
 
         self.channels = []
         self.series = []
+        self.stream_type = stream_type
 
         TV_GROUP, MOVIES_GROUP, SERIES_GROUP = range(3)
 
@@ -210,14 +352,17 @@ class Episode:
         self.logo = series_info["cover"]
         self.logo_path = xtream._get_logo_local_path(self.logo)
 
-        self.url =  f"{xtream.server}/series/" \
-                    f"{xtream.authorization['username']}/" \
-                    f"{xtream.authorization['password']}/{self.id}.{self.container_extension}"
+        # The URL is built when needed
+        self._url_template = xtream.url_template
 
         # Check that the constructed URL is valid
-        if not xtream._validate_url(self.url):
+        if not self._url_template.is_valid(self.id, self.container_extension):
             print(f"{self.name} - Bad URL? `{self.url}`")
 
+    @property
+    def url(self) -> str:
+        return self._url_template.build("series", self.id, self.container_extension)
+
 
 class Serie:
     # Required by Hypnotix
@@ -230,9 +375,15 @@ class Serie:
     plot = ""
     youtube_trailer = ""
     genre = ""
+    last_modified: int = 0
+    group_id: str = ""
 
-    # This contains the raw JSON data
-    raw = ""
+    # This contains the raw JSON data, or with XTream.raw_on_demand
+    # (RawStore, offset) to read it from the cache file
+    _raw = ""
+
+    # Cache of export_json_bytes()
+    _json_fragment: bytes = None
 
     def __init__(self, xtream: object, series_info):
         # Raw JSON Series
@@ -263,6 +414,37 @@ class Serie:
         if "genre" in series_info.keys():
             self.genre = series_info["genre"]
 
+        # Check if last_modified key is available
+        if series_info.get("last_modified"):
+            self.last_modified = int(series_info["last_modified"])
+
+        # Check if category_id key is available
+        if series_info.get("category_id") is not None:
+            self.group_id = int(series_info["category_id"])
+
+    @property
+    def raw(self) -> dict:
+        """Series as received from the provider, read from the cache file with XTream.raw_on_demand"""
+        raw = self._raw
+        if type(raw) is tuple:
+            raw_store, offset = raw
+            return raw_store.get(offset)
+        return raw
+
+    @raw.setter
+    def raw(self, value: dict):
+        self._raw = value
+
+    def set_raw_source(self, raw_store, offset: int):
+        """Forget the raw JSON data, it is read from a RawStore when needed
+
+        Args:
+            raw_store (RawStore): Cache file of the series
+            offset (int): Offset of this series in the file
+        """
+        # Replaces the value of the same attribute, the instances keep sharing the keys of their __dict__
+        self._raw = (raw_store, offset)
+
     def export_json(self):
         jsondata = {}
 
@@ -271,6 +453,16 @@ class Serie:
 
         return jsondata
 
+    def export_json_bytes(self) -> bytes:
+        """export_json() encoded in JSON, built on first use and kept until invalidate_json()"""
+        if self._json_fragment is None:
+            self._json_fragment = jsoncodec.dumps(self.export_json())
+        return self._json_fragment
+
+    def invalidate_json(self):
+        """Forget the encoded JSON, to be called when the stream changes"""
+        self._json_fragment = None
+
 class Season:
     # Required by Hypnotix
     name = ""
@@ -291,31 +483,20 @@ class XTream:
     vod_type = "VOD"
     series_type = "Series"
 
-    auth_data = {}
-    authorization = {}
+    # Everything below is created per instance in __init__ so that several
+    # providers can live in the same process without sharing their catalog
+    auth_data: dict
+    authorization: dict
 
-    groups = []
-    channels = []
-    series = []
-    movies = []
-    movies_30days = []
-    movies_7days = []
+    # The groups and streams are in an immutable snapshot, see XTream.catalog
+    _catalog: CatalogSnapshot
 
-    connection_headers = {}
+    connection_headers: dict
 
-    state = {'authenticated': False, 'loaded': False}
+    state: dict
 
     hide_adult_content = False
 
-    live_catch_all_group = Group(
-        {"category_id": "9999", "category_name":"xEverythingElse", "parent_id":0}, live_type
-    )
-    vod_catch_all_group = Group(
-        {"category_id": "9999", "category_name":"xEverythingElse", "parent_id":0}, vod_type
-    )
-    series_catch_all_group = Group(
-        {"category_id": "9999", "category_name":"xEverythingElse", "parent_id":0}, series_type
-    )
     # If the cached JSON file is older than threshold_time_sec then load a new
     # JSON dictionary from the provider
     threshold_time_sec = -1
@@ -331,7 +512,21 @@ class XTream:
         cache_path: str = "",
         reload_time_sec: int = 60*60*8,
         validate_json: bool = False,
-        debug_flask: bool = True
+        validate_json_percent: int = 100,
+        validate_json_parallel: bool = False,
+        parallel_build: bool = False,
+        debug_flask: bool = True,
+        enable_flask: bool = True,
+        metrics_callback: Callable = None,
+        cassette_path: str = None,
+        cassette_mode: str = REPLAY,
+        cache_compression: str = "none",
+        lazy_init: bool = False,
+        cache_first: bool = False,
+        auth_cache_sec: int = 60*60*24,
+        lazy_groups: bool = False,
+        max_loaded_groups: int = 20,
+        raw_on_demand: bool = False
         ):
         """Initialize Xtream Class
 
@@ -346,15 +541,47 @@ class XTream:
             reload_time_sec   (int, optional):  Number of seconds before automatic reloading (-1 to turn it OFF)
             debug_flask       (bool, optional): Enable the debug mode in Flask
             validate_json     (bool, optional): Check Xtream API provided JSON for validity
+            validate_json_percent (int, optional): Percentage of the streams to validate. Defaults to 100.
+            validate_json_parallel (bool, optional): Validate in worker processes while the streams are built
+            parallel_build    (bool, optional): Build the streams using one worker process per CPU, when there
+                                                are at least 2 CPUs and 50000 streams of a type
+            enable_flask      (bool, optional): Start the REST API when Flask is installed. Defaults to True.
+            metrics_callback  (Callable, optional): Called as `callback(name, value, labels)` for every measure
+            cassette_path     (str, optional):  File where to record or from where to replay the provider traffic
+            cassette_mode     (str, optional):  "record", "replay" or "replay_timed". Defaults to "replay".
+            cache_compression (str, optional):  Codec of the cache files, "none", "gzip" or "zstd". Defaults to "none".
+            lazy_init         (bool, optional): Authenticate and start the REST API on first use instead of
+                                                in the constructor. Defaults to False.
+            cache_first       (bool, optional): Save the authentication, and on the next start use it and the cached
+                                                catalog right away while authenticating again in the background.
+                                                When the provider is down, keep using the last cached catalog.
+            auth_cache_sec    (int, optional):  Number of seconds the saved authentication is used. Defaults to 1 day.
+            lazy_groups       (bool, optional): Only load the groups in load_iptv(), the streams of a group are
+                                                loaded by open_group(). Defaults to False.
+            max_loaded_groups (int, optional):  With lazy_groups, number of groups kept in memory, the least
+                                                recently opened are unloaded. 0 for no limit. Defaults to 20.
+            raw_on_demand     (bool, optional): Do not keep the provider JSON of the streams in memory, `raw` and
+                                                `export_json()` read it from the uncompressed all_stream cache
+                                                files. See pyxtream.raw_store. Cannot be used with
+                                                lazy_groups. Defaults to False.
+
+        Raises:
+            ValueError: Both lazy_groups and raw_on_demand are set
 
         Returns: XTream Class Instance
 
         - Note 1: If it fails to authorize with provided username and password,
                 auth_data will be an empty dictionary.
-        - Note 2: The JSON validation option will take considerable amount of time and it should be 
-                  used only as a debug tool. The Xtream API JSON from the provider passes through a schema
-                  that represent the best available understanding of how the Xtream API works.
+        - Note 2: The JSON validation option takes a considerable amount of time on large catalogs.
+                  Validate only a sample of the streams with `validate_json_percent`, or move the
+                  validation to worker processes with `validate_json_parallel` to keep it ON in production.
+                  The Xtream API JSON from the provider passes through a schema that represent the best
+                  available understanding of how the Xtream API works.
         """
+        if lazy_groups and raw_on_demand:
+            # The streams of open_group() come from the group files, not from the all_stream files
+            raise ValueError("raw_on_demand cannot be used with lazy_groups")
+
         self.server = provider_url
         self.username = provider_username
         self.password = provider_password
@@ -362,7 +589,58 @@ class XTream:
         self.cache_path = cache_path
         self.hide_adult_content = hide_adult_content
         self.threshold_time_sec = reload_time_sec
+        self.cache_compression = cache_compression
+        if not codec_available(self.cache_compression):
+            print(f" - Cache compression `{self.cache_compression}` is not available, using 'gzip'")
+            self.cache_compression = "gzip"
         self.validate_json = validate_json
+        self.validate_json_percent = validate_json_percent
+        self.validate_json_parallel = validate_json_parallel
+        self.parallel_build = parallel_build
+        self.cache_first = cache_first
+        self.auth_cache_sec = auth_cache_sec
+        self.lazy_groups = lazy_groups
+        self.max_loaded_groups = max_loaded_groups
+        self.raw_on_demand = raw_on_demand
+        self.enable_flask = enable_flask
+        self.debug_flask = debug_flask
+        self.flaskapp = None
+
+        # Load metrics, see pyxtream.metrics
+        self.metrics = Metrics(self.name)
+        if metrics_callback is not None:
+            self.metrics.add_callback(metrics_callback)
+
+        # Record or replay the provider traffic, see pyxtream.cassette
+        self.cassette = None
+        if cassette_path is not None:
+            self.cassette = Cassette(cassette_path, cassette_mode)
+            self.cassette.set_secrets(self.server, self.username, self.password)
+
+        # Per instance state
+        self.auth_data = {}
+        self.authorization = {}
+        # Published catalog, replaced as a whole by each load
+        self._catalog = self._new_catalog_builder().freeze(0)
+        # offline is True when the provider could not be reached and the cache is used instead
+        self.state = {'authenticated': False, 'loaded': False, 'offline': False}
+        self._auth_thread = None
+        # True while the authentication from the cache is checked again with the provider
+        self._revalidating = False
+        # With lazy_groups, (stream type, group ID) -> group whose streams are loaded,
+        # least recently opened first
+        self._loaded_groups = OrderedDict()
+        # Only one thread at a time builds a new catalog
+        self._catalog_lock = threading.RLock()
+        self._process_pool = None
+        self._health = None
+        self._vod_info = None
+        # Changes of the catalog at each reload, see pyxtream.changes
+        self.changes = ChangeFeed()
+        # Set while reloading to download everything again
+        self._skip_cache = False
+        # Builds the stream URLs, set once authenticated
+        self.url_template = None
 
         # get the pyxtream local path
         self.app_fullpath = osp.dirname(osp.realpath(__file__))
@@ -389,58 +667,207 @@ class XTream:
         else:
             self.connection_headers = {'User-Agent':"Wget/1.20.3 (linux-gnu)"}
 
-        self.authenticate()
+        # Construct the base url for all requests
+        self.base_url = f"{self.server}/player_api.php?username={self.username}&password={self.password}"
 
         if self.threshold_time_sec > 0:
             print(f"Reload timer is ON and set to {self.threshold_time_sec} seconds")
         else:
             print("Reload timer is OFF")
 
-        if self.state['authenticated']:
-            if USE_FLASK:
-                self.flaskapp = FlaskWrap('pyxtream', self, self.html_template_folder, debug=debug_flask)
-                self.flaskapp.start()
+        # With lazy_init, wait until the provider is needed
+        self._delayed_start = lazy_init
+        if not lazy_init:
+            self._start_authentication()
+            self.start_flask()
+
+    def _lazy_start(self):
+        """Authenticate and start the REST API if the constructor delayed them"""
+        if self._delayed_start:
+            self._delayed_start = False
+            self._start_authentication()
+            self.start_flask()
+
+    def start_flask(self) -> bool:
+        """Start the REST API, once authenticated, if enabled and Flask is installed
+
+        Returns:
+            bool: True if the REST API is running
+        """
+        if self.flaskapp is None and self.state['authenticated'] and USE_FLASK and self.enable_flask:
+            from pyxtream.rest_api import FlaskWrap
+            self.flaskapp = FlaskWrap('pyxtream', self, self.html_template_folder, debug=self.debug_flask)
+            self.flaskapp.start()
+        return self.flaskapp is not None
+
+    @property
+    def catalog(self) -> CatalogSnapshot:
+        """Current catalog, see pyxtream.catalog
+
+        Take it once and read everything from it to get a consistent view,
+        it is never modified, a reload publishes a new one.
+
+        Returns:
+            CatalogSnapshot: The catalog
+        """
+        return self._catalog
+
+    @property
+    def groups(self) -> Tuple[Group, ...]:
+        """Groups of the current catalog"""
+        return self._catalog.groups
+
+    @property
+    def channels(self) -> Tuple[Channel, ...]:
+        """Live streams of the current catalog"""
+        return self._catalog.channels
+
+    @property
+    def movies(self) -> Tuple[Channel, ...]:
+        """VOD streams of the current catalog"""
+        return self._catalog.movies
+
+    @property
+    def series(self) -> Tuple[Serie, ...]:
+        """Series of the current catalog"""
+        return self._catalog.series
+
+    @property
+    def movies_added_index(self) -> AddedIndex:
+        """Movies of the current catalog sorted by added time"""
+        return self._catalog.movies_added_index
+
+    @property
+    def series_added_index(self) -> AddedIndex:
+        """Series of the current catalog sorted by last modification time"""
+        return self._catalog.series_added_index
+
+    @property
+    def live_catch_all_group(self) -> Group:
+        return self._catalog.catch_all_groups[self.live_type]
+
+    @property
+    def vod_catch_all_group(self) -> Group:
+        return self._catalog.catch_all_groups[self.vod_type]
+
+    @property
+    def series_catch_all_group(self) -> Group:
+        return self._catalog.catch_all_groups[self.series_type]
+
+    @property
+    def movies_30days(self) -> List[Channel]:
+        """Movies added in the last 30 days, oldest first"""
+        return self.movies_added_index.in_last_days(31)
+
+    @property
+    def movies_7days(self) -> List[Channel]:
+        """Movies added in the last 7 days, oldest first"""
+        return self.movies_added_index.in_last_days(7)
+
+    @property
+    def columns(self):
+        """Columnar view of the loaded catalog for vectorized filtering
+
+        It is built on first use, and requires NumPy. See pyxtream.columnar
+
+        Returns:
+            CatalogColumns: The columns of the catalog
+        """
+        return self._catalog.columns
+
+    @property
+    def facets(self):
+        """Bitset index of the loaded catalog for faceted filtering
+
+        It is built on first use for each catalog. See pyxtream.facets
+
+        Returns:
+            FacetIndex: The index of the catalog
+        """
+        return self._catalog.facets
+
+    @property
+    def vod_info(self):
+        """Details of the movies fetched in bulk and cached, see pyxtream.vod_info
+
+        Returns:
+            VodInfoEnricher: The movie details of this provider
+        """
+        if self._vod_info is None:
+            from pyxtream.vod_info import VodInfoEnricher
+            self._vod_info = VodInfoEnricher(self)
+            self._vod_info.attach(self.movies)
+        return self._vod_info
+
+    @property
+    def health(self):
+        """Health checker telling which streams play, see pyxtream.health
 
-    def search_stream(self, keyword: str, ignore_case: bool = True, return_type: str = "LIST") -> List:
+        Returns:
+            HealthChecker: The health checker of this provider
+        """
+        if self._health is None:
+            from pyxtream.health import HealthChecker
+            self._health = HealthChecker(self)
+        return self._health
+
+    def search_stream(
+        self,
+        keyword: str,
+        ignore_case: bool = True,
+        return_type: str = "LIST",
+        hide_dead: bool = False
+        ) -> List:
         """Search for streams
 
         Args:
             keyword (str): Keyword to search for. Supports REGEX
             ignore_case (bool, optional): True to ignore case during search. Defaults to "True".
-            return_type (str, optional): Output format, 'LIST' or 'JSON'. Defaults to "LIST".
+            return_type (str, optional): Output format, 'LIST', 'JSON' or 'JSON_BYTES'. Defaults to "LIST".
+            hide_dead (bool, optional): Skip the streams found dead by the health checker. Defaults to False.
 
         Returns:
             List: List with all the results, it could be empty. Each result
+                  is a dictionary, or with 'JSON' a string and with 'JSON_BYTES'
+                  UTF-8 bytes of the JSON array.
         """
 
         search_result = []
+        # Search one version of the catalog even if it is reloaded meanwhile
+        catalog = self._catalog
 
         if ignore_case:
             regex = re.compile(keyword, re.IGNORECASE)
         else:
             regex = re.compile(keyword)
 
-        print(f"Checking {len(self.movies)} movies")
-        for stream in self.movies:
+        print(f"Checking {len(catalog.movies)} movies")
+        for stream in catalog.movies:
             if re.match(regex, stream.name) is not None:
-                search_result.append(stream.export_json())
+                search_result.append(stream)
 
-        print(f"Checking {len(self.channels)} channels")
-        for stream in self.channels:
+        print(f"Checking {len(catalog.channels)} channels")
+        for stream in catalog.channels:
             if re.match(regex, stream.name) is not None:
-                search_result.append(stream.export_json())
+                search_result.append(stream)
 
-        print(f"Checking {len(self.series)} series")
-        for stream in self.series:
+        print(f"Checking {len(catalog.series)} series")
+        for stream in catalog.series:
             if re.match(regex, stream.name) is not None:
-                search_result.append(stream.export_json())
+                search_result.append(stream)
+
+        if hide_dead:
+            search_result = self.health.filter(search_result)
 
-        if return_type == "JSON":
-            if search_result is not None:
-                print(f"Found {len(search_result)} results `{keyword}`")
-                return json.dumps(search_result, ensure_ascii=False)
+        if return_type in ("JSON", "JSON_BYTES"):
+            print(f"Found {len(search_result)} results `{keyword}`")
+            # The JSON of each stream is encoded once and reused by the next searches
+            json_data = jsoncodec.join_array(stream.export_json_bytes() for stream in search_result)
+            if return_type == "JSON_BYTES":
+                return json_data
+            return json_data.decode("utf-8")
 
-        return search_result
+        return [stream.export_json() for stream in search_result]
 
     def download_video(self, stream_id: int) -> str:
         """Download Video from Stream ID
@@ -451,6 +878,7 @@ class XTream:
         Returns:
             str: Absolute Path Filename where the file was saved. Empty if could not download
         """
+        self._lazy_start()
         url = ""
         filename = ""
         for stream in self.movies:
@@ -467,6 +895,33 @@ class XTream:
 
         return filename
 
+    def record_live(self, channel: Channel, duration_sec: float = None, filename: str = None):
+        """Record a live channel in the background, see pyxtream.recorder
+
+        Args:
+            channel (Channel): Live channel from XTream.channels
+            duration_sec (float, optional): Length of the recording. Defaults to until Recorder.stop() is called.
+            filename (str, optional): Full path of the recording. Defaults to the channel name and
+                                      the current time in the cache folder.
+
+        Returns:
+            Recorder: The running recorder, None if the channel is not a live channel
+        """
+        # Imported here, only needed when recording
+        from pyxtream.recorder import Recorder
+
+        self._lazy_start()
+        if channel.stream_type != "live" or self.url_template is None:
+            print(f"Cannot record `{channel.name}`, it is not a live channel of an authenticated provider")
+            return None
+        if filename is None:
+            filename = osp.join(
+                self.cache_path, f"{self._slugify(channel.name)}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.ts"
+            )
+        recorder = Recorder(self, channel, filename, duration_sec)
+        recorder.start()
+        return recorder
+
     def _download_video_impl(self, url: str, fullpath_filename: str) -> bool:
         """Download a stream
 
@@ -479,11 +934,13 @@ class XTream:
         """
         ret_code = False
         mb_size = 1024*1024
+        start = timer()
+        downloaded_bytes = 0
         try:
             print(f"Downloading from URL `{url}` and saving at `{fullpath_filename}`")
             
             # Make the request to download
-            response = requests.get(url, timeout=(5), stream=True, allow_redirects=True, headers=self.connection_headers)
+            response = self._http_get(url, timeout=(5), stream=True, allow_redirects=True, headers=self.connection_headers)
             # If there is an answer from the remote server
             if response.status_code == 200:
                 # Get content type Binary or Text
@@ -505,10 +962,10 @@ class XTream:
 
                         # Grab data by block_bytes
                         for data in response.iter_content(block_bytes,decode_unicode=False):
-                            downloaded_bytes += block_bytes
+                            downloaded_bytes += len(data)
                             progress(downloaded_bytes,total_content_size,"Downloading")
                             file.write(data)
-                    if downloaded_bytes < total_content_size:
+                    if downloaded_bytes == 0 or downloaded_bytes < total_content_size:
                         print("The file size is incorrect, deleting")
                         remove(fullpath_filename)
                     else:
@@ -523,6 +980,11 @@ class XTream:
         except Exception as e:
             print(e)
 
+        self.metrics.observe("pyxtream_download_seconds", timer() - start)
+        self.metrics.inc("pyxtream_download_bytes_total", downloaded_bytes)
+        if not ret_code:
+            self.metrics.inc("pyxtream_download_errors_total")
+
         return ret_code
 
     def _slugify(self, string: str) -> str:
@@ -578,82 +1040,234 @@ class XTream:
         if self.state["authenticated"] is False:
             # Erase any previous data
             self.auth_data = {}
-            # Loop through 30 seconds
-            i = 0
-            r = None
-            # Prepare the authentication url
-            url = f"{self.server}/player_api.php?username={self.username}&password={self.password}"
-            print(f"Attempting connection: ", end='')
-            while i < 30:
-                try:
-                    # Request authentication, wait 4 seconds maximum
-                    r = requests.get(url, timeout=(4), headers=self.connection_headers)
-                    i = 31
-                except requests.exceptions.ConnectionError:
-                    time.sleep(1)
-                    print(f"{i} ", end='',flush=True)
-                    i += 1
-
-            if r is not None:
-                # If the answer is ok, process data and change state
-                if r.ok:
-                    self.auth_data = r.json()
-                    self.authorization = {
-                        "username": self.auth_data["user_info"]["username"],
-                        "password": self.auth_data["user_info"]["password"]
-                    }
-                    # Mark connection authorized
-                    self.state["authenticated"] = True
-                    # Construct the base url for all requests
-                    self.base_url = f"{self.server}/player_api.php?username={self.username}&password={self.password}"
-                    # If there is a secure server connection, construct the base url SSL for all requests
-                    if "https_port" in self.auth_data["server_info"]:
-                        self.base_url_ssl = f"https://{self.auth_data['server_info']['url']}:{self.auth_data['server_info']['https_port']}" \
-                                            f"/player_api.php?username={self.username}&password={self.password}"
-                else:
-                    print(f"Provider `{self.name}` could not be loaded. Reason: `{r.status_code} {r.reason}`")
+            self._request_authentication()
+
+    def _request_authentication(self, attempts: int = 30) -> bool:
+        """Send the authentication request to the provider
+
+        A provider answering 401 or 403 rejected the credentials, and the
+        state is set back to not authenticated.
+
+        Args:
+            attempts (int, optional): Number of connection attempts, one second apart. Defaults to 30.
+
+        Returns:
+            bool: True if the provider accepted the credentials
+        """
+        import requests
+
+        i = 0
+        r = None
+        # Prepare the authentication url
+        url = f"{self.server}/player_api.php?username={self.username}&password={self.password}"
+        print(f"Attempting connection: ", end='')
+        auth_start = timer()
+        while i < attempts:
+            if i > 0:
+                time.sleep(1)
+            self.metrics.inc("pyxtream_authenticate_attempts_total")
+            try:
+                # Request authentication, wait 4 seconds maximum
+                start = timer()
+                r = self._http_get(url, timeout=(4), headers=self.connection_headers)
+                self.metrics.observe("pyxtream_http_request_seconds", timer() - start, action="authenticate")
+                self.metrics.inc("pyxtream_http_bytes_total", len(r.content), action="authenticate")
+                i = 31
+            except requests.exceptions.ConnectionError:
+                self.metrics.inc("pyxtream_http_errors_total", action="authenticate", error="ConnectionError")
+                print(f"{i} ", end='',flush=True)
+                i += 1
+        self.metrics.observe("pyxtream_authenticate_seconds", timer() - auth_start)
+
+        if r is not None:
+            # If the answer is ok, process data and change state
+            if r.ok:
+                with self.metrics.time("pyxtream_json_decode_seconds", source="http", action="authenticate"):
+                    auth_data = jsoncodec.loads(r.content)
+                self._set_auth_data(auth_data)
+                self.state["offline"] = False
+                if self.cache_first:
+                    self._save_to_file(
+                        {"expires": time.time() + self.auth_cache_sec, "auth_data": auth_data}, "auth.json"
+                        )
+                return True
+            print(f"Provider `{self.name}` could not be loaded. Reason: `{r.status_code} {r.reason}`")
+            if r.status_code in (401, 403):
+                self.state["authenticated"] = False
+        else:
+            print(f"\n{self.name}: Provider refused the connection")
+        return False
+
+    def _set_auth_data(self, auth_data: dict):
+        """Use the authentication data received from the provider, or from the cache
+
+        Args:
+            auth_data (dict): Provider answer to the authentication request
+        """
+        self.auth_data = auth_data
+        self.authorization = {
+            "username": auth_data["user_info"]["username"],
+            "password": auth_data["user_info"]["password"]
+        }
+        url_template = StreamUrlTemplate(
+            self.server, self.authorization["username"], self.authorization["password"]
+        )
+        # Check the common part of the URLs once instead of for every stream
+        url_template.valid = self._validate_url(url_template.build("live", 0, "ts"))
+        previous_template = self.url_template
+        self.url_template = url_template
+        catalog = self._catalog
+        if not isinstance(catalog, CatalogSnapshot):
+            # The views of a shared catalog build their URLs with the template of the catalog
+            catalog.url_template = url_template
+        elif previous_template is not None and url_template.credentials != previous_template.credentials:
+            # The streams built with the old credentials must use the new ones
+            for stream in catalog.channels + catalog.movies:
+                stream._url_template = url_template
+                stream.invalidate_json()
+        # If there is a secure server connection, construct the base url SSL for all requests
+        if "https_port" in auth_data["server_info"]:
+            self.base_url_ssl = f"https://{auth_data['server_info']['url']}:{auth_data['server_info']['https_port']}" \
+                                f"/player_api.php?username={self.username}&password={self.password}"
+        # Mark connection authorized
+        self.state["authenticated"] = True
+
+    def _load_auth_from_cache(self, ignore_expiry: bool = False) -> bool:
+        """Authenticate with the data saved by a previous successful authentication
+
+        Args:
+            ignore_expiry (bool, optional): Use the saved data even if it expired. Defaults to False.
+
+        Returns:
+            bool: True if authenticated from the cache
+        """
+        cached_auth = self._load_from_file("auth.json", ignore_age=True)
+        if cached_auth is None:
+            return False
+
+        try:
+            if not ignore_expiry:
+                if cached_auth["expires"] < time.time():
+                    return False
+                # The account expiry date, when the provider gives one
+                exp_date = cached_auth["auth_data"]["user_info"].get("exp_date")
+                if exp_date and int(exp_date) < time.time():
+                    return False
+            self._set_auth_data(cached_auth["auth_data"])
+        except (KeyError, TypeError, ValueError) as e:
+            print(f" - Invalid cached authentication, e=`{e}`")
+            return False
+        return True
+
+    def _revalidate_authentication(self):
+        """Authenticate again with the provider after authenticating from the cache"""
+        try:
+            if self._request_authentication():
+                return
+            if self.state["authenticated"]:
+                # No answer from the provider
+                self._go_offline()
             else:
-                print(f"\n{self.name}: Provider refused the connection")
+                print(f"{self.name}: Provider rejected the saved authentication")
+                cached_auth = self._get_cache_file("auth.json", ignore_age=True)
+                if cached_auth is not None:
+                    remove(cached_auth)
+        finally:
+            self._revalidating = False
+
+    def _go_offline(self):
+        """Use the cached catalog, even if too old, until the next successful authentication"""
+        if not self.state["offline"]:
+            print(f"{self.name}: Provider unavailable, using the last authentication and the cached catalog")
+            self.state["offline"] = True
+
+    def _start_authentication(self):
+        """Authenticate, from the cache first when cache_first is set
+
+        With cache_first, the saved authentication is used right away and
+        checked again with the provider in a background thread. If the
+        provider cannot be reached, the saved authentication is used even
+        if it expired, and the catalog is loaded from the cache.
+        """
+        if not self.cache_first:
+            self.authenticate()
+            return
+
+        if self._load_auth_from_cache():
+            print(f"{self.name}: Authenticated from cache, checking again with the provider in the background")
+            self._revalidating = True
+            self._auth_thread = threading.Thread(target=self._revalidate_authentication, daemon=True)
+            self._auth_thread.start()
+            return
+
+        self.authenticate()
+        if not self.state["authenticated"] and self._load_auth_from_cache(ignore_expiry=True):
+            self._go_offline()
 
-    def _load_from_file(self, filename) -> dict:
+    def _load_from_file(self, filename, ignore_age: bool = False) -> dict:
         """Try to load the dictionary from file
 
         Args:
             filename ([type]): File name containing the data
+            ignore_age (bool, optional): Load the file even if it is older than the reload time. Defaults to False.
 
         Returns:
             dict: Dictionary if found and no errors, None if file does not exists
         """
+        full_filename = self._get_cache_file(filename, ignore_age)
+        if full_filename is None:
+            return None
+
+        my_data = None
+        # Load the JSON data
+        try:
+            file_data = read_cache_file(full_filename)
+            start = timer()
+            my_data = jsoncodec.loads(file_data)
+            self.metrics.observe("pyxtream_json_decode_seconds", timer() - start, source="cache", action=self._get_file_action(filename))
+            if len(my_data) == 0:
+                my_data = None
+        except CacheError as e:
+            print(f" - Corrupted cache file `{full_filename}`, it will be downloaded again: e=`{e}`")
+        except Exception as e:
+            print(f" - Could not load from file `{full_filename}`: e=`{e}`")
+        return my_data
+
+    def _get_cache_file(self, filename: str, ignore_age: bool = False) -> str:
+        """Get the full path of a cached file if it can be used
+
+        Args:
+            filename (str): File name containing the data
+            ignore_age (bool, optional): Accept the file even if it is older than the reload time. Defaults to False.
+
+        Returns:
+            str: Full path of the file, None if it does not exist or is too old
+        """
+        # Reloading, the files are downloaded again unless the provider is down
+        if self._skip_cache and not ignore_age:
+            return None
+
         # Build the full path
         full_filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-{filename}")
 
         # If the cached file exists, attempt to load it
-        if osp.isfile(full_filename):
-
-            my_data = None
-
-            # Get the enlapsed seconds since last file update
-            file_age_sec = time.time() - osp.getmtime(full_filename)
-            # If the file was updated less than the threshold time,
-            # it means that the file is still fresh, we can load it.
-            # Otherwise skip and return None to force a re-download
-            if self.threshold_time_sec > file_age_sec:
-                # Load the JSON data
-                try:
-                    with open(full_filename, mode="r", encoding="utf-8") as myfile:
-                        my_data = json.load(myfile)
-                        if len(my_data) == 0:
-                            my_data = None
-                except Exception as e:
-                    print(f" - Could not load from file `{full_filename}`: e=`{e}`")
-            return my_data
-
+        if not osp.isfile(full_filename):
+            return None
+
+        # Get the enlapsed seconds since last file update
+        file_age_sec = time.time() - osp.getmtime(full_filename)
+        # If the file was updated less than the threshold time,
+        # it means that the file is still fresh, we can load it.
+        # Otherwise skip and return None to force a re-download
+        if ignore_age or self.threshold_time_sec > file_age_sec:
+            return full_filename
         return None
 
     def _save_to_file(self, data_list: dict, filename: str) -> bool:
         """Save a dictionary to file
 
-        This function will overwrite the file if already exists
+        This function will overwrite the file if already exists. The file is
+        written to a temporary file first and then renamed, optionally compressed.
 
         Args:
             data_list (dict): Dictionary to save
@@ -667,10 +1281,9 @@ class XTream:
             #Build the full path
             full_filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-{filename}")
             # If the path makes sense, save the file
-            json_data = json.dumps(data_list, ensure_ascii=False)
+            json_data = jsoncodec.dumps(data_list)
             try:
-                with open(full_filename, mode="wt", encoding="utf-8") as myfile:
-                    myfile.write(json_data)
+                write_cache_file(full_filename, json_data, self.cache_compression)
             except Exception as e:
                 print(f" - Could not save to file `{full_filename}`: e=`{e}`")
                 return False
@@ -679,6 +1292,63 @@ class XTream:
         else:
             return False
 
+    def _save_stream_lines(self, streams: list, filename: str) -> bool:
+        """Save the streams uncompressed with one stream per line, so they can be read by offset
+
+        Args:
+            streams (list): Streams as received from the provider
+            filename (str): Name of the file
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        full_filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-{filename}")
+        # Saved like the streams are built, with the catch-all group for the streams without group
+        for stream_channel in streams:
+            if stream_channel.get("category_id", "") is None:
+                stream_channel["category_id"] = "9999"
+        try:
+            write_stream_lines(full_filename, streams)
+        except Exception as e:
+            print(f" - Could not save to file `{full_filename}`: e=`{e}`")
+            return False
+        return True
+
+    def _set_raw_sources(self, catalog: CatalogBuilder, stream_type: str, all_streams: list):
+        """Let the built streams read their raw JSON data from the cache file instead of keeping it
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            stream_type (str): Stream type can be Live, VOD, Series
+            all_streams (list): Streams as received from the provider, in the order of the cache file
+        """
+        filename = f"all_stream_{stream_type}.json"
+        full_filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-{filename}")
+        try:
+            raw_store = RawStore(full_filename)
+        except (OSError, ValueError, CacheError):
+            raw_store = None
+
+        if raw_store is None or len(raw_store) != len(all_streams):
+            # Compressed or written by an older version, write it again keeping its age
+            file_time = osp.getmtime(full_filename) if osp.isfile(full_filename) else None
+            if not self._save_stream_lines(all_streams, filename):
+                return
+            if file_time is not None:
+                utime(full_filename, (file_time, file_time))
+            try:
+                raw_store = RawStore(full_filename)
+            except (OSError, ValueError, CacheError) as e:
+                print(f" - Could not read the streams from `{full_filename}`, they are kept in memory: e=`{e}`")
+                return
+
+        streams_by_id = catalog.streams_by_id[stream_type]
+        for stream_channel, offset in zip(all_streams, raw_store.offsets):
+            stream = streams_by_id.get(self._get_stream_key(stream_type, stream_channel))
+            # Only the stream built from this entry, not the duplicates or the skipped ones
+            if stream is not None and stream._raw is stream_channel:
+                stream.set_raw_source(raw_store, offset)
+
     def load_iptv(self) -> bool:
         """Load XTream IPTV
 
@@ -693,6 +1363,8 @@ class XTream:
         Returns:
             bool: True if successfull, False if error
         """
+        self._lazy_start()
+
         # If pyxtream has not authenticated the connection, return empty
         if self.state["authenticated"] is False:
             print("Warning, cannot load steams since authorization failed")
@@ -703,20 +1375,27 @@ class XTream:
             print("Warning, data has already been loaded.")
             return True
 
+        with self._catalog_lock:
+            return self._load_catalog()
+
+    def _load_catalog(self) -> bool:
+        """Build a new catalog and publish it once complete
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        catalog = self._new_catalog_builder()
+        loaded = False
+
         for loading_stream_type in (self.live_type, self.vod_type, self.series_type):
             ## Get GROUPS
 
-            # Try loading local file
+            # Load the groups, from the cache or the provider
             dt = 0
             start = timer()
-            all_cat = self._load_from_file(f"all_groups_{loading_stream_type}.json")
-            # If file empty or does not exists, download it from remote
-            if all_cat is None:
-                # Load all Groups and save file locally
-                all_cat = self._load_categories_from_provider(loading_stream_type)
-                if all_cat is not None:
-                    self._save_to_file(all_cat,f"all_groups_{loading_stream_type}.json")
+            all_cat = self._load_categories(loading_stream_type)
             dt = timer() - start
+            self.metrics.observe("pyxtream_load_seconds", dt, stream_type=loading_stream_type, phase="groups")
 
             # If we got the GROUPS data, show the statistics and load GROUPS
             if all_cat is not None:
@@ -724,41 +1403,58 @@ class XTream:
                 ## Add GROUPS to dictionaries
 
                 # Add the catch-all-errors group
-                if loading_stream_type == self.live_type:
-                    self.groups.append(self.live_catch_all_group)
-                elif loading_stream_type == self.vod_type:
-                    self.groups.append(self.vod_catch_all_group)
-                elif loading_stream_type == self.series_type:
-                    self.groups.append(self.series_catch_all_group)
+                catch_all_group = catalog.catch_all_groups[loading_stream_type]
+                catalog.groups.append(catch_all_group)
+                type_groups = [catch_all_group]
 
                 for cat_obj in all_cat:
-                    if schemaValidator(cat_obj, SchemaType.GROUP):
+                    if not self.validate_json or schemaValidator(cat_obj, SchemaType.GROUP):
                         # Create Group (Category)
                         new_group = Group(cat_obj, loading_stream_type)
                         #  Add to xtream class
-                        self.groups.append(new_group)
+                        catalog.groups.append(new_group)
+                        type_groups.append(new_group)
                     else:
                         # Save what did not pass schema validation
                         print(cat_obj)
 
                 # Sort Categories
-                self.groups.sort(key=lambda x: x.name)
+                catalog.groups.sort(key=lambda x: x.name)
+
+                # Index the groups of this stream type by ID, keeping the first
+                # occurence by name when the provider repeats an ID
+                groups_by_id = {}
+                for group in sorted(type_groups, key=lambda x: x.name):
+                    groups_by_id.setdefault(group.group_id, group)
             else:
                 print(f" - Could not load {loading_stream_type} Groups")
                 break
 
+            if self.lazy_groups:
+                # The streams are loaded when their group is opened
+                loaded = True
+                continue
+
             ## Get Streams
 
             # Try loading local file
             dt = 0
             start = timer()
-            all_streams = self._load_from_file(f"all_stream_{loading_stream_type}.json")
+            all_streams = self._load_from_file(f"all_stream_{loading_stream_type}.json", ignore_age=self.state["offline"])
             # If file empty or does not exists, download it from remote
-            if all_streams is None:
+            if all_streams is None and not self.state["offline"]:
                 # Load all Streams and save file locally
                 all_streams = self._load_streams_from_provider(loading_stream_type)
-                self._save_to_file(all_streams,f"all_stream_{loading_stream_type}.json")
+                if all_streams is not None:
+                    if self.raw_on_demand:
+                        self._save_stream_lines(all_streams, f"all_stream_{loading_stream_type}.json")
+                    else:
+                        self._save_to_file(all_streams,f"all_stream_{loading_stream_type}.json")
+                elif self.cache_first:
+                    # Keep the last good catalog when the provider fails
+                    all_streams = self._load_from_file(f"all_stream_{loading_stream_type}.json", ignore_age=True)
             dt = timer() - start
+            self.metrics.observe("pyxtream_load_seconds", dt, stream_type=loading_stream_type, phase="streams")
 
             # If we got the STREAMS data, show the statistics and load Streams
             if all_streams is not None:
@@ -768,134 +1464,736 @@ class XTream:
                     )
                 ## Add Streams to dictionaries
 
-                skipped_adult_content = 0
-                skipped_no_name_content = 0
+                # Reason -> number of skipped streams
+                skipped = {"no_name": 0, "adult": 0, "unknown_type": 0}
 
                 number_of_streams = len(all_streams)
+                number_of_built_streams = len(self._get_streams(loading_stream_type, catalog))
                 current_stream_number = 0
                 # Calculate 1% of total number of streams
                 # This is used to slow down the progress bar
                 one_percent_number_of_streams = number_of_streams/100
+                next_progress_stream_number = 0
+
+                catch_all_group = catalog.catch_all_groups[loading_stream_type]
+                catch_all_before = len(catch_all_group.channels) + len(catch_all_group.series)
+
+                build_in_parallel = self._should_build_in_parallel(number_of_streams)
+
+                # Validate JSON scheme in worker processes while the streams are built
+                validation_jobs = []
+                if self.validate_json and (self.validate_json_parallel or build_in_parallel):
+                    validation_jobs = self._submit_validation(all_streams, loading_stream_type)
+
                 start = timer()
+                # Share the strings repeated in every stream
                 for stream_channel in all_streams:
-                    skip_stream = False
-                    current_stream_number += 1
-
-                    # Show download progress every 1% of total number of streams
-                    if current_stream_number < one_percent_number_of_streams:
-                        progress(
-                            current_stream_number,
-                            number_of_streams,
-                            f"Processing {loading_stream_type} Streams"
-                            )
-                        one_percent_number_of_streams *= 2
-
-                    # Validate JSON scheme
-                    if self.validate_json:
-                        if loading_stream_type == self.series_type:
-                            if not schemaValidator(stream_channel, SchemaType.SERIES_INFO):
-                                print(stream_channel)
-                        elif loading_stream_type == self.live_type:
-                            if not schemaValidator(stream_channel, SchemaType.LIVE):
-                                print(stream_channel)
-                        else:
-                            # vod_type
-                            if not schemaValidator(stream_channel, SchemaType.VOD):
-                                print(stream_channel)
-
-                    # Skip if the name of the stream is empty
-                    if stream_channel["name"] == "":
-                        skip_stream = True
-                        skipped_no_name_content = skipped_no_name_content + 1
-                        self._save_to_file_skipped_streams(stream_channel)
-
-                    # Skip if the user chose to hide adult streams
-                    if self.hide_adult_content and loading_stream_type == self.live_type:
-                        if "is_adult" in stream_channel:
-                            if stream_channel["is_adult"] == "1":
-                                skip_stream = True
-                                skipped_adult_content = skipped_adult_content + 1
-                                self._save_to_file_skipped_streams(stream_channel)
-
-                    if not skip_stream:
+                    intern_fields(stream_channel)
+
+                if build_in_parallel:
+                    skipped = self._build_streams_parallel(
+                        catalog, loading_stream_type, all_streams, groups_by_id
+                        )
+                else:
+                    for stream_channel in all_streams:
+                        current_stream_number += 1
+
+                        # Show download progress every 1% of total number of streams
+                        if current_stream_number >= next_progress_stream_number:
+                            progress(
+                                current_stream_number,
+                                number_of_streams,
+                                f"Processing {loading_stream_type} Streams"
+                                )
+                            next_progress_stream_number += one_percent_number_of_streams
+
+                        # Validate JSON scheme
+                        if self.validate_json and not self.validate_json_parallel:
+                            if is_sampled(current_stream_number - 1, self.validate_json_percent):
+                                if not schemaValidator(stream_channel, self._get_schema_type(loading_stream_type)):
+                                    print(stream_channel)
+
+                        # Skip if the name is empty, the type unknown or if the user chose to hide adult streams
+                        skip_reason = self._get_skip_reason(loading_stream_type, stream_channel)
+                        if skip_reason is not None:
+                            skipped[skip_reason] += 1
+                            self._save_to_file_skipped_streams(stream_channel)
+                            continue
+
                         # Some channels have no group,
                         # so let's add them to the catch all group
                         if stream_channel["category_id"] is None:
                             stream_channel["category_id"] = "9999"
-                        elif stream_channel["category_id"] != "1":
-                            pass
-
-                        # Find the first occurence of the group that the
-                        # Channel or Stream is pointing to
-                        the_group = next(
-                            (x for x in self.groups if x.group_id == int(stream_channel["category_id"])),
-                            None
-                        )
 
-                        # Set group title
-                        if the_group is not None:
-                            group_title = the_group.name
-                        else:
-                            if loading_stream_type == self.live_type:
-                                group_title = self.live_catch_all_group.name
-                                the_group = self.live_catch_all_group
-                            elif loading_stream_type == self.vod_type:
-                                group_title = self.vod_catch_all_group.name
-                                the_group = self.vod_catch_all_group
-                            elif loading_stream_type == self.series_type:
-                                group_title = self.series_catch_all_group.name
-                                the_group = self.series_catch_all_group
-
-
-                        if loading_stream_type == self.series_type:
-                            # Load all Series
-                            new_series = Serie(self, stream_channel)
-                            # To get all the Episodes for every Season of each
-                            # Series is very time consuming, we will only
-                            # populate the Series once the user click on the
-                            # Series, the Seasons and Episodes will be loaded
-                            # using x.getSeriesInfoByID() function
-
-                        else:
-                            new_channel = Channel(
-                                self,
-                                group_title,
-                                stream_channel
-                            )
-
-                        if new_channel.group_id == "9999":
-                            print(f" - xEverythingElse Channel -> {new_channel.name} - {new_channel.stream_type}")
-
-                        # Save the new channel to the local list of channels
-                        if loading_stream_type == self.live_type:
-                            self.channels.append(new_channel)
-                        elif loading_stream_type == self.vod_type:
-                            self.movies.append(new_channel)
-                            if new_channel.age_days_from_added < 31:
-                                self.movies_30days.append(new_channel)
-                            if new_channel.age_days_from_added < 7:
-                                self.movies_7days.append(new_channel)
-                        else:
-                            self.series.append(new_series)
-
-                        # Add stream to the specific Group
-                        if the_group is not None:
-                            if loading_stream_type != self.series_type:
-                                the_group.channels.append(new_channel)
-                            else:
-                                the_group.series.append(new_series)
-                        else:
-                            print(f" - Group not found `{stream_channel['name']}`")
+                        # Find the group that the Channel or Stream is pointing to
+                        the_group = groups_by_id.get(int(stream_channel["category_id"]), catch_all_group)
+
+                        self._build_stream(catalog, loading_stream_type, stream_channel, the_group)
+                dt = timer() - start
                 print("\n")
+                print(f"{self.name}: Built {number_of_streams} {loading_stream_type} Streams in {dt:.3f} seconds")
+                self.metrics.observe("pyxtream_build_seconds", dt, stream_type=loading_stream_type)
+                number_of_built_streams = len(self._get_streams(loading_stream_type, catalog)) - number_of_built_streams
+                duplicate_streams = number_of_streams - sum(skipped.values()) - number_of_built_streams
+                self.metrics.inc("pyxtream_streams_total", number_of_built_streams, stream_type=loading_stream_type)
+                self.metrics.inc("pyxtream_streams_duplicate_total", duplicate_streams, stream_type=loading_stream_type)
+                for skip_reason, skipped_streams in skipped.items():
+                    self.metrics.inc(
+                        "pyxtream_streams_skipped_total", skipped_streams,
+                        stream_type=loading_stream_type, reason=skip_reason
+                        )
+                self.metrics.inc(
+                    "pyxtream_streams_catch_all_total",
+                    len(catch_all_group.channels) + len(catch_all_group.series) - catch_all_before,
+                    stream_type=loading_stream_type
+                    )
+                self._report_validation(validation_jobs, all_streams)
+                if self.raw_on_demand:
+                    self._set_raw_sources(catalog, loading_stream_type, all_streams)
                 # Print information of which streams have been skipped
                 if self.hide_adult_content:
-                    print(f" - Skipped {skipped_adult_content} adult {loading_stream_type} streams")
-                if skipped_no_name_content > 0:
-                    print(f" - Skipped {skipped_no_name_content} unprintable {loading_stream_type} streams")
+                    print(f" - Skipped {skipped['adult']} adult {loading_stream_type} streams")
+                if skipped["no_name"] > 0:
+                    print(f" - Skipped {skipped['no_name']} unprintable {loading_stream_type} streams")
+                if skipped["unknown_type"] > 0:
+                    print(f" - Skipped {skipped['unknown_type']} {loading_stream_type} streams of unknown stream type")
+                if duplicate_streams > 0:
+                    print(f" - Merged {duplicate_streams} {loading_stream_type} streams listed in several groups")
             else:
                 print(f" - Could not load {loading_stream_type} Streams")
 
+            loaded = True
+
+        if not loaded:
+            # Keep the current catalog
+            return False
+
+        # Readers switch to the new catalog at once
+        self._loaded_groups.clear()
+        self._publish_catalog(catalog)
+        self.state["loaded"] = True
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+        return True
+
+    def reload_iptv(self) -> bool:
+        """Load the catalog again from the provider, ignoring the cache
+
+        The new catalog is compared with the previous one, and the streams
+        added, removed, renamed or moved to another group are published to
+        XTream.changes. With lazy_groups, the opened groups are closed and
+        no changes are published. The previous catalog stays available
+        until the new one is complete.
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        self._lazy_start()
+        if self.state["offline"] and not self._request_authentication(attempts=1):
+            print(f"{self.name}: Provider still unavailable, reloading from the cache")
+        if self.state["authenticated"] is False:
+            print("Warning, cannot reload steams since authorization failed")
+            return False
+
+        with self._catalog_lock:
+            old_catalog = self._catalog
+            self._skip_cache = True
+            try:
+                loaded = self._load_catalog()
+            finally:
+                self._skip_cache = False
+
+        if old_catalog.version > 0 and not self.lazy_groups:
+            events = diff_catalogs(catalog_state(self, old_catalog), catalog_state(self, self._catalog))
+            self.changes.publish(events)
+            print(f"{self.name}: {len(events)} changes in the catalog")
+        return loaded
+
+    def save_shared_catalog(self, filename: str = None) -> str:
+        """Write the catalog to a file that other processes map with open_shared_catalog()
+
+        See pyxtream.shared_catalog
+
+        Args:
+            filename (str, optional): Full path of the file. Defaults to `<name>-catalog.bin` in the cache folder.
+
+        Returns:
+            str: Full path of the file, empty if error
+        """
+        # Imported here since it depends on this module
+        from pyxtream.shared_catalog import write_shared_catalog
+
+        if self.state["authenticated"] is False:
+            print("Warning, cannot save the catalog since authorization failed")
+            return ""
+        if filename is None:
+            filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-catalog.bin")
+        try:
+            write_shared_catalog(filename, self)
+        except Exception as e:
+            print(f" - Could not save the shared catalog `{filename}`: e=`{e}`")
+            return ""
+        return filename
+
+    def open_shared_catalog(self, filename: str = None) -> bool:
+        """Use the catalog written by another process with save_shared_catalog()
+
+        The file is mapped in memory instead of loading the catalog, and
+        published as XTream.catalog. Call it again to use a newer file,
+        the readers of the previous catalog keep it until they are done.
+
+        Args:
+            filename (str, optional): Full path of the file. Defaults to `<name>-catalog.bin` in the cache folder.
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        # Imported here since it depends on this module
+        from pyxtream.shared_catalog import SharedCatalog
+
+        if filename is None:
+            filename = osp.join(self.cache_path, f"{self._slugify(self.name)}-catalog.bin")
+        url_template = self.url_template
+        if url_template is None:
+            # Not authenticated yet, the credentials given to the constructor until then
+            url_template = StreamUrlTemplate(self.server, self.username, self.password)
+        try:
+            catalog = SharedCatalog(filename, url_template)
+        except (OSError, ValueError, CacheError) as e:
+            print(f" - Could not open the shared catalog `{filename}`: e=`{e}`")
+            return False
+
+        with self._catalog_lock:
+            self._loaded_groups.clear()
+            self._catalog = catalog
             self.state["loaded"] = True
+        print(f"{self.name}: Mapped {catalog} from `{filename}`")
+        return True
+
+    def _new_catalog_builder(self) -> CatalogBuilder:
+        """Start an empty catalog, with its catch-all groups"""
+        return CatalogBuilder({
+            stream_type: Group(
+                {"category_id": "9999", "category_name":"xEverythingElse", "parent_id":0}, stream_type
+            )
+            for stream_type in (self.live_type, self.vod_type, self.series_type)
+        })
+
+    def _publish_catalog(self, catalog: CatalogBuilder):
+        """Replace the catalog seen by the readers
+
+        Args:
+            catalog (CatalogBuilder): The new catalog, it must not be modified anymore
+        """
+        self._catalog = catalog.freeze(self._catalog.version + 1)
+        if self._vod_info is not None:
+            # The new movies find their cached details too
+            self._vod_info.attach(self._catalog.movies)
+
+    def _load_categories(self, stream_type: str) -> list:
+        """Load the groups of a stream type from the cache, or from the provider
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+
+        Returns:
+            list: Groups as received from the provider, None if they could not be loaded
+        """
+        # Try loading local file
+        all_cat = self._load_from_file(f"all_groups_{stream_type}.json", ignore_age=self.state["offline"])
+        # If file empty or does not exists, download it from remote
+        if all_cat is None and not self.state["offline"]:
+            # Load all Groups and save file locally
+            all_cat = self._load_categories_from_provider(stream_type)
+            if all_cat is not None:
+                self._save_to_file(all_cat,f"all_groups_{stream_type}.json")
+            elif self.cache_first:
+                # Keep the last good catalog when the provider fails
+                all_cat = self._load_from_file(f"all_groups_{stream_type}.json", ignore_age=True)
+        return all_cat
+
+    def iter_streams(self, stream_type: str, predicate: Callable = None) -> Iterator:
+        """Build the streams of a type one at a time, without adding them to the catalog
+
+        The streams are read from the cached file, or downloaded from the
+        provider, and decoded and built as they arrive, so only the IDs of
+        the streams already seen are kept in memory. load_iptv() is not
+        needed, the streams are not added to XTream.channels, XTream.movies,
+        XTream.series or to their group. Like with load_iptv(), a stream
+        listed in several groups is yielded once, with its first group.
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+            predicate (Callable, optional): Only yield the streams for which predicate(stream) is True
+
+        Yields:
+            Channel|Serie: The streams, in the provider order
+        """
+        self._lazy_start()
+        if self.state["authenticated"] is False:
+            print("Warning, cannot load steams since authorization failed")
+            return
+
+        # The group names of Channels
+        groups_by_id = {}
+        if stream_type != self.series_type:
+            groups = [group for group in self.groups if group.stream_type == stream_type]
+            if not groups:
+                groups = [Group(cat_obj, stream_type) for cat_obj in self._load_categories(stream_type) or []]
+            for group in sorted(groups, key=lambda x: x.name):
+                groups_by_id.setdefault(group.group_id, group.name)
+        catch_all_name = self._get_catch_all_group(stream_type).name
+
+        seen_keys = set()
+        for stream_channel in iter_json_array(self._iter_stream_chunks(stream_type)):
+            if self._get_skip_reason(stream_type, stream_channel) is not None:
+                continue
+            stream_key = self._get_stream_key(stream_type, stream_channel)
+            if stream_key is not None:
+                if stream_key in seen_keys:
+                    continue
+                seen_keys.add(stream_key)
+            intern_fields(stream_channel)
+
+            # Some channels have no group
+            if stream_channel["category_id"] is None:
+                stream_channel["category_id"] = "9999"
+
+            if stream_type == self.series_type:
+                new_stream = Serie(self, stream_channel)
+            else:
+                group_name = groups_by_id.get(int(stream_channel["category_id"]), catch_all_name)
+                new_stream = Channel(self, group_name, stream_channel)
+
+            if predicate is None or predicate(new_stream):
+                yield new_stream
+
+    def _iter_stream_chunks(self, stream_type: str) -> Iterator[bytes]:
+        """Read the JSON of all the streams of a type in chunks, from the cache or the provider
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+
+        Yields:
+            bytes: The JSON document in chunks
+        """
+        filename = f"all_stream_{stream_type}.json"
+        full_filename = self._get_cache_file(filename, ignore_age=self.state["offline"])
+        if full_filename is not None:
+            try:
+                yield from iter_cache_file(full_filename)
+                return
+            except CacheError as e:
+                # Some streams were already returned, do not start again from the provider
+                print(f" - Corrupted cache file `{full_filename}`: e=`{e}`")
+                return
+
+        if self.state["offline"]:
+            return
+
+        url = {
+            self.live_type: self.get_live_streams_URL(),
+            self.vod_type: self.get_vod_streams_URL(),
+            self.series_type: self.get_series_URL()
+        }[stream_type]
+        response = self._http_get(url, timeout=(2, 15), stream=True, headers=self.connection_headers)
+        if response.status_code != 200:
+            print(f"HTTP error {response.status_code} while retrieving from {url}")
+            return
+        try:
+            yield from response.iter_content(1 << 16)
+        finally:
+            response.close()
+
+    def _get_streams(self, stream_type: str, catalog=None):
+        """Get the list of loaded streams of a stream type, in the current catalog by default"""
+        if catalog is None:
+            catalog = self._catalog
+        if stream_type == self.live_type:
+            return catalog.channels
+        if stream_type == self.vod_type:
+            return catalog.movies
+        return catalog.series
+
+    def _get_catch_all_group(self, stream_type: str) -> Group:
+        """Get the group collecting the streams without a valid group"""
+        return self._catalog.catch_all_groups[stream_type]
+
+    def _get_skip_reason(self, stream_type: str, stream_channel: dict) -> str:
+        """Tell if a stream must be skipped during loading
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream_channel (dict): Stream as received from the provider
+
+        Returns:
+            str: "no_name", "unknown_type" or "adult" if the stream is skipped, None otherwise
+        """
+        # Skip if the name of the stream is empty
+        if stream_channel["name"] == "":
+            return "no_name"
+
+        # Skip what Channel cannot build
+        if stream_type != self.series_type:
+            if stream_channel.get("stream_type") not in ("live", "movie", "created_live", "radio_streams"):
+                return "unknown_type"
+
+        # Skip if the user chose to hide adult streams
+        if self.hide_adult_content and stream_type == self.live_type:
+            if stream_channel.get("is_adult") == "1":
+                return "adult"
+
+        return None
+
+    def _build_stream(self, catalog: CatalogBuilder, stream_type: str, stream_channel: dict, the_group: Group):
+        """Build a stream and add it to the catalog and to its group
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream_channel (dict): Stream as received from the provider
+            the_group (Group): Group of the stream
+
+        Returns:
+            Channel|Serie: The stream
+        """
+        # The provider can list the same stream in several groups
+        duplicate = self._get_duplicate(catalog, stream_type, stream_channel)
+        if duplicate is not None:
+            self._add_to_group(stream_type, duplicate, the_group)
+            return duplicate
+
+        if stream_type == self.series_type:
+            # Load all Series
+            new_stream = Serie(self, stream_channel)
+            # To get all the Episodes for every Season of each
+            # Series is very time consuming, we will only
+            # populate the Series once the user click on the
+            # Series, the Seasons and Episodes will be loaded
+            # using x.getSeriesInfoByID() function
+        else:
+            new_stream = Channel(self, the_group.name, stream_channel)
+
+        self._add_stream(catalog, stream_type, new_stream, the_group)
+        return new_stream
+
+    def open_group(self, group: Group) -> Group:
+        """Load the streams of a group when the catalog was loaded with lazy_groups
+
+        The streams of the group are read from the cache, or downloaded from
+        the provider and saved to the cache, then built and added to a copy
+        of the group and to XTream.channels, XTream.movies or XTream.series
+        in a new catalog. When more than max_loaded_groups groups are loaded,
+        the least recently opened ones are unloaded.
+
+        Args:
+            group (Group): Group from XTream.groups
+
+        Returns:
+            Group: The group with its streams, from the new XTream.groups
+        """
+        if not self.lazy_groups or group is self._get_catch_all_group(group.stream_type):
+            return group
+
+        group_key = (group.stream_type, group.group_id)
+        with self._catalog_lock:
+            if group_key in self._loaded_groups:
+                self._loaded_groups.move_to_end(group_key)
+                return self._loaded_groups[group_key]
+
+            if not isinstance(self._catalog, CatalogSnapshot):
+                # A mapped shared catalog already has the streams of all its groups
+                return next(
+                    (
+                        catalog_group for catalog_group in self._catalog.groups
+                        if catalog_group.stream_type == group.stream_type and catalog_group.group_id == group.group_id
+                    ),
+                    group
+                )
+
+            stream_type = group.stream_type
+            category_id = group.raw["category_id"]
+            filename = f"group_{stream_type}_{self._slugify(str(category_id))}.json"
+
+            start = timer()
+            group_streams = self._load_from_file(filename, ignore_age=self.state["offline"])
+            if group_streams is None and not self.state["offline"]:
+                group_streams = self._load_streams_by_category_from_provider(stream_type, category_id)
+                if group_streams is not None:
+                    self._save_to_file(group_streams, filename)
+                elif self.cache_first:
+                    # Keep the last good streams when the provider fails
+                    group_streams = self._load_from_file(filename, ignore_age=True)
+            self.metrics.observe("pyxtream_load_seconds", timer() - start, stream_type=stream_type, phase="group")
+
+            if group_streams is None:
+                print(f" - Could not load the streams of the group `{group.name}`")
+                return group
+
+            # The published catalog is not modified, the group is loaded in a copy
+            catalog = CatalogBuilder.from_snapshot(self._catalog)
+            current_group = next(
+                (
+                    catalog_group for catalog_group in catalog.groups
+                    if catalog_group.stream_type == stream_type and catalog_group.group_id == group.group_id
+                ),
+                group
+            )
+            loaded_group = catalog.replace_group(current_group)
+
+            start = timer()
+            for stream_channel in group_streams:
+                intern_fields(stream_channel)
+                if self._get_skip_reason(stream_type, stream_channel) is not None:
+                    self._save_to_file_skipped_streams(stream_channel)
+                    continue
+                self._build_stream(catalog, stream_type, stream_channel, loaded_group)
+            self.metrics.observe("pyxtream_build_seconds", timer() - start, stream_type=stream_type)
+
+            self._loaded_groups[group_key] = loaded_group
+            while 0 < self.max_loaded_groups < len(self._loaded_groups):
+                _, oldest_group = self._loaded_groups.popitem(last=False)
+                self._unload_group(catalog, oldest_group)
+
+            self._publish_catalog(catalog)
+
+        return loaded_group
+
+    def _unload_group(self, catalog: CatalogBuilder, group: Group):
+        """Remove the streams of a group from the catalog
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            group (Group): Group opened with open_group()
+        """
+        group_streams = group.series if group.stream_type == self.series_type else group.channels
+
+        # Keep the streams that are also in other loaded groups
+        kept = {
+            id(stream)
+            for other_group in self._loaded_groups.values() if other_group.stream_type == group.stream_type
+            for stream in (other_group.series if group.stream_type == self.series_type else other_group.channels)
+        }
+        group_streams = [stream for stream in group_streams if id(stream) not in kept]
+        removed = {id(stream) for stream in group_streams}
+
+        streams_by_id = catalog.streams_by_id[group.stream_type]
+        for stream in group_streams:
+            streams_by_id.pop(self._get_stream_key(group.stream_type, stream.raw), None)
+
+        if group.stream_type == self.live_type:
+            catalog.channels = [stream for stream in catalog.channels if id(stream) not in removed]
+        elif group.stream_type == self.vod_type:
+            catalog.movies = [stream for stream in catalog.movies if id(stream) not in removed]
+            for stream in group_streams:
+                catalog.movies_added_index.remove(stream, stream.added)
+        else:
+            catalog.series = [stream for stream in catalog.series if id(stream) not in removed]
+            for stream in group_streams:
+                catalog.series_added_index.remove(stream, stream.last_modified)
+
+        unloaded_group = catalog.replace_group(group)
+        unloaded_group.channels = []
+        unloaded_group.series = []
+
+    def _add_stream(self, catalog: CatalogBuilder, stream_type: str, new_stream, the_group: Group):
+        """Add a newly built stream to the catalog and to its group
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            stream_type (str): Stream type can be Live, VOD, Series
+            new_stream (Channel|Serie): The stream
+            the_group (Group): Group of the stream
+        """
+        # Save the new channel to the local list of channels
+        if stream_type == self.live_type:
+            catalog.channels.append(new_stream)
+            the_group.channels.append(new_stream)
+        elif stream_type == self.vod_type:
+            catalog.movies.append(new_stream)
+            catalog.movies_added_index.add(new_stream, new_stream.added)
+            the_group.channels.append(new_stream)
+        else:
+            catalog.series.append(new_stream)
+            catalog.series_added_index.add(new_stream, new_stream.last_modified)
+            the_group.series.append(new_stream)
+
+        stream_key = self._get_stream_key(stream_type, new_stream.raw)
+        if stream_key is not None:
+            catalog.streams_by_id[stream_type][stream_key] = new_stream
+
+    @staticmethod
+    def _get_stream_key(stream_type: str, stream_channel: dict):
+        """ID identifying a stream at the provider, None if there is none"""
+        if stream_type == XTream.series_type:
+            return stream_channel.get("series_id")
+        return stream_channel.get("stream_id")
+
+    def _get_duplicate(self, catalog: CatalogBuilder, stream_type: str, stream_channel: dict):
+        """Get the stream already built with the same ID
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream_channel (dict): Stream as received from the provider
+
+        Returns:
+            Channel|Serie: The stream already built, None if it is a new stream
+        """
+        stream_key = self._get_stream_key(stream_type, stream_channel)
+        if stream_key is None:
+            return None
+        return catalog.streams_by_id[stream_type].get(stream_key)
+
+    def _add_to_group(self, stream_type: str, stream, the_group: Group):
+        """Add an already built stream to one more group
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream (Channel|Serie): The stream
+            the_group (Group): Group of the stream
+        """
+        group_streams = the_group.series if stream_type == self.series_type else the_group.channels
+        # The provider can also repeat a stream in the same group
+        if not any(group_stream is stream for group_stream in group_streams):
+            group_streams.append(stream)
+
+    def _should_build_in_parallel(self, number_of_streams: int) -> bool:
+        """Tell if the streams are built in worker processes
+
+        With parallel_build, they are only when there are at least two CPUs
+        and PARALLEL_BUILD_MIN_STREAMS streams, the workers are slower otherwise.
+
+        Args:
+            number_of_streams (int): Number of streams of the stream type
+
+        Returns:
+            bool: True to use _build_streams_parallel()
+        """
+        return (
+            self.parallel_build
+            and (cpu_count() or 1) >= 2
+            and number_of_streams >= PARALLEL_BUILD_MIN_STREAMS
+        )
+
+    def _build_streams_parallel(
+        self, catalog: CatalogBuilder, stream_type: str, all_streams: list, groups_by_id: dict
+        ) -> Dict[str, int]:
+        """Build the streams of one stream type using worker processes
+
+        The streams are split in chunks and normalized in the process pool,
+        while this process rebuilds the objects in their original order and
+        adds them to the catalog.
+
+        Args:
+            catalog (CatalogBuilder): Catalog being built
+            stream_type (str): Stream type can be Live, VOD, Series
+            all_streams (list): Streams as received from the provider
+            groups_by_id (dict): Groups of this stream type by group ID
+
+        Returns:
+            Dict[str, int]: Number of skipped streams for each reason
+        """
+        # Imported here since it depends on this module
+        from pyxtream.parallel_build import BuildContext, normalize_streams, restore_stream
+
+        skipped = {"no_name": 0, "adult": 0, "unknown_type": 0}
+        catch_all_group = catalog.catch_all_groups[stream_type]
+        context = BuildContext(self)
+        chunk_size = max(1000, len(all_streams) // ((cpu_count() or 1) * 4) + 1)
+        jobs = [
+            self._get_process_pool().submit(
+                normalize_streams, context, stream_type, all_streams[first:first + chunk_size], first
+                )
+            for first in range(0, len(all_streams), chunk_size)
+        ]
+
+        for job in jobs:
+            records, skipped_streams = job.result()
+            for index, skip_reason in skipped_streams:
+                skipped[skip_reason] += 1
+                self._save_to_file_skipped_streams(all_streams[index])
+
+            for index, category_id, values in records:
+                stream_channel = all_streams[index]
+                if stream_channel["category_id"] is None:
+                    stream_channel["category_id"] = "9999"
+                the_group = groups_by_id.get(category_id, catch_all_group)
+                duplicate = self._get_duplicate(catalog, stream_type, stream_channel)
+                if duplicate is not None:
+                    self._add_to_group(stream_type, duplicate, the_group)
+                    continue
+                new_stream = restore_stream(self, stream_type, values, stream_channel)
+                if stream_type != self.series_type:
+                    new_stream.group_title = the_group.name
+                self._add_stream(catalog, stream_type, new_stream, the_group)
+
+        return skipped
+
+    def _get_process_pool(self):
+        """Get the worker processes shared by parallel validation and building"""
+        if self._process_pool is None:
+            # Imported here since it loads multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._process_pool = ProcessPoolExecutor()
+        return self._process_pool
+
+    def _get_schema_type(self, stream_type: str) -> SchemaType:
+        """Get the schema used to validate one stream of a stream type"""
+        if stream_type == self.series_type:
+            return SchemaType.SERIES_INFO
+        if stream_type == self.live_type:
+            return SchemaType.LIVE
+        return SchemaType.VOD
+
+    def _submit_validation(self, all_streams: list, stream_type: str) -> list:
+        """Start validating the streams in worker processes
+
+        Args:
+            all_streams (list): Streams as received from the provider
+            stream_type (str): Stream type can be Live, VOD, Series
+
+        Returns:
+            list: (schema type, first position, chunk size, future) for each chunk of streams
+        """
+        chunk_size = max(1000, len(all_streams) // ((cpu_count() or 1) * 4) + 1)
+        schema_type = self._get_schema_type(stream_type)
+
+        return [
+            (
+                schema_type,
+                first,
+                chunk_size,
+                self._get_process_pool().submit(
+                    validate_many,
+                    all_streams[first:first + chunk_size],
+                    schema_type,
+                    self.validate_json_percent,
+                    first
+                    )
+            )
+            for first in range(0, len(all_streams), chunk_size)
+        ]
+
+    def _report_validation(self, validation_jobs: list, all_streams: list):
+        """Wait for the validation running in worker processes and print what did not validate"""
+        from concurrent.futures.process import BrokenProcessPool
+
+        for schema_type, first, chunk_size, job in validation_jobs:
+            try:
+                invalid = job.result()
+            except BrokenProcessPool:
+                # A worker process died, validate its chunk here instead
+                print(" - JSON validation worker stopped, validating in this process")
+                invalid = validate_many(
+                    all_streams[first:first + chunk_size], schema_type, self.validate_json_percent, first
+                    )
+            for index, error in invalid:
+                print(error)
+                print(all_streams[index])
 
     def _save_to_file_skipped_streams(self, stream_channel: Channel):
 
@@ -903,10 +2201,10 @@ class XTream:
         full_filename = osp.join(self.cache_path, "skipped_streams.json")
 
         # If the path makes sense, save the file
-        json_data = json.dumps(stream_channel, ensure_ascii=False)
+        json_data = jsoncodec.dumps(stream_channel)
         try:
-            with open(full_filename, mode="a", encoding="utf-8") as myfile:
-                myfile.writelines(json_data)
+            with open(full_filename, mode="ab") as myfile:
+                myfile.write(json_data)
             return True
         except Exception as e:
             print(f" - Could not save to skipped stream file `{full_filename}`: e=`{e}`")
@@ -918,6 +2216,7 @@ class XTream:
         Args:
             get_series (dict): Series dictionary
         """
+        self._lazy_start()
 
         series_seasons = self._load_series_info_by_id_from_provider(get_series.series_id)
 
@@ -947,32 +2246,91 @@ class XTream:
         Returns:
             [type]: JSON dictionary of the loaded data, or None
         """
+        import requests
+
+        action = self._get_url_action(url)
         i = 0
         while i < 10:
-            time.sleep(1)
+            # Be gentle with the provider before trying again, there is no need when replaying
+            if i > 0 and (self.cassette is None or not self.cassette.replaying):
+                time.sleep(1)
             try:
-                r = requests.get(url, timeout=timeout, headers=self.connection_headers)
+                start = timer()
+                r = self._http_get(url, timeout=timeout, headers=self.connection_headers)
+                self.metrics.observe("pyxtream_http_request_seconds", timer() - start, action=action)
+                self.metrics.inc("pyxtream_http_bytes_total", len(r.content), action=action)
                 i = 20
                 if r.status_code == 200:
-                    return r.json()
+                    with self.metrics.time("pyxtream_json_decode_seconds", source="http", action=action):
+                        return jsoncodec.loads(r.content)
+                self.metrics.inc("pyxtream_http_errors_total", action=action, error=f"HTTP {r.status_code}")
             except requests.exceptions.ConnectionError:
                 print(" - Connection Error: Possible network problem (e.g. DNS failure, refused connection, etc)")
+                self.metrics.inc("pyxtream_http_errors_total", action=action, error="ConnectionError")
+                if self._revalidating:
+                    # Provider down at a cache-first start, do not retry, the next files are read from the cache
+                    self._go_offline()
+                    return None
                 i += 1
 
             except requests.exceptions.HTTPError:
                 print(" - HTTP Error")
+                self.metrics.inc("pyxtream_http_errors_total", action=action, error="HTTPError")
                 i += 1
 
             except requests.exceptions.TooManyRedirects:
                 print(" - TooManyRedirects")
+                self.metrics.inc("pyxtream_http_errors_total", action=action, error="TooManyRedirects")
                 i += 1
 
             except requests.exceptions.ReadTimeout:
                 print(" - Timeout while loading data")
+                self.metrics.inc("pyxtream_http_errors_total", action=action, error="ReadTimeout")
                 i += 1
 
         return None
 
+    def _http_get(self, url: str, **kwargs):
+        """GET a URL from the provider, through the cassette if there is one
+
+        Args:
+            url (str): The URL where to GET content
+            kwargs: Arguments of requests.get
+
+        Returns:
+            requests.Response|CassetteResponse: The response
+        """
+        import requests
+
+        if self.cassette is None:
+            return requests.get(url, **kwargs)
+        return self.cassette.get(url, lambda: requests.get(url, **kwargs), stream=kwargs.get("stream", False))
+
+    def _get_url_action(self, url: str) -> str:
+        """Get the Xtream API action of a URL, used to label the metrics
+
+        Args:
+            url (str): Provider URL
+
+        Returns:
+            str: One of METRIC_ACTIONS, "other" for any other URL
+        """
+        parsed_url = urlparse(url)
+        action = parse_qs(parsed_url.query).get("action")
+        if action:
+            action = action[0]
+        else:
+            action = osp.splitext(osp.basename(parsed_url.path))[0]
+        return action if action in METRIC_ACTIONS else "other"
+
+    @staticmethod
+    def _get_file_action(filename: str) -> str:
+        """Label of a cache file in the metrics, the same for all the groups of a stream type"""
+        if filename.startswith("group_"):
+            # group_<stream type>_<category ID>.json
+            return "group_" + filename.split("_")[1]
+        return osp.splitext(filename)[0]
+
     # GET Stream Categories
     def _load_categories_from_provider(self, stream_type: str):
         """Get from provider all category for specific stream type from provider
@@ -0,0 +1,107 @@
+"""
+pyxtream raw_store
+
+Read the provider JSON of the streams back from the cache files, one
+stream at a time.
+
+With XTream(raw_on_demand=True), the all_stream_*.json cache files are
+written uncompressed with one stream per line:
+
+    PYXC1 none <length> <crc32>
+    [
+    {"num":1,"name":"...","stream_id":1,...},
+    {"num":2,"name":"...","stream_id":2,...}
+    ]
+
+which is still a JSON list for the normal loader. After the streams are
+built, each one keeps the offset of its line in a memory-mapped file
+instead of its `raw` dict, and `raw` decodes the line when it is read.
+The page cache of the operating system keeps the lines in memory only
+while they are used.
+"""
+
+import mmap
+from array import array
+from typing import Iterable
+
+from pyxtream import jsoncodec
+from pyxtream.cache import CacheError, MAGIC, _parse_header, write_cache_file
+
+# Start of the list, each stream then ends with ",\n" and the last one with "\n"
+_LIST_START = b"[\n"
+
+
+def write_stream_lines(filename: str, streams: Iterable[dict]):
+    """Atomically write a cache file with one stream per line
+
+    Args:
+        filename (str): Full path of the file
+        streams (Iterable[dict]): Streams as received from the provider
+    """
+    payload = _LIST_START + b",\n".join(jsoncodec.dumps(stream) for stream in streams) + b"\n]\n"
+    write_cache_file(filename, payload, "none")
+
+
+class RawStore:
+    """Streams of a cache file written by write_stream_lines(), read by offset"""
+
+    def __init__(self, filename: str):
+        """Map a cache file and find the line of each stream
+
+        Args:
+            filename (str): Full path of the file
+
+        Raises:
+            CacheError: The file is compressed, or not written with one stream per line
+            OSError: The file cannot be read
+        """
+        self.filename = filename
+        with open(filename, mode="rb") as cache_file:
+            self._map = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        start = 0
+        end = len(self._map)
+        if self._map[:len(MAGIC) + 1] == MAGIC + b" ":
+            header_end = self._map.find(b"\n")
+            if header_end < 0:
+                raise CacheError("truncated header")
+            codec, length, _ = _parse_header(self._map[:header_end])
+            if codec != "none":
+                raise CacheError(f"the file is compressed with {codec}")
+            start = header_end + 1
+            end = start + length
+        if self._map[start:start + len(_LIST_START)] != _LIST_START:
+            raise CacheError("the file is not written with one stream per line")
+
+        # Offset of the line of each stream
+        self.offsets = array("q")
+        position = start + len(_LIST_START)
+        find = self._map.find
+        while position < end and self._map[position] != ord("]"):
+            line_end = find(b"\n", position, end)
+            if line_end < 0:
+                raise CacheError("truncated file")
+            if line_end > position:
+                self.offsets.append(position)
+            position = line_end + 1
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def get_bytes(self, offset: int) -> bytes:
+        """JSON of the stream starting at an offset"""
+        line_end = self._map.find(b"\n", offset)
+        if self._map[line_end - 1] == ord(","):
+            line_end -= 1
+        return self._map[offset:line_end]
+
+    def get(self, offset: int) -> dict:
+        """Stream starting at an offset, as received from the provider
+
+        Args:
+            offset (int): Offset of the stream in the file
+
+        Returns:
+            dict: The stream
+        """
+        return jsoncodec.loads(self.get_bytes(offset))
@@ -0,0 +1,265 @@
+"""
+pyxtream recorder
+
+Record a live channel to a file.
+
+The HLS form of the channel URL (.m3u8) is used. The playlist is read
+again every half target duration, the new segments are downloaded by a
+few threads ahead of the writer, and written to the file in their order.
+Segments that could not be downloaded, or that left the playlist before
+they were seen, are counted as gaps.
+
+    recorder = xt.record_live(channel, duration_sec=3600)
+    ...
+    recorder.stop()
+    recorder.join()
+    print(recorder.stats)
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import List, Tuple
+from urllib.parse import urljoin
+
+
+class Playlist:
+    """HLS media or master playlist"""
+
+    def __init__(self, text: str, base_url: str):
+        """Parse a playlist
+
+        Args:
+            text (str): Content of the m3u8 file
+            base_url (str): URL of the playlist, the relative URLs are resolved against it
+
+        Raises:
+            ValueError: The text is not an HLS playlist
+        """
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        if not lines or lines[0] != "#EXTM3U":
+            raise ValueError("not an HLS playlist")
+
+        self.media_sequence = 0
+        self.target_duration = 10.0
+        self.ended = False
+        # (sequence number, duration in seconds, URL)
+        self.segments: List[Tuple[int, float, str]] = []
+        # (bandwidth, URL) of the variants of a master playlist
+        self.variants: List[Tuple[int, str]] = []
+
+        duration = None
+        bandwidth = None
+        for line in lines[1:]:
+            if line.startswith("#EXT-X-MEDIA-SEQUENCE:"):
+                self.media_sequence = int(line.split(":", 1)[1])
+            elif line.startswith("#EXT-X-TARGETDURATION:"):
+                self.target_duration = float(line.split(":", 1)[1])
+            elif line.startswith("#EXT-X-ENDLIST"):
+                self.ended = True
+            elif line.startswith("#EXTINF:"):
+                duration = float(line.split(":", 1)[1].split(",", 1)[0])
+            elif line.startswith("#EXT-X-STREAM-INF:"):
+                bandwidth = 0
+                for attribute in line.split(":", 1)[1].split(","):
+                    if attribute.startswith("BANDWIDTH="):
+                        bandwidth = int(attribute.split("=", 1)[1])
+            elif not line.startswith("#"):
+                url = urljoin(base_url, line)
+                if bandwidth is not None:
+                    self.variants.append((bandwidth, url))
+                    bandwidth = None
+                else:
+                    sequence = self.media_sequence + len(self.segments)
+                    self.segments.append((sequence, duration if duration is not None else self.target_duration, url))
+                    duration = None
+
+
+class Recorder(threading.Thread):
+
+    def __init__(
+        self,
+        xtream,
+        channel,
+        filename: str,
+        duration_sec: float = None,
+        prefetch: int = 3,
+        timeout: tuple = (3, 10),
+        max_errors: int = 10
+        ):
+        """Prepare the recording of a live channel, call start() to record
+
+        Args:
+            xtream (XTream): Authenticated XTream instance
+            channel (Channel): Live channel
+            filename (str): Full path of the recording
+            duration_sec (float, optional): Length of the recording. Defaults to until stop() is called.
+            prefetch (int, optional): Number of segments downloaded at the same time. Defaults to 3.
+            timeout (tuple, optional): Connection and read timeouts in seconds. Defaults to (3, 10).
+            max_errors (int, optional): Stop after this many failed playlist requests in a row. Defaults to 10.
+        """
+        threading.Thread.__init__(self, name=f"pyxtream recorder {channel.id}", daemon=True)
+        self.xtream = xtream
+        self.channel = channel
+        self.filename = filename
+        self.duration_sec = duration_sec
+        self.prefetch = max(1, prefetch)
+        self.timeout = timeout
+        self.max_errors = max_errors
+        self.url = xtream.url_template.build("live", channel.id, "m3u8")
+
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "segments": 0,
+            "bytes": 0,
+            "recorded_seconds": 0.0,
+            "gaps": 0,
+            "gap_seconds": 0.0,
+            "playlist_errors": 0,
+            "download_seconds": 0.0,
+            "elapsed_seconds": 0.0,
+        }
+
+    @property
+    def stats(self) -> dict:
+        """Statistics of the recording
+
+        Returns:
+            dict: `segments` and `bytes` written, `recorded_seconds` of video, `gaps` (missing
+                  segments) and their `gap_seconds`, `playlist_errors`, `elapsed_seconds`, and
+                  `throughput` (bytes per second while downloading segments)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        download_seconds = stats.pop("download_seconds")
+        stats["throughput"] = stats["bytes"] / download_seconds if download_seconds > 0 else None
+        return stats
+
+    def stop(self):
+        """Stop recording, the segments already downloaded are written"""
+        self._stop_event.set()
+
+    def _count(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self._stats[key] += value
+
+    def _get_playlist(self, session, url: str) -> Playlist:
+        """Download a media playlist, following a master playlist to its best variant"""
+        for _ in range(2):
+            response = session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            playlist = Playlist(response.text, response.url)
+            if not playlist.variants:
+                return playlist
+            url = max(playlist.variants)[1]
+        raise ValueError("nested master playlists")
+
+    def _fetch_segment(self, session, url: str) -> bytes:
+        """Download a segment, trying twice
+
+        Returns:
+            bytes: The segment, None if it could not be downloaded
+        """
+        import requests
+
+        for _ in range(2):
+            start = timer()
+            try:
+                response = session.get(url, timeout=self.timeout)
+                if response.status_code == 200:
+                    self._count(download_seconds=timer() - start)
+                    return response.content
+            except requests.exceptions.RequestException:
+                pass
+            if self._stop_event.is_set():
+                break
+        return None
+
+    def _write_segment(self, file, duration: float, data: bytes):
+        if data is None:
+            self._count(gaps=1, gap_seconds=duration)
+            self.xtream.metrics.inc("pyxtream_record_gaps_total")
+            return
+        file.write(data)
+        self._count(segments=1, bytes=len(data), recorded_seconds=duration)
+        self.xtream.metrics.inc("pyxtream_record_bytes_total", len(data))
+
+    def run(self):
+        import requests
+
+        print(f"Recording `{self.channel.name}` to `{self.filename}`")
+        start = timer()
+        session = requests.Session()
+        session.headers.update(self.xtream.connection_headers)
+        # Next sequence number to download, None before the first playlist
+        next_sequence = None
+        # Segments being downloaded, in order: (duration, future)
+        pending = deque()
+        errors = 0
+
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor, open(self.filename, "wb") as file:
+            while not self._stop_event.is_set():
+                if self.duration_sec is not None and timer() - start >= self.duration_sec:
+                    break
+
+                refresh_sec = 1.0
+                try:
+                    playlist = self._get_playlist(session, self.url)
+                    errors = 0
+                except (requests.exceptions.RequestException, ValueError) as e:
+                    errors += 1
+                    self._count(playlist_errors=1)
+                    if errors >= self.max_errors:
+                        print(f" - Stopped recording `{self.channel.name}`: e=`{e}`")
+                        break
+                    playlist = None
+
+                if playlist is not None:
+                    segments = playlist.segments
+                    if next_sequence is None and not playlist.ended:
+                        # Start at the live edge
+                        segments = segments[-self.prefetch:]
+                    for sequence, duration, url in segments:
+                        if next_sequence is not None and sequence < next_sequence:
+                            continue
+                        if next_sequence is not None and sequence > next_sequence:
+                            # The playlist moved on before these segments were seen
+                            missed = sequence - next_sequence
+                            self._count(gaps=missed, gap_seconds=missed * playlist.target_duration)
+                            self.xtream.metrics.inc("pyxtream_record_gaps_total", missed)
+                        pending.append((duration, executor.submit(self._fetch_segment, session, url)))
+                        next_sequence = sequence + 1
+                    if playlist.ended:
+                        break
+                    refresh_sec = max(0.5, playlist.target_duration / 2)
+
+                # Write the segments as they arrive until the next playlist refresh
+                deadline = timer() + refresh_sec
+                while not self._stop_event.is_set() and timer() < deadline:
+                    if pending and pending[0][1].done():
+                        duration, future = pending.popleft()
+                        self._write_segment(file, duration, future.result())
+                    elif pending:
+                        try:
+                            pending[0][1].result(timeout=min(0.2, max(0, deadline - timer())))
+                        except Exception:
+                            pass
+                    else:
+                        self._stop_event.wait(deadline - timer())
+
+            # Write what is already queued
+            while pending:
+                duration, future = pending.popleft()
+                self._write_segment(file, duration, future.result())
+
+        session.close()
+        with self._lock:
+            self._stats["elapsed_seconds"] = timer() - start
+        stats = self.stats
+        print(
+            f"Recorded {stats['recorded_seconds']:.0f} seconds of `{self.channel.name}`, "
+            f"{stats['bytes'] / 2**20:.1f} MB, {stats['gaps']} missing segments"
+        )
@@ -17,12 +17,21 @@ class EndpointAction(object):
 
     def __call__(self, **args):
 
-        if args != {}:
+        if self.function_name == "changes":
+            # Server-Sent Events, resuming after the last event received
+            since = FlaskRequest.headers.get("Last-Event-ID") or FlaskRequest.args.get("since")
+            since = int(since) if since is not None and since.isdigit() else None
+            self.response = FlaskResponse(self.action(since), status=200, mimetype="text/event-stream")
+            self.response.headers["Cache-Control"] = "no-cache"
+        elif self.function_name == "metrics":
+            self.response = FlaskResponse(self.action(), status=200, headers={})
+            self.response.headers["Content-Type"] = "text/plain; version=0.0.4; charset=utf-8"
+        elif args != {}:
 
             #Stream Search
             if self.function_name == "stream_search":
                 regex_term = r"^.*{}.*$".format(args['term'])
-                answer = self.action(regex_term,  return_type = 'JSON')
+                answer = self.action(regex_term,  return_type = 'JSON_BYTES')
 
             # Download stream
             elif self.function_name == "download_stream":
@@ -78,6 +87,8 @@ class FlaskWrap(Thread):
         self.add_endpoint(endpoint='/', endpoint_name='home', handler=[self.home_template,""])
         self.add_endpoint(endpoint='/stream_search/<term>', endpoint_name='stream_search', handler=[self.xt.search_stream,"stream_search"])
         self.add_endpoint(endpoint='/download_stream/<stream_id>/', endpoint_name='download_stream', handler=[self.xt.download_video,"download_stream"])
+        self.add_endpoint(endpoint='/metrics', endpoint_name='metrics', handler=[self.xt.metrics.to_prometheus,"metrics"])
+        self.add_endpoint(endpoint='/changes', endpoint_name='changes', handler=[self.xt.changes.stream_sse,"changes"])
 
     def run(self):
         self.app.run(debug=self.debug, use_reloader=False, host=self.host, port=self.port)
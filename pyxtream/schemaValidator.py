@@ -1,7 +1,7 @@
 
 from enum import Enum
-
-from jsonschema import exceptions, validate
+from functools import lru_cache
+from typing import List, Tuple
 
 
 # class syntax
@@ -274,7 +274,7 @@ group_schema = {
     }
 }
 
-def schemaValidator(jsonData: str, schemaType: SchemaType) -> bool:
+def _get_schema(schemaType: SchemaType) -> dict:
 
     if (schemaType == SchemaType.SERIES):
         json_schema = series_schema
@@ -289,12 +289,79 @@ def schemaValidator(jsonData: str, schemaType: SchemaType) -> bool:
     elif (schemaType == SchemaType.GROUP):
         json_schema = group_schema
     else:
-        json_schema = "{}"
+        json_schema = {}
+
+    return json_schema
+
+
+@lru_cache(maxsize=None)
+def get_validator(schemaType: SchemaType):
+    """Get the compiled validator for a schema type
+
+    The schema is checked and the validator is built only once per schema
+    type, and then reused for every validation.
 
+    Args:
+        schemaType (SchemaType): Schema to validate against
+
+    Returns:
+        Validator: jsonschema validator instance
+    """
+    # Imported on first use, it is slow to import and rarely needed
+    from jsonschema import validators
+
+    json_schema = _get_schema(schemaType)
+    validator_class = validators.validator_for(json_schema)
+    validator_class.check_schema(json_schema)
+    return validator_class(json_schema)
+
+
+def schemaValidator(jsonData: str, schemaType: SchemaType) -> bool:
+    from jsonschema import exceptions
 
-    try:
-        validate(instance=jsonData, schema=json_schema)
-    except exceptions.ValidationError as err:
-        print(err)
+    error = exceptions.best_match(get_validator(schemaType).iter_errors(jsonData))
+    if error is not None:
+        print(error)
         return False
     return True
+
+
+def is_sampled(index: int, percent: int) -> bool:
+    """Tell if the item at a given position is part of the validation sample
+
+    The sampled items are evenly spread, `percent` items out of every 100.
+
+    Args:
+        index (int): Position of the item in its list
+        percent (int): Percentage of items to sample, from 0 to 100
+
+    Returns:
+        bool: True if the item must be validated
+    """
+    return (index * percent) % 100 < percent
+
+
+def validate_many(json_list: List, schemaType: SchemaType, percent: int = 100, first_index: int = 0) -> List[Tuple[int, str]]:
+    """Validate a list of items against the same schema
+
+    It can run in a worker process since it only takes picklable arguments.
+
+    Args:
+        json_list (List): Items to validate
+        schemaType (SchemaType): Schema to validate against
+        percent (int, optional): Percentage of items to validate. Defaults to 100.
+        first_index (int, optional): Position of the first item in the whole list. Defaults to 0.
+
+    Returns:
+        List[Tuple[int, str]]: Position and error message of every item that did not validate
+    """
+    from jsonschema import exceptions
+
+    validator = get_validator(schemaType)
+    invalid = []
+    for index, jsonData in enumerate(json_list, first_index):
+        if is_sampled(index, percent):
+            error = exceptions.best_match(validator.iter_errors(jsonData))
+            if error is not None:
+                invalid.append((index, str(error)))
+    return invalid
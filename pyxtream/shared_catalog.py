@@ -0,0 +1,542 @@
+"""
+pyxtream shared_catalog
+
+Catalog in a read-only file mapped in memory, shared by several processes.
+
+One process loads the catalog from the provider and writes it to a file.
+The other processes, for example the workers of a REST server, map the
+file instead of loading the catalog themselves. The operating system
+keeps a single copy of the file in memory for all of them, and opening it
+only reads a small header, so a new worker serves within milliseconds.
+
+    # Loader process
+    xt.load_iptv()
+    xt.save_shared_catalog()
+
+    # Worker processes
+    xt = XTream(name, username, password, url, lazy_init=True, enable_flask=False)
+    xt.open_shared_catalog()
+
+The file holds no credentials, the stream URLs are built with the ones
+of the XTream instance opening it.
+
+The file is a cache file (see pyxtream.cache) without compression. Its
+payload holds a JSON description of the sections, a table of all the
+strings, and arrays of fixed-width little-endian records for the
+channels, movies, series and groups. The streams are returned as light
+views reading their record on each access, with the same attributes as
+Channel and Serie. They are read-only, and the seasons of a series are
+not stored.
+"""
+
+import mmap
+import os
+import struct
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Tuple
+
+from pyxtream import jsoncodec
+from pyxtream.added_index import AddedIndex
+from pyxtream.cache import CacheError, MAGIC, _parse_header, write_cache_file
+from pyxtream.pyxtream import Group, StreamUrlTemplate
+
+FORMAT_VERSION = 2
+
+# Length of the JSON description at the start of the payload
+_META_LENGTH = struct.Struct("<I")
+# Start and end of a string in the string table
+_STRING_RANGE = struct.Struct("<QQ")
+# ID, group ID, added, is_adult, then the string numbers of name, logo, logo_path,
+# group_title, stream_type, epg_channel_id, container_extension and raw JSON
+_CHANNEL_RECORD = struct.Struct("<qqqI8I4x")
+# Series ID, last_modified, category ID, then the string numbers of name, logo,
+# logo_path, plot, youtube_trailer, genre and raw JSON
+_SERIE_RECORD = struct.Struct("<qqq7I4x")
+# String numbers of the raw JSON and of the stream type, catch-all flag,
+# then the position and number of the stream numbers of the group in the members array
+_GROUP_RECORD = struct.Struct("<III4xQQ")
+# Stream ID and stream number, sorted by stream ID
+_ID_RECORD = struct.Struct("<qq")
+_MEMBER = struct.Struct("<I")
+
+_STREAM_TYPES = ("Live", "VOD", "Series")
+
+
+def _to_int(value, default: int = -1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class _StringTable:
+    """Strings written once each, numbered in order of first use"""
+
+    def __init__(self):
+        self.numbers: Dict[bytes, int] = {}
+        self.data = bytearray()
+        self.ranges = bytearray()
+
+    def add(self, value) -> int:
+        if value is None:
+            value = ""
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        number = self.numbers.get(value)
+        if number is None:
+            number = len(self.numbers)
+            self.numbers[value] = number
+            self.ranges += _STRING_RANGE.pack(len(self.data), len(self.data) + len(value))
+            self.data += value
+        return number
+
+
+def write_shared_catalog(filename: str, xtream, catalog=None):
+    """Write a catalog to a file that can be mapped by SharedCatalog
+
+    The file is written to a temporary file first and then renamed, the
+    processes that mapped the previous file keep reading it until they
+    open the new one.
+
+    Args:
+        filename (str): Full path of the file
+        xtream (XTream): Authenticated XTream instance
+        catalog (CatalogSnapshot, optional): Catalog to write. Defaults to XTream.catalog.
+    """
+    if catalog is None:
+        catalog = xtream.catalog
+    strings = _StringTable()
+    data = bytearray()
+    sections = {}
+
+    def add_section(name: str, content: bytes, count: int):
+        sections[name] = (len(data), count)
+        data.extend(content)
+
+    # Stream type -> id(stream) -> stream number, to write the members of the groups
+    numbers = {}
+    for stream_type, streams in zip(_STREAM_TYPES, (catalog.channels, catalog.movies, catalog.series)):
+        records = bytearray()
+        ids = []
+        numbers[stream_type] = {}
+        for number, stream in enumerate(streams):
+            numbers[stream_type][id(stream)] = number
+            raw = strings.add(jsoncodec.dumps(stream.raw))
+            if stream_type == "Series":
+                stream_id = _to_int(stream.series_id)
+                records += _SERIE_RECORD.pack(
+                    stream_id, stream.last_modified, _to_int(stream.group_id),
+                    strings.add(stream.name), strings.add(stream.logo), strings.add(stream.logo_path),
+                    strings.add(stream.plot), strings.add(stream.youtube_trailer), strings.add(stream.genre), raw
+                )
+            else:
+                stream_id = _to_int(stream.id)
+                records += _CHANNEL_RECORD.pack(
+                    stream_id, _to_int(stream.group_id), stream.added, stream.is_adult,
+                    strings.add(stream.name), strings.add(stream.logo), strings.add(stream.logo_path),
+                    strings.add(stream.group_title), strings.add(stream.stream_type),
+                    strings.add(stream.epg_channel_id), strings.add(stream.container_extension), raw
+                )
+            ids.append((stream_id, number))
+        add_section(stream_type, records, len(streams))
+
+        ids.sort()
+        add_section(f"{stream_type}_ids", b"".join(_ID_RECORD.pack(*pair) for pair in ids), len(ids))
+
+    groups = bytearray()
+    members = bytearray()
+    catch_all_groups = set(id(group) for group in catalog.catch_all_groups.values())
+    for group in catalog.groups:
+        group_streams = group.series if group.stream_type == "Series" else group.channels
+        stream_numbers = numbers[group.stream_type]
+        groups += _GROUP_RECORD.pack(
+            strings.add(jsoncodec.dumps(group.raw)), strings.add(group.stream_type), id(group) in catch_all_groups,
+            len(members) // _MEMBER.size, len(group_streams)
+        )
+        for stream in group_streams:
+            members += _MEMBER.pack(stream_numbers[id(stream)])
+    add_section("groups", groups, len(catalog.groups))
+    add_section("members", members, len(members) // _MEMBER.size)
+
+    add_section("string_ranges", strings.ranges, len(strings.numbers))
+    add_section("strings", strings.data, len(strings.data))
+
+    meta = jsoncodec.dumps({
+        "format": FORMAT_VERSION,
+        "version": catalog.version,
+        "created": time.time(),
+        "server": xtream.server,
+        "sections": sections
+    })
+    write_cache_file(filename, _META_LENGTH.pack(len(meta)) + meta + data)
+
+
+class SharedStreamList:
+    """Lazy sequence of the stream views of a type, or of a group"""
+
+    def __init__(self, catalog: "SharedCatalog", stream_type: str, members: Tuple[int, int] = None):
+        """
+        Args:
+            catalog (SharedCatalog): The mapped catalog
+            stream_type (str): Stream type can be Live, VOD, Series
+            members (Tuple[int, int], optional): Position and number of stream numbers in the
+                                                 members array. Defaults to all the streams of the type.
+        """
+        self._catalog = catalog
+        self._stream_type = stream_type
+        self._members = members
+
+    def __len__(self) -> int:
+        if self._members is None:
+            return self._catalog._sections[self._stream_type][1]
+        return self._members[1]
+
+    def _get_number(self, position: int) -> int:
+        if self._members is None:
+            return position
+        return self._catalog._read(_MEMBER, "members", self._members[0] + position)[0]
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("stream index out of range")
+        return self._catalog._make_view(self._stream_type, self._get_number(position))
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._catalog._make_view(self._stream_type, self._get_number(position))
+
+    def __add__(self, other) -> list:
+        return list(self) + list(other)
+
+
+def _field(position: int, is_string: bool = False) -> property:
+    """Attribute of a view read from its record"""
+    if is_string:
+        def get(self):
+            return self._catalog._get_string(self._get_record()[position])
+    else:
+        def get(self):
+            return self._get_record()[position]
+    return property(get)
+
+
+class SharedChannel:
+    """Live or VOD stream of a SharedCatalog, with the attributes of Channel"""
+
+    # _fingerprint is the cache of pyxtream.pool.stream_fingerprint(), _url_template
+    # is set by XTream when the credentials change, the catalog template is used otherwise
+    __slots__ = ("_catalog", "_section", "_number", "_fingerprint", "_url_template")
+
+    info = ""
+
+    id = _field(0)
+    group_id = _field(1)
+    added = _field(2)
+    is_adult = _field(3)
+    name = _field(4, True)
+    title = _field(4, True)
+    logo = _field(5, True)
+    logo_path = _field(6, True)
+    group_title = _field(7, True)
+    stream_type = _field(8, True)
+    epg_channel_id = _field(9, True)
+    container_extension = _field(10, True)
+
+    def __init__(self, catalog: "SharedCatalog", section: str, number: int):
+        self._catalog = catalog
+        # Live or VOD
+        self._section = section
+        self._number = number
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, SharedChannel) and other._catalog is self._catalog
+            and other._section == self._section and other._number == self._number
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self._catalog), self._section, self._number))
+
+    def _get_record(self) -> tuple:
+        return self._catalog._read(_CHANNEL_RECORD, self._section, self._number)
+
+    @property
+    def raw(self) -> dict:
+        return jsoncodec.loads(self._catalog._get_bytes(self._get_record()[11]))
+
+    @property
+    def url(self) -> str:
+        """Stream URL, required by Hypnotix"""
+        url_template = getattr(self, "_url_template", None) or self._catalog.url_template
+        if url_template is None:
+            return ""
+        return url_template.build(self.stream_type, self.id, self.container_extension)
+
+    @property
+    def date_now(self) -> datetime:
+        return datetime.now()
+
+    @property
+    def age_days_from_added(self) -> int:
+        """Number of days since the stream was added, always against the current time"""
+        return abs(datetime.utcfromtimestamp(self.added) - datetime.now()).days
+
+    def export_json(self):
+        jsondata = {}
+
+        jsondata["url"] = self.url
+        jsondata.update(self.raw)
+        jsondata["logo_path"] = self.logo_path
+
+        return jsondata
+
+    def export_json_bytes(self) -> bytes:
+        """export_json() encoded in JSON"""
+        return jsoncodec.dumps(self.export_json())
+
+    def invalidate_json(self):
+        """Nothing to forget, the JSON is encoded on each call"""
+
+
+class SharedSerie:
+    """Series of a SharedCatalog, with the attributes of Serie"""
+
+    # _fingerprint is the cache of pyxtream.pool.stream_fingerprint()
+    __slots__ = ("_catalog", "_number", "_fingerprint")
+
+    series_id = _field(0)
+    last_modified = _field(1)
+    group_id = _field(2)
+    name = _field(3, True)
+    logo = _field(4, True)
+    logo_path = _field(5, True)
+    plot = _field(6, True)
+    youtube_trailer = _field(7, True)
+    genre = _field(8, True)
+
+    def __init__(self, catalog: "SharedCatalog", number: int):
+        self._catalog = catalog
+        self._number = number
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SharedSerie) and other._catalog is self._catalog and other._number == self._number
+
+    def __hash__(self) -> int:
+        return hash((id(self._catalog), self._number))
+
+    def _get_record(self) -> tuple:
+        return self._catalog._read(_SERIE_RECORD, "Series", self._number)
+
+    @property
+    def raw(self) -> dict:
+        return jsoncodec.loads(self._catalog._get_bytes(self._get_record()[9]))
+
+    @property
+    def seasons(self) -> dict:
+        """Seasons filled by XTream.get_series_info_by_id(), kept by the catalog for every view of the series"""
+        return self._catalog._series_seasons.setdefault(self._number, {})
+
+    @property
+    def episodes(self) -> dict:
+        return self._catalog._series_episodes.setdefault(self._number, {})
+
+    def export_json(self):
+        jsondata = {}
+
+        jsondata.update(self.raw)
+        jsondata['logo_path'] = self.logo_path
+
+        return jsondata
+
+    def export_json_bytes(self) -> bytes:
+        """export_json() encoded in JSON"""
+        return jsoncodec.dumps(self.export_json())
+
+
+class SharedStreamIds(Mapping):
+    """Read-only mapping stream ID -> stream view of a type, like CatalogSnapshot.streams_by_id"""
+
+    def __init__(self, catalog: "SharedCatalog", stream_type: str):
+        self._catalog = catalog
+        self._stream_type = stream_type
+        self._section = f"{stream_type}_ids"
+
+    def __len__(self) -> int:
+        return self._catalog._sections[self._section][1]
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self._catalog._read(_ID_RECORD, self._section, position)[0]
+
+    def __getitem__(self, stream_id):
+        number = _to_int(stream_id, None)
+        if number is not None:
+            # Binary search in the IDs sorted when the file was written
+            first, last = 0, len(self)
+            while first < last:
+                middle = (first + last) // 2
+                if self._catalog._read(_ID_RECORD, self._section, middle)[0] < number:
+                    first = middle + 1
+                else:
+                    last = middle
+            if first < len(self):
+                found_id, stream_number = self._catalog._read(_ID_RECORD, self._section, first)
+                if found_id == number:
+                    return self._catalog._make_view(self._stream_type, stream_number)
+        raise KeyError(stream_id)
+
+
+class SharedCatalog:
+
+    def __init__(self, filename: str, url_template: StreamUrlTemplate = None):
+        """Map a file written by write_shared_catalog()
+
+        It has the attributes of CatalogSnapshot, and can be published as
+        XTream.catalog with XTream.open_shared_catalog().
+
+        Args:
+            filename (str): Full path of the file
+            url_template (StreamUrlTemplate, optional): Builds the stream URLs with the credentials
+                                                        of the account. Defaults to empty URLs.
+
+        Raises:
+            CacheError: The file is not a shared catalog, or is truncated
+        """
+        self.filename = filename
+        with open(filename, mode="rb") as catalog_file:
+            self._inode = os.fstat(catalog_file.fileno()).st_ino
+            self._mmap = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_end = self._mmap.find(b"\n", 0, 64)
+        if not self._mmap[:header_end].startswith(MAGIC + b" "):
+            raise CacheError("not a cache file")
+        codec, length, _ = _parse_header(self._mmap[:header_end])
+        payload = header_end + 1
+        if codec != "none" or payload + length != len(self._mmap):
+            raise CacheError("not an uncompressed cache file or truncated")
+
+        meta_length, = _META_LENGTH.unpack_from(self._mmap, payload)
+        meta = jsoncodec.loads(self._mmap[payload + _META_LENGTH.size:payload + _META_LENGTH.size + meta_length])
+        if meta.get("format") != FORMAT_VERSION:
+            raise CacheError(f"unsupported shared catalog format `{meta.get('format')}`")
+        data_start = payload + _META_LENGTH.size + meta_length
+        # Section name -> (absolute position, number of items)
+        self._sections = {name: (data_start + position, count) for name, (position, count) in meta["sections"].items()}
+
+        self.version = meta["version"]
+        self.created = meta["created"]
+        self.server = meta["server"]
+        self.url_template = url_template
+
+        self.channels = SharedStreamList(self, "Live")
+        self.movies = SharedStreamList(self, "VOD")
+        self.series = SharedStreamList(self, "Series")
+
+        groups = []
+        self.catch_all_groups = {}
+        for number in range(self._sections["groups"][1]):
+            raw, stream_type, is_catch_all, first_member, number_of_members = self._read(_GROUP_RECORD, "groups", number)
+            group = Group(jsoncodec.loads(self._get_bytes(raw)), self._get_string(stream_type))
+            group_streams = SharedStreamList(self, group.stream_type, (first_member, number_of_members))
+            if group.stream_type == "Series":
+                group.series = group_streams
+            else:
+                group.channels = group_streams
+            if is_catch_all:
+                self.catch_all_groups[group.stream_type] = group
+            groups.append(group)
+        self.groups = tuple(groups)
+        self.streams_by_id = {stream_type: SharedStreamIds(self, stream_type) for stream_type in _STREAM_TYPES}
+
+        # Series number -> seasons and episodes, the views are created on each access
+        self._series_seasons = {}
+        self._series_episodes = {}
+
+        self._added_indexes = {}
+        self._columns = None
+        self._facets = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<SharedCatalog version={self.version} groups={len(self.groups)} "
+            f"channels={len(self.channels)} movies={len(self.movies)} series={len(self.series)}>"
+        )
+
+    def _read(self, record: struct.Struct, section: str, number: int) -> tuple:
+        return record.unpack_from(self._mmap, self._sections[section][0] + number * record.size)
+
+    def _get_bytes(self, number: int) -> bytes:
+        start, end = self._read(_STRING_RANGE, "string_ranges", number)
+        position = self._sections["strings"][0]
+        return self._mmap[position + start:position + end]
+
+    def _get_string(self, number: int) -> str:
+        return self._get_bytes(number).decode("utf-8")
+
+    def _make_view(self, stream_type: str, number: int):
+        if stream_type == "Series":
+            return SharedSerie(self, number)
+        return SharedChannel(self, stream_type, number)
+
+    def get_stream(self, stream_type: str, stream_id):
+        """Find a stream by its ID at the provider
+
+        Args:
+            stream_type (str): Stream type can be Live, VOD, Series
+            stream_id: Stream ID, or series ID for Series
+
+        Returns:
+            SharedChannel|SharedSerie: The stream, None if it is not in the catalog
+        """
+        return self.streams_by_id[stream_type].get(stream_id)
+
+    def _get_added_index(self, stream_type: str) -> AddedIndex:
+        """Index of the streams by added time, built on first use"""
+        if stream_type not in self._added_indexes:
+            index = AddedIndex()
+            if stream_type == "Series":
+                for stream in self.series:
+                    index.add(stream, stream.last_modified)
+            else:
+                for stream in self.movies:
+                    index.add(stream, stream.added)
+            self._added_indexes[stream_type] = index
+        return self._added_indexes[stream_type]
+
+    @property
+    def movies_added_index(self) -> AddedIndex:
+        return self._get_added_index("VOD")
+
+    @property
+    def series_added_index(self) -> AddedIndex:
+        return self._get_added_index("Series")
+
+    @property
+    def columns(self):
+        """Columnar view of this catalog, built on first use. See pyxtream.columnar"""
+        if self._columns is None:
+            from pyxtream.columnar import CatalogColumns
+            self._columns = CatalogColumns(self)
+        return self._columns
+
+    @property
+    def facets(self):
+        """Bitset index of this catalog for faceted filtering, built on first use. See pyxtream.facets"""
+        if self._facets is None:
+            from pyxtream.facets import FacetIndex
+            self._facets = FacetIndex(self)
+        return self._facets
+
+    def is_outdated(self) -> bool:
+        """Tell if a newer catalog was written to the file since it was mapped"""
+        try:
+            return os.stat(self.filename).st_ino != self._inode
+        except OSError:
+            return False
+
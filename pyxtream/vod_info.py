@@ -0,0 +1,224 @@
+"""
+pyxtream vod_info
+
+Details of the movies (plot, cast, TMDB ID, duration...) from the provider
+`get_vod_info` action, fetched for many movies at once.
+
+The requests run in a few threads, never faster than a maximum rate, and
+the answers are kept in a file of the cache folder so they are fetched
+only once. Each movie then gives its details with `vod_info`:
+
+    xt.vod_info.fetch(xt.movies, deadline_sec=3600)
+    print(movie.vod_info["plot"], movie.vod_info["tmdb_id"])
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from timeit import default_timer as timer
+from typing import Dict, Iterable
+
+from pyxtream import jsoncodec
+from pyxtream.progress import progress
+
+VOD_INFO_FILENAME = "vod_info.json"
+
+# HTTP status codes worth trying again after a pause
+_RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class RateLimiter:
+    """Lets at most `rate` calls per second through, shared by several threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Wait until the next call is allowed"""
+        if self.interval == 0:
+            return
+        with self._lock:
+            now = timer()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class VodInfoEnricher:
+
+    def __init__(
+        self,
+        xtream,
+        max_workers: int = 8,
+        requests_per_sec: float = 10,
+        max_age_sec: int = 60*60*24*7,
+        timeout: tuple = (3, 10),
+        save_every: int = 5000
+        ):
+        """Initialize the details of the movies of a provider
+
+        Args:
+            xtream (XTream): Authenticated XTream instance
+            max_workers (int, optional): Number of requests at the same time. Defaults to 8.
+            requests_per_sec (float, optional): Maximum number of requests per second, 0 for no limit.
+                                                Defaults to 10.
+            max_age_sec (int, optional): Details older than this are fetched again. Defaults to 1 week.
+            timeout (tuple, optional): Connection and read timeouts in seconds. Defaults to (3, 10).
+            save_every (int, optional): Save the cache after this many new details. Defaults to 5000.
+        """
+        self.xtream = xtream
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = RateLimiter(requests_per_sec)
+        self.max_age_sec = max_age_sec
+        self.timeout = timeout
+        self.save_every = save_every
+
+        # Movie ID -> {"fetched": Unix time, "data": answer of get_vod_info}
+        self.results: Dict[str, dict] = xtream._load_from_file(VOD_INFO_FILENAME, ignore_age=True) or {}
+        self._lock = threading.Lock()
+
+    def attach(self, movies: Iterable):
+        """Let the movies find their details in this cache with Channel.vod_info
+
+        Args:
+            movies (Iterable): Movies, for example XTream.movies
+        """
+        try:
+            for movie in movies:
+                movie._vod_info_source = self
+        except AttributeError:
+            # The views of a shared catalog are read-only, use get() instead
+            pass
+
+    def get(self, vod_id) -> dict:
+        """Cached answer of get_vod_info for a movie
+
+        Args:
+            vod_id: Movie ID
+
+        Returns:
+            dict: The answer with the keys `info` and `movie_data`, None if not fetched or too old
+        """
+        result = self.results.get(str(vod_id))
+        if result is None or time.time() - result["fetched"] > self.max_age_sec:
+            return None
+        return result["data"]
+
+    def fetch_one(self, vod_id, retries: int = 3) -> dict:
+        """Get the details of a movie from the provider and keep them in the cache
+
+        Args:
+            vod_id: Movie ID
+            retries (int, optional): Number of tries when the provider is busy. Defaults to 3.
+
+        Returns:
+            dict: The answer of get_vod_info, None if error
+        """
+        import requests
+
+        url = self.xtream.get_VOD_info_URL_by_ID(vod_id)
+        metrics = self.xtream.metrics
+        for attempt in range(retries):
+            self.rate_limiter.acquire()
+            start = timer()
+            try:
+                response = self.xtream._http_get(url, timeout=self.timeout, headers=self.xtream.connection_headers)
+            except requests.exceptions.RequestException as e:
+                metrics.inc("pyxtream_http_errors_total", action="get_vod_info", error=type(e).__name__)
+                time.sleep(2 ** attempt)
+                continue
+            metrics.observe("pyxtream_http_request_seconds", timer() - start, action="get_vod_info")
+            metrics.inc("pyxtream_http_bytes_total", len(response.content), action="get_vod_info")
+
+            if response.status_code == 200:
+                try:
+                    data = jsoncodec.loads(response.content)
+                except ValueError:
+                    data = None
+                # Providers answer an empty list for unknown movies
+                if not isinstance(data, dict) or not isinstance(data.get("info"), dict):
+                    metrics.inc("pyxtream_http_errors_total", action="get_vod_info", error="invalid answer")
+                    return None
+                with self._lock:
+                    self.results[str(vod_id)] = {"fetched": time.time(), "data": data}
+                return data
+
+            metrics.inc("pyxtream_http_errors_total", action="get_vod_info", error=f"HTTP {response.status_code}")
+            if response.status_code not in _RETRY_STATUS:
+                return None
+            time.sleep(2 ** attempt)
+        return None
+
+    def fetch(
+        self,
+        movies: Iterable,
+        skip_cached: bool = True,
+        deadline_sec: float = None,
+        save: bool = True
+        ) -> int:
+        """Get the details of many movies concurrently
+
+        Args:
+            movies (Iterable): Movies, for example XTream.movies
+            skip_cached (bool, optional): Do not fetch again the details younger than max_age_sec.
+                                          Defaults to True.
+            deadline_sec (float, optional): Stop starting new requests after this many seconds, the
+                                            remaining movies are fetched by the next call. Defaults to no limit.
+            save (bool, optional): Save the cache, also every save_every details. Defaults to True.
+
+        Returns:
+            int: Number of movies whose details were fetched
+        """
+        movies = list(movies)
+        self.attach(movies)
+        movies = [movie for movie in movies if not (skip_cached and self.get(movie.id) is not None)]
+        number_of_movies = len(movies)
+        start = timer()
+        fetched = 0
+        done = 0
+        unsaved = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            movie_iterator = iter(movies)
+            running = set()
+            while True:
+                # Keep a few requests queued, so the deadline stops the next ones
+                timed_out = deadline_sec is not None and timer() - start > deadline_sec
+                while not timed_out and len(running) < self.max_workers * 2:
+                    movie = next(movie_iterator, None)
+                    if movie is None:
+                        break
+                    running.add(executor.submit(self.fetch_one, movie.id))
+                if not running:
+                    break
+
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for job in finished:
+                    done += 1
+                    if job.result() is not None:
+                        fetched += 1
+                        unsaved += 1
+                progress(done, number_of_movies, "Fetching movie details")
+
+                if save and unsaved >= self.save_every:
+                    self.save()
+                    unsaved = 0
+
+        if deadline_sec is not None and done < number_of_movies:
+            print(f"\n - Deadline reached, {number_of_movies - done} movies left for the next time")
+        if save and unsaved > 0:
+            self.save()
+        return fetched
+
+    def save(self) -> bool:
+        """Save the cache in the cache folder
+
+        Returns:
+            bool: True if successfull, False if error
+        """
+        with self._lock:
+            results = dict(self.results)
+        return self.xtream._save_to_file(results, VOD_INFO_FILENAME)
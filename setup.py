@@ -35,5 +35,8 @@ setup(
     ],
     extras_require={
         "REST_API":  ["Flask>=1.1.2",],
+        "ZSTD_CACHE":  ["zstandard",],
+        "COLUMNAR":  ["numpy",],
+        "FAST_JSON":  ["orjson",],
     }
  )
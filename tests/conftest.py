@@ -0,0 +1,45 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from fake_provider import FakeProvider, SyntheticCatalog  # noqa: E402
+from pyxtream import XTream  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def provider():
+    """Local provider serving a small synthetic catalog"""
+    fake_provider = FakeProvider(SyntheticCatalog(2000, duplicate_percent=5)).start()
+    yield fake_provider
+    fake_provider.stop()
+
+
+@pytest.fixture
+def make_xtream(provider, tmp_path):
+    """Build an XTream instance of the local provider, quietly"""
+    def make(**options):
+        options.setdefault("cache_path", str(tmp_path))
+        # XTream does not create the cache folder
+        os.makedirs(options["cache_path"], exist_ok=True)
+        options.setdefault("enable_flask", False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return XTream("test", "user", "pass", provider.url, **options)
+    return make
+
+
+@pytest.fixture
+def load(make_xtream):
+    """Build an XTream instance of the local provider and load its catalog"""
+    def load_catalog(**options):
+        xtream = make_xtream(**options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert xtream.load_iptv()
+        return xtream
+    return load_catalog
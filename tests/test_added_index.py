@@ -0,0 +1,76 @@
+import time
+
+from pyxtream.added_index import AddedIndex
+
+
+def make_index(*times):
+    index = AddedIndex()
+    streams = [f"stream{number}" for number in range(len(times))]
+    for stream, added in zip(streams, times):
+        index.add(stream, added)
+    return index, streams
+
+
+def test_sorted_by_added_time_then_insertion_order():
+    index, streams = make_index(30, 10, 20, 10)
+
+    # Same added time: the first added comes first
+    assert index.since(0) == [streams[1], streams[3], streams[2], streams[0]]
+    assert index.newest(2) == [streams[0], streams[2]]
+    assert index.newest(10) == index.since(0)[::-1]
+    assert index.newest(0) == []
+    assert len(index) == 4
+
+
+def test_window_boundaries():
+    index, streams = make_index(10, 20, 20, 30)
+
+    # since() includes its time, between() includes start and excludes end
+    assert index.since(20) == streams[1:]
+    assert index.since(31) == []
+    assert index.between(10, 20) == [streams[0]]
+    assert index.between(20, 30) == streams[1:3]
+    assert index.between(20, 20) == []
+    assert index.between(0, 100) == streams
+
+
+def test_few_streams_added_to_a_large_index():
+    index, streams = make_index(*range(0, 3000, 10))
+    # Less than 1% pending, inserted in place
+    index.since(0)
+    index.add("late", 15)
+    index.add("last", 5000)
+
+    assert index.between(10, 20) == [streams[1], "late"]
+    assert index.newest(1) == ["last"]
+    assert len(index) == len(streams) + 2
+
+
+def test_remove():
+    index, streams = make_index(10, 20, 20, 30)
+
+    assert index.remove(streams[2], 20)
+    assert not index.remove(streams[2], 20)
+    # The added time is needed to find the stream
+    assert not index.remove(streams[1], 30)
+    assert index.since(0) == [streams[0], streams[1], streams[3]]
+    assert len(index) == 3
+
+
+def test_copy_is_independent():
+    index, streams = make_index(10, 20)
+    copy = index.copy()
+    copy.add("new", 15)
+    index.remove(streams[0], 10)
+
+    assert index.since(0) == [streams[1]]
+    assert copy.since(0) == [streams[0], "new", streams[1]]
+
+
+def test_in_last_days():
+    now = time.time()
+    index, streams = make_index(now - 10 * 86400, now - 3600)
+
+    assert index.in_last_days(1) == [streams[1]]
+    index.clear()
+    assert index.in_last_days(30) == [] and len(index) == 0
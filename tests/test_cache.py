@@ -0,0 +1,93 @@
+import os
+from os import path as osp
+
+import pytest
+
+from pyxtream.cache import CODECS, CacheError, codec_available, iter_cache_file, read_cache_file, write_cache_file
+
+DATA = b'[{"name": "Channel"}]\n' * 10000
+
+
+def read_chunks(filename):
+    return b"".join(iter_cache_file(filename, chunk_size=1000))
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_round_trip(tmp_path, codec):
+    if not codec_available(codec):
+        pytest.skip(f"{codec} is not installed")
+    filename = str(tmp_path / "cache.json")
+    write_cache_file(filename, DATA, codec)
+
+    assert open(filename, "rb").read().startswith(b"PYXC1 %s " % codec.encode())
+    assert read_cache_file(filename) == DATA
+    assert read_chunks(filename) == DATA
+    # Only the file itself, no temporary file left behind
+    assert os.listdir(tmp_path) == ["cache.json"]
+
+
+def test_file_without_header(tmp_path):
+    filename = str(tmp_path / "cache.json")
+    with open(filename, "wb") as cache_file:
+        cache_file.write(DATA)
+
+    assert read_cache_file(filename) == DATA
+    assert read_chunks(filename) == DATA
+
+
+def corrupt(filename, position):
+    with open(filename, "r+b") as cache_file:
+        cache_file.seek(position)
+        byte = cache_file.read(1)
+        cache_file.seek(position)
+        cache_file.write(bytes([byte[0] ^ 0x01]))
+
+
+@pytest.mark.parametrize("codec", ["none", "gzip"])
+def test_flipped_byte(tmp_path, codec):
+    filename = str(tmp_path / "cache.json")
+    write_cache_file(filename, DATA, codec)
+    corrupt(filename, osp.getsize(filename) // 2)
+
+    with pytest.raises(CacheError, match="checksum"):
+        read_cache_file(filename)
+    with pytest.raises(CacheError):
+        read_chunks(filename)
+
+
+@pytest.mark.parametrize("reader", [read_cache_file, read_chunks])
+def test_truncated(tmp_path, reader):
+    filename = str(tmp_path / "cache.json")
+    write_cache_file(filename, DATA)
+    size = osp.getsize(filename)
+    os.truncate(filename, size - 100)
+    with pytest.raises(CacheError, match="expected"):
+        reader(filename)
+
+    # Cut in the header
+    os.truncate(filename, 10)
+    with pytest.raises(CacheError, match="header"):
+        reader(filename)
+
+
+def test_load_reloads_corrupted_cache(load, make_xtream, tmp_path, capsys):
+    xtream = load()
+    vod_file = osp.join(xtream.cache_path, "test-all_stream_VOD.json")
+    corrupt(vod_file, osp.getsize(vod_file) // 2)
+
+    # The corrupted file is fetched again from the provider
+    reloaded = make_xtream()
+    capsys.readouterr()
+    assert reloaded.load_iptv()
+    assert "Corrupted cache file" in capsys.readouterr().out
+    assert [movie.name for movie in reloaded.movies] == [movie.name for movie in xtream.movies]
+    read_cache_file(vod_file)
+
+
+def test_file_mode_like_open(tmp_path):
+    filename = str(tmp_path / "cache.json")
+    write_cache_file(filename, DATA)
+    with open(str(tmp_path / "plain.json"), "wb"):
+        pass
+
+    assert os.stat(filename).st_mode == os.stat(str(tmp_path / "plain.json")).st_mode
@@ -0,0 +1,62 @@
+import contextlib
+import io
+from timeit import default_timer as timer
+from types import SimpleNamespace
+
+import pyxtream.pyxtream
+from pyxtream import XTream
+
+
+def test_provider_down_uses_stale_cache(load, tmp_path):
+    online = load(cache_first=True)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Nothing listens on port 9, and every cached file is too old
+        offline = XTream(
+            "test", "user", "pass", "http://127.0.0.1:9", cache_path=str(tmp_path),
+            enable_flask=False, cache_first=True, reload_time_sec=-1
+            )
+        start = timer()
+        assert offline.load_iptv()
+        elapsed = timer() - start
+
+    assert offline.state["offline"]
+    assert elapsed < 5
+    assert len(offline.movies) == len(online.movies)
+    assert len(offline.groups) == len(online.groups)
+
+
+def test_connection_error_after_start_does_not_go_offline(load, monkeypatch):
+    xtream = load(cache_first=True)
+    monkeypatch.setattr(pyxtream.pyxtream.time, "sleep", lambda seconds: None)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert xtream._get_request("http://127.0.0.1:9/player_api.php?action=get_vod_info&vod_id=1") is None
+
+    assert not xtream.state["offline"]
+
+
+def test_reload_goes_back_online(load):
+    xtream = load(cache_first=True)
+    # As after a start with the provider down
+    xtream.state["offline"] = True
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert xtream.reload_iptv()
+
+    assert not xtream.state["offline"]
+    assert xtream.state["authenticated"]
+
+
+def test_rejected_saved_authentication(load, make_xtream, monkeypatch):
+    load(cache_first=True)
+    rejected = SimpleNamespace(ok=False, status_code=401, reason="Unauthorized", content=b"")
+    monkeypatch.setattr(XTream, "_http_get", lambda self, url, **kwargs: rejected)
+
+    # Authenticated from the cache, then rejected by the provider in the background
+    xtream = make_xtream(cache_first=True)
+    xtream._auth_thread.join()
+
+    assert not xtream.state["authenticated"]
+    assert not xtream.state["offline"]
+    assert not xtream._load_auth_from_cache()
@@ -0,0 +1,46 @@
+import gzip
+import json
+from os import path as osp
+
+from pyxtream.cassette import Cassette
+
+
+def read_entries(filename):
+    with gzip.open(filename, mode="rt", encoding="utf-8") as cassette_file:
+        return [json.loads(line) for line in cassette_file]
+
+
+def test_record_skips_downloads(load, tmp_path):
+    cassette_path = str(tmp_path / "provider.cassette")
+    xtream = load(cassette_path=cassette_path, cassette_mode="record")
+    movie = xtream.movies[0]
+    filename = xtream.download_video(movie.id)
+    xtream.cassette.close()
+
+    # The video is downloaded but its body is not in the cassette
+    assert osp.getsize(filename) > 0
+    entries = read_entries(cassette_path)
+    video = [entry for entry in entries if "/movie/" in entry["url"]]
+    assert len(video) == 1
+    assert video[0]["encoding"] == "skipped" and video[0]["body"] == ""
+    assert all(entry["encoding"] == "text" for entry in entries if entry is not video[0])
+    assert osp.getsize(cassette_path) < osp.getsize(filename) // 10
+
+    replayed = load(cache_path=str(tmp_path / "replay"), cassette_path=cassette_path)
+    assert [movie.name for movie in replayed.movies] == [movie.name for movie in xtream.movies]
+
+    # The download fails instead of writing an empty file
+    assert replayed.download_video(movie.id) == "Error"
+    assert not osp.exists(osp.join(replayed.cache_path, osp.basename(filename)))
+
+
+def test_replay_unclosed_cassette(load, tmp_path):
+    cassette_path = str(tmp_path / "provider.cassette")
+    xtream = load(cassette_path=cassette_path, cassette_mode="record")
+
+    # Every entry is flushed, a recording that was not closed still replays
+    cassette = Cassette(cassette_path)
+    assert cassette._entries
+    replayed = load(cache_path=str(tmp_path / "replay"), cassette_path=cassette_path)
+    assert len(replayed.channels) == len(xtream.channels)
+    xtream.cassette.close()
@@ -0,0 +1,55 @@
+from itertools import islice
+
+import pytest
+
+from pyxtream.changes import ADDED, ChangeFeed, HistoryTruncated
+
+
+def make_events(count):
+    return [{"event": ADDED, "stream_type": "VOD", "id": number} for number in range(count)]
+
+
+def test_since_returns_the_next_events():
+    feed = ChangeFeed()
+    feed.publish(make_events(5))
+
+    assert [event["seq"] for event in feed.since(2)] == [3, 4, 5]
+    assert feed.since(5) == []
+
+
+def test_since_truncated_history():
+    feed = ChangeFeed(max_events=3)
+    feed.publish(make_events(10))
+
+    with pytest.raises(HistoryTruncated):
+        feed.since(2)
+    assert [event["seq"] for event in feed.since(7)] == [8, 9, 10]
+
+
+def test_wait_after_last_event_does_not_block():
+    feed = ChangeFeed()
+    feed.publish(make_events(2))
+
+    with pytest.raises(HistoryTruncated):
+        feed.wait(50, timeout=5)
+
+
+@pytest.mark.parametrize("seq", [1, 50])
+def test_stream_sse_resync(seq):
+    feed = ChangeFeed(max_events=3)
+    feed.publish(make_events(10))
+
+    message = next(feed.stream_sse(seq, keepalive_sec=0.1))
+
+    assert message.startswith("id: 10\nevent: resync\n")
+
+
+def test_stream_sse_events():
+    feed = ChangeFeed()
+    feed.publish(make_events(3))
+
+    messages = list(islice(feed.stream_sse(1, keepalive_sec=0.1), 3))
+
+    assert messages[0].startswith("id: 2\nevent: added\n")
+    assert messages[1].startswith("id: 3\n")
+    assert messages[2] == ": keepalive\n\n"
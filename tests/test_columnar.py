@@ -0,0 +1,43 @@
+from collections import Counter
+
+import pytest
+
+pytest.importorskip("numpy")
+
+
+def test_columns_match_the_streams(load):
+    xtream = load()
+    columns = xtream.columns
+
+    streams = list(xtream.channels) + list(xtream.movies) + list(xtream.series)
+    assert len(columns) == len(streams)
+    assert columns.type_ranges == {
+        "live": (0, len(xtream.channels)),
+        "movie": (len(xtream.channels), len(xtream.channels) + len(xtream.movies)),
+        "series": (len(xtream.channels) + len(xtream.movies), len(streams)),
+    }
+    for row, stream in enumerate(streams):
+        is_serie = row >= columns.type_ranges["series"][0]
+        assert columns.stream_id[row] == (stream.series_id if is_serie else stream.id)
+        assert columns.category_id[row] == stream.group_id
+        assert columns.added[row] == (stream.last_modified if is_serie else stream.added)
+        assert columns.is_adult[row] == (not is_serie and stream.is_adult == 1)
+        assert columns.names[columns.name_id[row]] == stream.name
+        assert columns.view([row])[0] is stream
+
+
+def test_filters_match_the_streams(load):
+    xtream = load()
+    columns = xtream.columns
+    since = sorted(movie.added for movie in xtream.movies)[len(xtream.movies) // 2]
+
+    rows = columns.filter(stream_type="movie", added_since=since)
+    assert list(columns.view(rows)) == [movie for movie in xtream.movies if movie.added >= since]
+    assert columns.mask(stream_type="movie", added_since=since).sum() == len(rows)
+
+    rows = columns.filter(stream_type="live", is_adult=False)
+    assert columns.count_by_category(rows) == dict(
+        Counter(channel.group_id for channel in xtream.channels if channel.is_adult != 1)
+    )
+    assert len(columns.filter(name=xtream.series[0].name)) >= 1
+    assert len(columns.filter(name="no such name")) == 0
@@ -0,0 +1,96 @@
+import contextlib
+import io
+from collections import Counter, defaultdict
+
+import pytest
+
+from pyxtream import XTream
+from pyxtream.facets import FACETS
+
+
+def brute_force_values(xtream):
+    """Stream id() -> facet -> set of values, computed stream by stream"""
+    values = {}
+    for stream in list(xtream.channels) + list(xtream.movies):
+        values[id(stream)] = {
+            "stream_type": {stream.stream_type},
+            "is_adult": {stream.is_adult == 1},
+            "container": {stream.container_extension},
+            "category": set(),
+            "region": set(),
+        }
+    for serie in xtream.series:
+        values[id(serie)] = {
+            "stream_type": {"series"}, "is_adult": {False}, "container": set(), "category": set(), "region": set()
+        }
+    for group in xtream.groups:
+        for stream in group.series if group.stream_type == "Series" else group.channels:
+            if id(stream) in values:
+                values[id(stream)]["category"].add(group.group_id)
+                if group.region_shortname:
+                    values[id(stream)]["region"].add(group.region_shortname)
+    return values
+
+
+@pytest.fixture(scope="module")
+def loaded(provider, tmp_path_factory):
+    with contextlib.redirect_stdout(io.StringIO()):
+        xtream = XTream(
+            "test", "user", "pass", provider.url, cache_path=str(tmp_path_factory.mktemp("facets")), enable_flask=False
+        )
+        assert xtream.load_iptv()
+    return xtream, brute_force_values(xtream)
+
+
+FILTERS = [
+    {},
+    {"stream_type": "movie"},
+    {"stream_type": ("live", "series")},
+    {"stream_type": "movie", "is_adult": False, "container": ("mkv", "mp4")},
+    {"region": ("EU", "AM")},
+    {"stream_type": "movie", "region": "EU", "is_adult": False},
+    {"container": "does-not-exist"},
+]
+
+
+@pytest.mark.parametrize("facets", FILTERS)
+def test_counts_match_brute_force(loaded, facets):
+    xtream, values = loaded
+
+    def matches(stream):
+        for facet, wanted in facets.items():
+            wanted = set(wanted) if isinstance(wanted, tuple) else {wanted}
+            if not values[id(stream)][facet] & wanted:
+                return False
+        return True
+
+    result = xtream.facets.filter(**facets)
+    expected = [stream for stream in xtream.facets.streams if matches(stream)]
+    assert expected or facets.get("container") == "does-not-exist"
+    assert result.count == len(expected)
+    assert result.streams() == expected
+
+    expected_counts = defaultdict(Counter)
+    for stream in expected:
+        for facet in FACETS:
+            expected_counts[facet].update(values[id(stream)][facet])
+    assert result.counts() == {facet: dict(expected_counts[facet]) for facet in FACETS}
+
+
+def test_added_window(loaded):
+    xtream, _ = loaded
+    index = xtream.facets
+    middle = index.added[len(index.added) // 2]
+
+    newer = index.filter(added_since=middle)
+    older = index.filter(added_before=middle)
+    assert newer.count + older.count == index.number_of_rows
+    assert all(added >= middle for added in (index.added[row] for row in newer.rows()))
+    assert newer.streams(limit=5, newest_first=True) == index.streams[::-1][:5]
+
+
+def test_unknown_facet(loaded):
+    xtream, _ = loaded
+    with pytest.raises(ValueError):
+        xtream.facets.filter(genre="drama")
+
@@ -0,0 +1,24 @@
+import re
+import time
+
+from pyxtream.health import HealthChecker
+
+
+def test_search_hide_dead_with_series(load):
+    xtream = load()
+    dead_movie = xtream.movies[0]
+    xtream.health.results[HealthChecker.get_key(dead_movie)] = {"alive": False, "checked": time.time()}
+
+    results = xtream.search_stream(f"^{re.escape(dead_movie.name)}$|^.* Series .*$", hide_dead=True)
+
+    assert any("series_id" in result for result in results)
+    assert dead_movie.id not in {result.get("stream_id") for result in results}
+
+
+def test_series_keys_are_unknown(load):
+    xtream = load()
+    serie = xtream.series[0]
+
+    assert HealthChecker.get_key(serie) == f"series:{serie.series_id}"
+    assert xtream.health.is_alive(serie) is None
+    assert xtream.health.filter([serie]) == [serie]
@@ -0,0 +1,25 @@
+import contextlib
+import io
+
+
+def test_iter_streams_matches_load(load, make_xtream):
+    loaded = load()
+    streaming = make_xtream()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        movies = list(streaming.iter_streams("VOD"))
+        channels = list(streaming.iter_streams("Live"))
+
+    # The streams listed in several groups are yielded once
+    assert [movie.id for movie in movies] == [movie.id for movie in loaded.movies]
+    assert [channel.id for channel in channels] == [channel.id for channel in loaded.channels]
+    assert [movie.group_title for movie in movies] == [movie.group_title for movie in loaded.movies]
+
+
+def test_iter_streams_predicate(make_xtream):
+    streaming = make_xtream()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        movies = list(streaming.iter_streams("VOD", predicate=lambda movie: movie.container_extension == "mkv"))
+
+    assert movies and all(movie.container_extension == "mkv" for movie in movies)
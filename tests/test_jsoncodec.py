@@ -0,0 +1,62 @@
+import importlib
+import json
+import sys
+
+import pytest
+
+from pyxtream import jsoncodec
+
+DOCUMENT = {"name": "Café | ÉTÉ 日本", "stream_id": 12, "rating": 7.5, "tags": [None, True, ""], "nested": {"a": []}}
+
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "orjson" and not jsoncodec.USE_ORJSON:
+        pytest.skip("orjson is not installed")
+    monkeypatch.setattr(jsoncodec, "USE_ORJSON", request.param == "orjson")
+    return request.param
+
+
+def test_round_trip(backend):
+    encoded = jsoncodec.dumps(DOCUMENT)
+
+    assert type(encoded) is bytes
+    # Compact and not ASCII escaped, like the json module with these options
+    assert encoded == json.dumps(DOCUMENT, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert jsoncodec.loads(encoded) == DOCUMENT
+    assert jsoncodec.loads(encoded.decode("utf-8")) == DOCUMENT
+
+
+def test_values_orjson_rejects(backend):
+    # Larger than 64 bits, and integer keys
+    document = {"big": 2**70, 1: "one"}
+
+    assert jsoncodec.loads(jsoncodec.dumps(document)) == {"big": 2**70, "1": "one"}
+    assert jsoncodec.loads(b'{"big": 1180591620717411303424}') == {"big": 2**70}
+
+
+def test_invalid_document(backend):
+    with pytest.raises(json.JSONDecodeError):
+        jsoncodec.loads(b'{"name": ')
+
+
+def test_fragments(backend):
+    fragments = [jsoncodec.dumps({"id": 1}), jsoncodec.dumps({})]
+    fragments = [jsoncodec.add_key(fragment, "logo_path", "/tmp/é.png") for fragment in fragments]
+
+    assert jsoncodec.loads(jsoncodec.join_array(fragments)) == [
+        {"id": 1, "logo_path": "/tmp/é.png"}, {"logo_path": "/tmp/é.png"}
+    ]
+
+
+def test_without_orjson(monkeypatch):
+    # None in sys.modules makes the import fail
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    try:
+        importlib.reload(jsoncodec)
+        assert not jsoncodec.USE_ORJSON
+        assert jsoncodec.BACKEND == "json"
+        assert jsoncodec.loads(jsoncodec.dumps(DOCUMENT)) == DOCUMENT
+    finally:
+        monkeypatch.undo()
+        importlib.reload(jsoncodec)
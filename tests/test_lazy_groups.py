@@ -0,0 +1,29 @@
+import contextlib
+import io
+from timeit import default_timer as timer
+
+
+def test_open_group_without_delay(load):
+    xtream = load(lazy_groups=True)
+    group = next(group for group in xtream.groups if group.stream_type == "VOD" and group.group_id != 9999)
+
+    start = timer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        opened = xtream.open_group(group)
+    elapsed = timer() - start
+
+    assert len(opened.channels) > 0
+    assert opened in xtream.groups
+    assert elapsed < 0.5
+
+
+def test_unload_least_recently_opened(load):
+    xtream = load(lazy_groups=True, max_loaded_groups=2)
+    groups = [group for group in xtream.groups if group.stream_type == "VOD" and group.group_id != 9999][:3]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        opened = [xtream.open_group(group) for group in groups]
+
+    assert len(xtream.movies) == len(opened[1].channels) + len(opened[2].channels) - len(
+        {id(stream) for stream in opened[1].channels} & {id(stream) for stream in opened[2].channels}
+    )
@@ -0,0 +1,39 @@
+import contextlib
+import io
+
+import pytest
+
+import pyxtream.pyxtream
+from fake_provider import FakeProvider, SyntheticCatalog
+from pyxtream import XTream
+
+
+@pytest.fixture(scope="module")
+def odd_provider():
+    """Provider listing a live stream and a movie of unknown stream type"""
+    catalog = SyntheticCatalog(200)
+    catalog.live_streams.append(dict(catalog.live_streams[0], stream_id=999999, stream_type="catchup"))
+    catalog.vod_streams.append(dict(catalog.vod_streams[0], stream_id=9999999, stream_type="trailer"))
+    fake_provider = FakeProvider(catalog).start()
+    yield fake_provider
+    fake_provider.stop()
+
+
+@pytest.mark.parametrize("parallel_build", [False, True])
+def test_skip_unknown_stream_type(odd_provider, monkeypatch, tmp_path, capsys, parallel_build):
+    if parallel_build:
+        monkeypatch.setattr(pyxtream.pyxtream, "cpu_count", lambda: 4)
+        monkeypatch.setattr(pyxtream.pyxtream, "PARALLEL_BUILD_MIN_STREAMS", 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        xtream = XTream(
+            "test", "user", "pass", odd_provider.url,
+            cache_path=str(tmp_path), enable_flask=False, parallel_build=parallel_build
+        )
+    capsys.readouterr()
+
+    assert xtream.load_iptv()
+    output = capsys.readouterr().out
+    assert " - Skipped 1 Live streams of unknown stream type" in output
+    assert " - Skipped 1 VOD streams of unknown stream type" in output
+    assert len(xtream.channels) == 40 and len(xtream.movies) == 140
+    assert 999999 not in {channel.id for channel in xtream.channels}
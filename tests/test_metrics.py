@@ -0,0 +1,40 @@
+import contextlib
+import io
+
+from pyxtream.pyxtream import METRIC_ACTIONS, XTream
+
+
+def test_url_actions_are_bounded(make_xtream):
+    xtream = make_xtream(lazy_init=True)
+
+    assert xtream._get_url_action("http://provider/player_api.php?username=u&password=p&action=get_vod_info") == (
+        "get_vod_info"
+    )
+    assert xtream._get_url_action("http://provider/xmltv.php?username=u&password=p") == "xmltv"
+    for url in (
+        "http://provider/movie/u/p/123.mkv",
+        "http://provider/live/u/p/7.m3u8",
+        "http://provider/player_api.php?action=anything_else",
+    ):
+        assert xtream._get_url_action(url) == "other"
+
+
+def test_file_actions_are_bounded():
+    assert XTream._get_file_action("all_stream_VOD.json") == "all_stream_VOD"
+    assert XTream._get_file_action("group_VOD_1001.json") == XTream._get_file_action("group_VOD_1002.json")
+
+
+def test_request_labels(load):
+    actions = set()
+
+    def on_metric(name, value, labels):
+        if name.startswith("pyxtream_http_"):
+            actions.add(labels["action"])
+
+    xtream = load(metrics_callback=on_metric)
+    with contextlib.redirect_stdout(io.StringIO()):
+        xtream.get_series_info_by_id(xtream.series[0])
+        xtream.vodInfoByID(xtream.movies[0].id)
+
+    assert {"get_vod_categories", "get_series_info", "get_vod_info"} <= actions
+    assert actions <= METRIC_ACTIONS | {"authenticate"}
@@ -0,0 +1,42 @@
+import pyxtream.pyxtream
+
+
+def describe(xtream):
+    """Everything the loaded catalog exposes, in order"""
+    streams = [stream.export_json() for stream in list(xtream.channels) + list(xtream.movies) + list(xtream.series)]
+    groups = [
+        (group.stream_type, group.name, [stream.name for stream in group.channels + group.series])
+        for group in xtream.groups
+    ]
+    return streams, groups
+
+
+def test_parallel_build_equals_serial(load, monkeypatch, tmp_path):
+    serial = load(cache_path=str(tmp_path / "serial"))
+
+    # Use the worker processes even on one CPU with a small catalog
+    monkeypatch.setattr(pyxtream.pyxtream, "cpu_count", lambda: 4)
+    monkeypatch.setattr(pyxtream.pyxtream, "PARALLEL_BUILD_MIN_STREAMS", 0)
+    parallel = load(cache_path=str(tmp_path / "parallel"), parallel_build=True)
+
+    serial_streams, serial_groups = describe(serial)
+    parallel_streams, parallel_groups = describe(parallel)
+    for stream in serial_streams + parallel_streams:
+        stream.pop("logo_path")
+    assert parallel_streams == serial_streams
+    assert parallel_groups == serial_groups
+
+    # The strings copied from the provider dictionary are not duplicated by the workers
+    movie, serie = parallel.movies[0], parallel.series[0]
+    assert movie.name is movie.raw["name"] and movie.logo is movie.raw["stream_icon"]
+    assert serie.name is serie.raw["name"] and serie.plot is serie.raw["plot"]
+
+
+def test_parallel_build_falls_back_to_serial(make_xtream, monkeypatch):
+    xtream = make_xtream(parallel_build=True)
+
+    monkeypatch.setattr(pyxtream.pyxtream, "cpu_count", lambda: 1)
+    assert not xtream._should_build_in_parallel(10**6)
+    monkeypatch.setattr(pyxtream.pyxtream, "cpu_count", lambda: 8)
+    assert not xtream._should_build_in_parallel(100)
+    assert xtream._should_build_in_parallel(10**6)
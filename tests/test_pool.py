@@ -0,0 +1,70 @@
+import contextlib
+import io
+from types import SimpleNamespace
+
+from pyxtream.pool import XTreamPool, stream_fingerprint
+
+
+def make_movie(name, container="mkv", **raw):
+    movie = SimpleNamespace(name=name, stream_type="movie", container_extension=container, raw=raw)
+    movie.export_json = lambda: {"name": name}
+    return movie
+
+
+def make_pool(*providers):
+    pool = XTreamPool([])
+    pool.providers = [
+        SimpleNamespace(name=f"provider{number}", movies=movies, channels=[], series=[])
+        for number, movies in enumerate(providers)
+    ]
+    return pool
+
+
+def test_fingerprint_keeps_the_language():
+    english = stream_fingerprint(make_movie("EN| The Movie (2001)"))
+    french = stream_fingerprint(make_movie("FR| The Movie (2001)"))
+    quality = stream_fingerprint(make_movie("4K: The Movie [2001] HD"))
+
+    assert english != french
+    assert quality == stream_fingerprint(make_movie("The Movie (2001)"))
+    assert english[2:] == quality[2:]
+
+
+def test_merge_only_across_providers():
+    first = [make_movie("EN| Heat (1995)"), make_movie("EN| Heat (1995)")]
+    second = [make_movie("EN| HEAT (1995)"), make_movie("FR| Heat (1995)"), make_movie("Alien", year="1979")]
+
+    movies = make_pool(first, second).movies
+
+    assert movies == first + second[1:]
+
+
+def test_search_only_dedups_across_providers():
+    first = [make_movie("Heat"), make_movie("Heat")]
+    second = [make_movie("Heat"), make_movie("Heat", container="mp4")]
+
+    results = make_pool(first, second).search_stream("^Heat$")
+
+    assert [result["provider"] for result in results] == ["provider0", "provider0", "provider1"]
+
+
+def test_lazy_init_providers_are_loaded(provider, tmp_path):
+    settings = {
+        "provider_name": "test", "provider_username": "user", "provider_password": "pass", "provider_url": provider.url
+    }
+    pool = XTreamPool([settings], cache_path=str(tmp_path), lazy_init=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert pool.load_iptv()
+
+    assert len(pool.providers) == 1
+    assert len(pool.movies) == 1400
+
+
+def test_fingerprint_titles_are_not_languages():
+    for name in ("2001: A Space Odyssey", "CSI: Miami", "1917 | War"):
+        fingerprint = stream_fingerprint(make_movie(name))
+        assert fingerprint[1] == ""
+        assert fingerprint == stream_fingerprint(make_movie(name.replace(":", " -").replace("|", "-")))
+
+    assert stream_fingerprint(make_movie("ENG| The Movie"))[1] == "ENG"
+    assert stream_fingerprint(make_movie("HD| The Movie")) == stream_fingerprint(make_movie("The Movie"))
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from pyxtream.cache import CacheError, read_cache_file, write_cache_file
+from pyxtream.raw_store import RawStore, write_stream_lines
+
+STREAMS = [
+    {"num": 1, "name": "Première, \"quoted\"", "stream_id": 1, "category_ids": [3, 4]},
+    {"num": 2, "name": "Line\nbreak ] [", "stream_id": 2, "info": {"plot": "日本語"}},
+    {"num": 3, "name": "", "stream_id": 3, "rating": None},
+]
+
+
+def test_round_trip(tmp_path):
+    filename = str(tmp_path / "all_stream_VOD.json")
+    write_stream_lines(filename, STREAMS)
+
+    store = RawStore(filename)
+    assert len(store) == len(STREAMS)
+    assert [store.get(offset) for offset in store.offsets] == STREAMS
+    # Still a JSON list for the normal loader
+    assert json.loads(read_cache_file(filename)) == STREAMS
+
+
+def test_empty_list(tmp_path):
+    filename = str(tmp_path / "all_stream_VOD.json")
+    write_stream_lines(filename, [])
+
+    assert len(RawStore(filename)) == 0
+    assert json.loads(read_cache_file(filename)) == []
+
+
+@pytest.mark.parametrize("codec, data", [
+    ("gzip", json.dumps(STREAMS).encode()),
+    ("none", json.dumps(STREAMS).encode()),
+])
+def test_not_one_stream_per_line(tmp_path, codec, data):
+    filename = str(tmp_path / "all_stream_VOD.json")
+    write_cache_file(filename, data, codec)
+
+    with pytest.raises(CacheError):
+        RawStore(filename)
+
+
+def test_raw_on_demand_matches(load, tmp_path):
+    in_memory = load(cache_path=str(tmp_path / "memory"))
+    on_demand = load(cache_path=str(tmp_path / "on_demand"), raw_on_demand=True)
+
+    streams = list(on_demand.channels) + list(on_demand.movies) + list(on_demand.series)
+    assert all(type(stream._raw) is tuple for stream in streams)
+    assert [stream.raw for stream in streams] == [
+        stream.raw for stream in list(in_memory.channels) + list(in_memory.movies) + list(in_memory.series)
+    ]
+
+
+def test_raw_on_demand_with_lazy_groups(make_xtream):
+    with pytest.raises(ValueError):
+        make_xtream(raw_on_demand=True, lazy_groups=True)
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from pyxtream.recorder import Playlist, Recorder
+
+MEDIA = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-TARGETDURATION:4
+#EXT-X-MEDIA-SEQUENCE:120
+#EXTINF:3.960,
+segment120.ts
+#EXTINF:4.000,
+/hls/1/121.ts
+
+#EXTINF:2.5,title
+http://cdn.example/122.ts
+#EXT-X-ENDLIST
+"""
+
+MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360
+low/index.m3u8
+#EXT-X-STREAM-INF:RESOLUTION=1920x1080,BANDWIDTH=5000000
+high/index.m3u8
+"""
+
+
+def test_media_playlist():
+    playlist = Playlist(MEDIA, "http://provider/live/user/pass/1.m3u8")
+
+    assert playlist.media_sequence == 120
+    assert playlist.target_duration == 4
+    assert playlist.ended
+    assert playlist.variants == []
+    assert playlist.segments == [
+        (120, 3.96, "http://provider/live/user/pass/segment120.ts"),
+        (121, 4.0, "http://provider/hls/1/121.ts"),
+        (122, 2.5, "http://cdn.example/122.ts"),
+    ]
+
+
+def test_master_playlist():
+    playlist = Playlist(MASTER, "http://provider/live/user/pass/1.m3u8")
+
+    assert playlist.segments == []
+    assert playlist.variants == [
+        (800000, "http://provider/live/user/pass/low/index.m3u8"),
+        (5000000, "http://provider/live/user/pass/high/index.m3u8"),
+    ]
+    assert not playlist.ended
+
+
+@pytest.mark.parametrize("text", ["", "<html></html>"])
+def test_not_a_playlist(text):
+    with pytest.raises(ValueError):
+        Playlist(text, "http://provider/")
+
+
+class ScriptedSession:
+    """requests.Session serving the playlists in order, and the segments except the missing ones"""
+
+    def __init__(self, playlists, missing):
+        self.headers = {}
+        self.playlists = list(playlists)
+        self.missing = missing
+
+    def get(self, url, timeout=None):
+        if url.endswith(".m3u8"):
+            text = self.playlists.pop(0) if len(self.playlists) > 1 else self.playlists[0]
+            return SimpleNamespace(url=url, text=text, status_code=200, raise_for_status=lambda: None)
+        sequence = int(url.rsplit("/", 1)[1].split(".")[0])
+        if sequence in self.missing:
+            return SimpleNamespace(status_code=404, content=b"")
+        return SimpleNamespace(status_code=200, content=b"%d;" % sequence)
+
+    def close(self):
+        pass
+
+
+def media_playlist(first, last, ended=False):
+    lines = ["#EXTM3U", "#EXT-X-TARGETDURATION:2", f"#EXT-X-MEDIA-SEQUENCE:{first}"]
+    for sequence in range(first, last + 1):
+        lines += ["#EXTINF:1.5,", f"/hls/1/{sequence}.ts"]
+    if ended:
+        lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines)
+
+
+def test_recorder_counts_gaps(monkeypatch, tmp_path):
+    # Segments 13 and 14 left the playlist before being seen, 16 cannot be downloaded
+    session = ScriptedSession([media_playlist(5, 12), media_playlist(15, 17, ended=True)], missing={16})
+    monkeypatch.setattr(requests, "Session", lambda: session)
+    xtream = SimpleNamespace(
+        url_template=SimpleNamespace(build=lambda *args: "http://provider/live/user/pass/1.m3u8"),
+        connection_headers={},
+        metrics=SimpleNamespace(inc=lambda *args, **labels: None),
+    )
+    filename = tmp_path / "recording.ts"
+
+    recorder = Recorder(xtream, SimpleNamespace(id=1, name="Channel"), str(filename), prefetch=3)
+    recorder.run()
+
+    stats = recorder.stats
+    # Started at the live edge, the last 3 segments of the first playlist
+    assert filename.read_bytes() == b"10;11;12;15;17;"
+    assert stats["segments"] == 5
+    assert stats["recorded_seconds"] == 5 * 1.5
+    assert stats["gaps"] == 3
+    assert stats["gap_seconds"] == 2 * 2 + 1.5
+    assert stats["playlist_errors"] == 0
+    assert stats["bytes"] == len(b"10;11;12;15;17;")
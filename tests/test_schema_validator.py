@@ -0,0 +1,22 @@
+from pyxtream.schemaValidator import SchemaType, validate_many
+
+
+def test_validate_many_reports_invalid_items(provider):
+    streams = [dict(stream) for stream in provider.catalog.vod_streams[:10]]
+    streams[3]["stream_id"] = {"not": "an id"}
+
+    invalid = validate_many(streams, SchemaType.VOD, first_index=100)
+
+    assert [index for index, _ in invalid] == [103]
+
+
+def test_validate_many_valid_items(provider):
+    assert validate_many(provider.catalog.live_streams[:10], SchemaType.LIVE) == []
+
+
+def test_parallel_validation_during_load(make_xtream, capsys):
+    xtream = make_xtream(validate_json=True, validate_json_parallel=True)
+
+    assert xtream.load_iptv()
+    assert len(xtream.movies) > 0
+    assert "JSON validation" not in capsys.readouterr().out
@@ -0,0 +1,86 @@
+import contextlib
+import io
+
+from pyxtream.catalog import CatalogBuilder
+from pyxtream.shared_catalog import SharedCatalog
+
+
+def open_worker(make_xtream, filename, **options):
+    worker = make_xtream(lazy_init=True, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert worker.open_shared_catalog(filename)
+    return worker
+
+
+def test_views_match_the_loaded_catalog(load, make_xtream):
+    loader = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = loader.save_shared_catalog()
+    worker = open_worker(make_xtream, filename)
+
+    assert len(worker.movies) == len(loader.movies)
+    for loaded, shared in zip(loader.movies[:50], worker.movies[:50]):
+        assert shared.export_json() == loaded.export_json()
+    serie = loader.series[3]
+    assert worker.catalog.get_stream("Series", serie.series_id).name == serie.name
+    assert worker.catalog.streams_by_id["VOD"][loader.movies[7].id].name == loader.movies[7].name
+    assert worker.catalog.get_stream("VOD", -1) is None
+
+
+def test_no_credentials_in_the_file(load):
+    loader = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = loader.save_shared_catalog()
+
+    with open(filename, "rb") as catalog_file:
+        data = catalog_file.read()
+    assert b"password" not in data
+    assert b"/user/pass/" not in data
+    assert SharedCatalog(filename).movies[0].url == ""
+
+
+def test_authentication_of_a_worker(load, make_xtream):
+    loader = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = loader.save_shared_catalog()
+    worker = open_worker(make_xtream, filename)
+
+    worker._set_auth_data(loader.auth_data)
+
+    assert worker.movies[0].url == loader.movies[0].url
+
+
+def test_copy_and_open_group(load, make_xtream):
+    loader = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = loader.save_shared_catalog()
+    worker = open_worker(make_xtream, filename, lazy_groups=True)
+
+    builder = CatalogBuilder.from_snapshot(worker.catalog)
+    assert len(builder.streams_by_id["VOD"]) == len(worker.catalog.streams_by_id["VOD"])
+
+    group = next(group for group in worker.groups if group.stream_type == "VOD" and len(group.channels) > 0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        opened = worker.open_group(group)
+    assert opened is group
+    assert worker.catalog.version == SharedCatalog(filename).version
+
+
+def test_series_info_on_a_shared_serie(load, make_xtream):
+    loader = load()
+    with contextlib.redirect_stdout(io.StringIO()):
+        filename = loader.save_shared_catalog()
+    worker = open_worker(make_xtream, filename)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loader.get_series_info_by_id(loader.series[0])
+        worker.get_series_info_by_id(worker.series[0])
+
+    # Kept for the next views of the same series only
+    seasons = worker.series[0].seasons
+    assert seasons
+    assert list(seasons) == list(loader.series[0].seasons)
+    assert [list(season.episodes) for season in seasons.values()] == [
+        list(season.episodes) for season in loader.series[0].seasons.values()
+    ]
+    assert worker.series[1].seasons == {}
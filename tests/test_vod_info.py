@@ -0,0 +1,144 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from pyxtream import vod_info
+from pyxtream.vod_info import RateLimiter, VodInfoEnricher
+
+
+class FakeClock:
+    """timer() and time.sleep() of pyxtream.vod_info, sleeping only moves the time forward"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def timer(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(vod_info, "timer", fake_clock.timer)
+    monkeypatch.setattr(vod_info, "time", SimpleNamespace(sleep=fake_clock.sleep, time=lambda: fake_clock.now))
+    return fake_clock
+
+
+def test_rate_limiter_spaces_the_calls(clock):
+    limiter = RateLimiter(4)
+    times = []
+    for _ in range(5):
+        limiter.acquire()
+        times.append(clock.now - 100)
+
+    assert times == [0, 0.25, 0.5, 0.75, 1.0]
+
+    # After a pause the next call goes through at once
+    clock.now += 10
+    limiter.acquire()
+    assert clock.sleeps == [0.25] * 4
+
+
+def test_rate_limiter_without_limit(clock):
+    limiter = RateLimiter(0)
+    for _ in range(100):
+        limiter.acquire()
+    assert clock.sleeps == []
+
+
+class FakeXTream:
+    """What VodInfoEnricher uses of XTream, answering from a list of responses or exceptions"""
+
+    connection_headers = {}
+
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.requests = 0
+        self.errors = []
+        self.saved = None
+        self.metrics = SimpleNamespace(inc=self._inc, observe=lambda *args, **labels: None)
+
+    def _inc(self, name, value=1, **labels):
+        if name == "pyxtream_http_errors_total":
+            self.errors.append(labels["error"])
+
+    def get_VOD_info_URL_by_ID(self, vod_id):
+        return f"http://provider/player_api.php?action=get_vod_info&vod_id={vod_id}"
+
+    def _http_get(self, url, **kwargs):
+        self.requests += 1
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        status_code, content = answer
+        return SimpleNamespace(status_code=status_code, content=content)
+
+    def _load_from_file(self, filename, ignore_age=False):
+        return None
+
+    def _save_to_file(self, data, filename):
+        self.saved = data
+        return True
+
+
+INFO = json.dumps({"info": {"plot": "A plot"}, "movie_data": {"stream_id": 7}}).encode()
+
+
+def test_busy_provider_is_retried(clock):
+    xtream = FakeXTream([(503, b""), (429, b""), (200, INFO)])
+    enricher = VodInfoEnricher(xtream, requests_per_sec=0)
+
+    assert enricher.fetch_one(7)["info"]["plot"] == "A plot"
+    assert enricher.get(7)["movie_data"]["stream_id"] == 7
+    assert xtream.errors == ["HTTP 503", "HTTP 429"]
+    # Exponential backoff between the tries
+    assert clock.sleeps == [1, 2]
+
+
+def test_connection_errors_give_up(clock):
+    xtream = FakeXTream([requests.exceptions.ConnectionError()] * 3)
+    enricher = VodInfoEnricher(xtream, requests_per_sec=0)
+
+    assert enricher.fetch_one(7) is None
+    assert xtream.errors == ["ConnectionError"] * 3
+    assert clock.sleeps == [1, 2, 4]
+    assert enricher.get(7) is None
+
+
+@pytest.mark.parametrize("answer, error", [
+    ((404, b"Not found"), "HTTP 404"),
+    ((200, b"[]"), "invalid answer"),
+    ((200, b"<html>"), "invalid answer"),
+    ((200, b'{"info": []}'), "invalid answer"),
+])
+def test_errors_are_not_retried(clock, answer, error):
+    xtream = FakeXTream([answer])
+    enricher = VodInfoEnricher(xtream, requests_per_sec=0)
+
+    assert enricher.fetch_one(7) is None
+    assert xtream.requests == 1
+    assert xtream.errors == [error]
+    assert enricher.results == {}
+
+
+def test_fetch_skips_cached_and_failed(clock):
+    movies = [SimpleNamespace(id=movie_id) for movie_id in (1, 2, 3)]
+    xtream = FakeXTream([(200, INFO), (404, b""), (200, INFO)])
+    enricher = VodInfoEnricher(xtream, max_workers=1, requests_per_sec=0)
+    enricher.results["2"] = {"fetched": clock.now, "data": {"info": {}}}
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(vod_info, "progress", lambda *args: None)
+        assert enricher.fetch(movies) == 1
+
+    # Movie 2 was cached, movie 3 got the 404
+    assert xtream.requests == 2
+    assert set(xtream.saved) == {"1", "2"}
+    assert movies[0]._vod_info_source is enricher